@@ -0,0 +1,172 @@
+"""
+N-Day Candle Aggregation Kernel
+Shared rolling OHLCV aggregation used by all candle generators
+"""
+
+import pandas as pd
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# 'rolling': one overlapping N-day candle ending on every bar
+# 'epoch': non-overlapping N-day bins aligned to 1970-01-01 (shared by all symbols)
+AGGREGATION_MODES = ('rolling', 'epoch')
+EPOCH_SUFFIX = '_epoch'
+
+
+def rolling_ohlcv(
+    open_,
+    high,
+    low,
+    close,
+    volume,
+    n_days: int
+) -> Dict[str, np.ndarray]:
+    """
+    Build overlapping N-day candles ending on every bar.
+
+    Rules:
+    - Open: First open in window (array shift)
+    - High: Maximum high in window (strided rolling max)
+    - Low: Minimum low in window (strided rolling min)
+    - Close: Last close in window
+    - Volume: Sum of volume in window
+
+    Matches pandas rolling(window=n_days, min_periods=n_days): the first
+    n_days-1 bars, and every window containing a NaN in any column, are NaN.
+
+    Args:
+        open_, high, low, close, volume: Arrays of shape (n,) or
+            (n, n_symbols) with dates on axis 0
+        n_days: Number of days to aggregate
+
+    Returns:
+        Dictionary mapping column name to aggregated array (same shape as input)
+    """
+    if n_days < 1:
+        raise ValueError("n_days must be >= 1")
+
+    columns = {
+        name: np.asarray(values, dtype=float)
+        for name, values in zip(OHLCV_COLUMNS, (open_, high, low, close, volume))
+    }
+    n = len(columns['close'])
+    result = {name: np.full_like(values, np.nan) for name, values in columns.items()}
+
+    if n < n_days:
+        return result
+
+    windows = {
+        name: sliding_window_view(values, n_days, axis=0)
+        for name, values in columns.items()
+    }
+
+    # A window is usable only if none of its bars has a missing value
+    missing = np.zeros(windows['close'].shape[:-1], dtype=bool)
+    for name in OHLCV_COLUMNS:
+        missing |= np.isnan(windows[name]).any(axis=-1)
+
+    tail = slice(n_days - 1, n)
+    aggregated = {
+        'open': columns['open'][:n - n_days + 1],
+        'high': windows['high'].max(axis=-1),
+        'low': windows['low'].min(axis=-1),
+        'close': columns['close'][n_days - 1:],
+        'volume': windows['volume'].sum(axis=-1),
+    }
+
+    for name, values in aggregated.items():
+        result[name][tail] = np.where(missing, np.nan, values)
+
+    return result
+
+
+def epoch_candles(df: pd.DataFrame, n_days: int) -> pd.DataFrame:
+    """
+    Aggregate a candle DataFrame into non-overlapping epoch-aligned N-day bars.
+
+    Same bars as resample(f'{n_days}D', origin='epoch') in linreg_bars: bins
+    are calendar-day periods counted from 1970-01-01, so every symbol shares
+    bar boundaries, and each bar is labelled with its bin start date. Bins
+    are computed explicitly because newer pandas ignores origin for day
+    frequencies. Bins without a complete OHLC row are dropped.
+
+    Args:
+        df: DataFrame with [open, high, low, close, volume] columns and a
+            DatetimeIndex
+        n_days: Number of calendar days per bar
+
+    Returns:
+        Aggregated DataFrame with one row per non-empty bin
+    """
+    if n_days < 1:
+        raise ValueError("n_days must be >= 1")
+
+    days = (df.index.normalize() - pd.Timestamp(0)).days
+    bin_start = pd.Timestamp(0) + pd.to_timedelta((days // n_days) * n_days, unit='D')
+    bin_start = pd.DatetimeIndex(bin_start, name=df.index.name)
+
+    result = df[OHLCV_COLUMNS].groupby(bin_start).agg({
+        'open': 'first',
+        'high': 'max',
+        'low': 'min',
+        'close': 'last',
+        'volume': 'sum'
+    })
+
+    return result.dropna()
+
+
+def aggregate_candles(
+    df: pd.DataFrame,
+    n_days: int,
+    mode: str = 'rolling'
+) -> pd.DataFrame:
+    """
+    Aggregate a candle DataFrame over N-day periods.
+
+    Args:
+        df: DataFrame with [open, high, low, close, volume] columns
+        n_days: Number of days to aggregate
+        mode: 'rolling' (overlapping, one candle per bar) or 'epoch'
+            (non-overlapping, epoch-aligned bins)
+
+    Returns:
+        Aggregated DataFrame (initial incomplete periods dropped)
+    """
+    if mode == 'epoch':
+        return epoch_candles(df, n_days)
+    if mode != 'rolling':
+        raise ValueError(f"Unknown aggregation mode: {mode}")
+
+    aggregated = rolling_ohlcv(
+        df['open'].to_numpy(dtype=float),
+        df['high'].to_numpy(dtype=float),
+        df['low'].to_numpy(dtype=float),
+        df['close'].to_numpy(dtype=float),
+        df['volume'].to_numpy(dtype=float),
+        n_days
+    )
+
+    result = pd.DataFrame(aggregated, index=df.index, columns=OHLCV_COLUMNS)
+
+    # Drop NaN rows from initial periods
+    return result.dropna()
+
+
+def stored_candle_type(candle_type: str, mode: str = 'rolling') -> str:
+    """
+    Get the candle_type key used in the candles table for a mode.
+
+    Args:
+        candle_type: Base candle type (e.g. 'heiken_ashi')
+        mode: Aggregation mode
+
+    Returns:
+        candle_type for rolling candles, candle_type + '_epoch' for epoch bins
+    """
+    if mode not in AGGREGATION_MODES:
+        raise ValueError(f"Unknown aggregation mode: {mode}")
+    return candle_type + EPOCH_SUFFIX if mode == 'epoch' else candle_type
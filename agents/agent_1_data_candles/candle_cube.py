@@ -0,0 +1,194 @@
+"""
+Candle Cube
+All candle types and aggregation periods for one symbol in a single columnar block
+"""
+
+import pandas as pd
+import numpy as np
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Tuple
+
+from agents.agent_1_data_candles.aggregation import OHLCV_COLUMNS, rolling_ohlcv
+from agents.agent_1_data_candles.heiken_ashi import heiken_ashi_open
+from agents.agent_1_data_candles.rolling_regression import rolling_linear_regression
+
+CandleKey = Tuple[str, int]
+
+
+class CandleCube(Mapping):
+    """
+    Columnar store of every (candle_type, aggregation_days) combination.
+
+    Values live in one float64 array shaped (combinations, 5, dates) over the
+    symbol's daily index, with a boolean mask marking which dates each
+    combination produced (warm-up rows and dropped NaN rows are absent).
+
+    The cube behaves as a read-only mapping from (candle_type, aggregation_days)
+    to a DataFrame, so it can stand in for the dictionary returned by
+    CandleGenerator.generate_all_candles. DataFrames are materialized on access
+    and not retained.
+    """
+
+    def __init__(
+        self,
+        index: pd.Index,
+        keys: List[CandleKey],
+        values: np.ndarray,
+        present: np.ndarray
+    ):
+        """
+        Initialize candle cube.
+
+        Args:
+            index: Daily date index shared by all combinations
+            keys: (candle_type, aggregation_days) for each combination
+            values: Array shaped (len(keys), 5, len(index)) in OHLCV order
+            present: Boolean array shaped (len(keys), len(index))
+        """
+        self.index = index
+        self.keys_list = list(keys)
+        self.values = values
+        self.present = present
+        self._positions = {key: i for i, key in enumerate(self.keys_list)}
+
+    def __getitem__(self, key: CandleKey) -> pd.DataFrame:
+        i = self._positions[key]
+        mask = self.present[i]
+        return pd.DataFrame(
+            self.values[i][:, mask].T,
+            index=self.index[mask],
+            columns=OHLCV_COLUMNS
+        )
+
+    def __iter__(self) -> Iterator[CandleKey]:
+        return iter(self.keys_list)
+
+    def __len__(self) -> int:
+        return len(self.keys_list)
+
+    def column(self, key: CandleKey, name: str) -> np.ndarray:
+        """
+        Get one OHLCV column of a combination over the full daily index.
+
+        Args:
+            key: (candle_type, aggregation_days)
+            name: 'open', 'high', 'low', 'close' or 'volume'
+
+        Returns:
+            Array aligned to self.index (NaN where no candle exists)
+        """
+        i = self._positions[key]
+        values = self.values[i, OHLCV_COLUMNS.index(name)].copy()
+        values[~self.present[i]] = np.nan
+        return values
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the cube arrays."""
+        return self.values.nbytes + self.present.nbytes
+
+    @classmethod
+    def build(
+        cls,
+        df: pd.DataFrame,
+        aggregation_periods: Dict[str, List[int]],
+        lr_window: int = 5
+    ) -> 'CandleCube':
+        """
+        Generate every requested combination from one pass per base series.
+
+        Each base series (regular, Heiken Ashi, linear regression) is computed
+        once and every aggregation period is derived from it, giving the same
+        candles as calling the individual generators per combination.
+
+        Args:
+            df: DataFrame with columns [date, open, high, low, close, volume]
+            aggregation_periods: Mapping of candle_type to aggregation days
+            lr_window: Window size for linear regression candles
+
+        Returns:
+            CandleCube for the symbol
+        """
+        # Ensure date index
+        if 'date' in df.columns:
+            df = df.set_index('date')
+
+        daily = np.stack([
+            df[column].to_numpy(dtype=float) for column in OHLCV_COLUMNS
+        ])
+
+        keys = [
+            (candle_type, agg_days)
+            for candle_type, periods in aggregation_periods.items()
+            for agg_days in periods
+        ]
+        values = np.full((len(keys), len(OHLCV_COLUMNS), len(df)), np.nan)
+        present = np.zeros((len(keys), len(df)), dtype=bool)
+
+        bases = {}
+        for candle_type in aggregation_periods:
+            bases[candle_type] = _base_series(candle_type, daily, lr_window)
+
+        for i, (candle_type, agg_days) in enumerate(keys):
+            base, base_present = bases[candle_type]
+
+            if agg_days == 1:
+                values[i] = base
+                present[i] = base_present
+                continue
+
+            # Aggregate over the rows the base series actually produced
+            rows = np.flatnonzero(base_present)
+            aggregated = rolling_ohlcv(*base[:, rows], agg_days)
+            for j, column in enumerate(OHLCV_COLUMNS):
+                values[i, j, rows] = aggregated[column]
+            present[i, rows] = ~np.isnan(values[i][:, rows]).any(axis=0)
+
+        return cls(df.index, keys, values, present)
+
+
+def _base_series(
+    candle_type: str,
+    daily: np.ndarray,
+    lr_window: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the 1-day base candles for a candle type.
+
+    Args:
+        candle_type: 'regular', 'heiken_ashi', or 'linear_regression'
+        daily: Array shaped (5, dates) of daily OHLCV, or (5, dates, symbols)
+            with every symbol's rows packed from the first date
+        lr_window: Window size for linear regression candles
+
+    Returns:
+        Tuple of (values shaped like daily, present mask shaped daily.shape[1:])
+    """
+    open_, high, low, close, volume = daily
+    n = daily.shape[1]
+    everywhere = np.ones(daily.shape[1:], dtype=bool)
+
+    if candle_type == 'regular':
+        # Passthrough
+        return daily, everywhere
+
+    if candle_type == 'heiken_ashi':
+        ha_close = (open_ + high + low + close) / 4
+        ha_open = heiken_ashi_open(ha_close, open_[0]) if n else ha_close
+        ha_high = np.fmax(np.fmax(high, ha_open), ha_close)
+        ha_low = np.fmin(np.fmin(low, ha_open), ha_close)
+        return np.stack([ha_open, ha_high, ha_low, ha_close, volume]), everywhere
+
+    if candle_type in ('linear_regression', 'linreg'):
+        lr_close = rolling_linear_regression(close, lr_window).fitted
+        lr_open = np.empty_like(lr_close)
+        lr_open[1:] = lr_close[:-1]
+        if n:
+            lr_open[0] = open_[0]
+        lr_high = np.fmax(np.fmax(high, lr_open), lr_close)
+        lr_low = np.fmin(np.fmin(low, lr_open), lr_close)
+        values = np.stack([lr_open, lr_high, lr_low, lr_close, volume])
+        # Drop initial NaN rows from regression window
+        return values, ~np.isnan(values).any(axis=0)
+
+    raise ValueError(f"Unknown candle type: {candle_type}")
@@ -5,14 +5,18 @@ for all aggregation periods (1-5 days)
 """
 
 import pandas as pd
-from typing import List, Tuple, Optional, Dict
+from functools import partial
+from typing import List, Tuple, Optional, Dict, Mapping
 import logging
-from tqdm import tqdm
 
+from agents.agent_1_data_candles.aggregation import AGGREGATION_MODES, stored_candle_type
+from agents.agent_1_data_candles.candle_cube import CandleCube
 from agents.agent_1_data_candles.regular_candles import generate_regular_candles
 from agents.agent_1_data_candles.heiken_ashi import generate_heiken_ashi_candles
+from agents.agent_1_data_candles.incremental import IncrementalCandleUpdater
 from agents.agent_1_data_candles.linear_regression import generate_linear_regression_candles
 from agents.agent_5_infrastructure.database_manager import DatabaseManager
+from agents.agent_5_infrastructure.worker_pool import map_with_db_workers
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +29,10 @@ class CandleGenerator:
     - Regular: 1, 2, 3, 4, 5 day (5 combinations)
     - Heiken Ashi: 1, 2, 3, 4, 5 day (5 combinations)
     - Linear Regression: 1, 2, 3 day (3 combinations)
+
+    Each candle type aggregates in 'rolling' mode (overlapping N-day candles,
+    one per trading day) or 'epoch' mode (non-overlapping N-day bars aligned
+    to 1970-01-01, stored as '<candle_type>_epoch').
     """
 
     CANDLE_TYPES = ['regular', 'heiken_ashi', 'linear_regression']
@@ -33,33 +41,60 @@ class CandleGenerator:
         'heiken_ashi': [1, 2, 3, 4, 5],
         'linear_regression': [1, 2, 3, 4, 5]  # Using all 5 for completeness
     }
+    AGGREGATION_MODES = {
+        'regular': 'rolling',
+        'heiken_ashi': 'rolling',
+        'linear_regression': 'rolling'
+    }
+    LR_WINDOW = 5
 
-    def __init__(self, db_manager: Optional[DatabaseManager] = None):
+    def __init__(
+        self,
+        db_manager: Optional[DatabaseManager] = None,
+        aggregation_modes: Optional[Dict[str, str]] = None
+    ):
         """
         Initialize candle generator.
 
         Args:
             db_manager: Database manager instance (creates new if None)
+            aggregation_modes: Per candle type 'rolling' or 'epoch'
+                (unlisted types use AGGREGATION_MODES)
         """
         self.db = db_manager or DatabaseManager()
         self.logger = logging.getLogger(__name__)
 
+        self.aggregation_modes = {**self.AGGREGATION_MODES, **(aggregation_modes or {})}
+        for candle_type, mode in self.aggregation_modes.items():
+            if candle_type not in self.CANDLE_TYPES:
+                raise ValueError(f"Unknown candle type: {candle_type}")
+            if mode not in AGGREGATION_MODES:
+                raise ValueError(f"Unknown aggregation mode for {candle_type}: {mode}")
+
     def generate_all_candles(
         self,
         symbol: str,
         df: Optional[pd.DataFrame] = None,
-        save_to_db: bool = True
-    ) -> Dict[Tuple[str, int], pd.DataFrame]:
+        save_to_db: bool = True,
+        use_cube: bool = True
+    ) -> Mapping[Tuple[str, int], pd.DataFrame]:
         """
         Generate all candle types and aggregations for a symbol.
 
+        In cube mode each base series (regular, HA, LR) is computed once and
+        all rolling aggregations are derived from it into a single CandleCube.
+        Epoch-mode candle types are keyed by their stored '<type>_epoch' name.
+
         Args:
             symbol: Stock ticker symbol
             df: DataFrame with OHLC data (loads from DB if None)
             save_to_db: Whether to save results to database
+            use_cube: Build a CandleCube in one pass (False = one
+                generate_candles call per combination)
 
         Returns:
-            Dictionary mapping (candle_type, aggregation_days) to DataFrame
+            Mapping of (candle_type, aggregation_days) to DataFrame
+            (a CandleCube in cube mode when every type is rolling)
         """
         # Load data if not provided
         if df is None:
@@ -75,10 +110,66 @@ class CandleGenerator:
             f"({len(df)} daily records)"
         )
 
+        rolling_types = self._types_in_mode('rolling')
+        epoch_types = self._types_in_mode('epoch')
+
+        if not use_cube:
+            results = self._generate_combinations(
+                symbol, df, self.CANDLE_TYPES, save_to_db
+            )
+        elif not epoch_types:
+            return self._generate_cube_candles(symbol, df, save_to_db)
+        else:
+            results = {}
+            if rolling_types:
+                cube = self._generate_cube_candles(
+                    symbol, df, save_to_db, candle_types=rolling_types
+                )
+                results.update(cube.items())
+            results.update(
+                self._generate_combinations(symbol, df, epoch_types, save_to_db)
+            )
+
+        self.logger.info(
+            f"Generated {len(results)} candle combinations for {symbol}"
+        )
+
+        return results
+
+    def _types_in_mode(self, mode: str) -> List[str]:
+        """Candle types configured for an aggregation mode."""
+        return [
+            candle_type for candle_type in self.CANDLE_TYPES
+            if self.aggregation_modes[candle_type] == mode
+        ]
+
+    def _generate_combinations(
+        self,
+        symbol: str,
+        df: pd.DataFrame,
+        candle_types: List[str],
+        save_to_db: bool
+    ) -> Dict[Tuple[str, int], pd.DataFrame]:
+        """
+        Generate (and optionally save) candles one combination at a time.
+
+        Args:
+            symbol: Stock ticker symbol
+            df: DataFrame with OHLC data
+            candle_types: Candle types to generate
+            save_to_db: Whether to save results to database
+
+        Returns:
+            Dictionary mapping (stored candle_type, aggregation_days) to DataFrame
+        """
         results = {}
 
         # Generate each candle type
-        for candle_type in self.CANDLE_TYPES:
+        for candle_type in candle_types:
+            stored_type = stored_candle_type(
+                candle_type, self.aggregation_modes[candle_type]
+            )
+
             for agg_days in self.AGGREGATION_PERIODS[candle_type]:
                 try:
                     # Generate candles
@@ -89,24 +180,24 @@ class CandleGenerator:
                     )
 
                     # Store result
-                    results[(candle_type, agg_days)] = candles
+                    results[(stored_type, agg_days)] = candles
 
                     # Save to database if requested
                     if save_to_db and not candles.empty:
                         rows = self.db.save_candles(
                             df=candles,
                             symbol=symbol,
-                            candle_type=candle_type,
+                            candle_type=stored_type,
                             aggregation_days=agg_days
                         )
                         self.logger.info(
-                            f"Saved {rows} {candle_type} "
+                            f"Saved {rows} {stored_type} "
                             f"{agg_days}-day candles for {symbol}"
                         )
 
                 except Exception as e:
                     self.logger.error(
-                        f"Failed to generate {candle_type} "
+                        f"Failed to generate {stored_type} "
                         f"{agg_days}-day candles for {symbol}: {e}"
                     )
                     self.db.log_agent_activity(
@@ -114,6 +205,90 @@ class CandleGenerator:
                         phase=1,
                         level='ERROR',
                         message=f"Failed to generate candles",
+                        context={
+                            'symbol': symbol,
+                            'candle_type': stored_type,
+                            'aggregation_days': agg_days,
+                            'error': str(e)
+                        }
+                    )
+
+        return results
+
+    def generate_candle_cube(
+        self,
+        df: pd.DataFrame,
+        candle_types: Optional[List[str]] = None
+    ) -> CandleCube:
+        """
+        Generate every rolling candle combination for a symbol as one CandleCube.
+
+        Args:
+            df: DataFrame with OHLC data
+            candle_types: Candle types to include (default: all)
+
+        Returns:
+            CandleCube keyed by (candle_type, aggregation_days)
+        """
+        return CandleCube.build(
+            df,
+            aggregation_periods={
+                candle_type: self.AGGREGATION_PERIODS[candle_type]
+                for candle_type in candle_types or self.CANDLE_TYPES
+            },
+            lr_window=self.LR_WINDOW
+        )
+
+    def _generate_cube_candles(
+        self,
+        symbol: str,
+        df: pd.DataFrame,
+        save_to_db: bool,
+        candle_types: Optional[List[str]] = None
+    ) -> CandleCube:
+        """
+        Build the candle cube for a symbol and optionally save each combination.
+
+        Args:
+            symbol: Stock ticker symbol
+            df: DataFrame with OHLC data
+            save_to_db: Whether to save results to database
+            candle_types: Candle types to include (default: all)
+
+        Returns:
+            CandleCube keyed by (candle_type, aggregation_days)
+        """
+        cube = self.generate_candle_cube(df, candle_types)
+
+        if save_to_db:
+            for candle_type, agg_days in cube:
+                try:
+                    # Materialize one combination at a time to bound memory
+                    candles = cube[(candle_type, agg_days)]
+                    if candles.empty:
+                        continue
+
+                    rows = self.db.save_candles(
+                        df=candles,
+                        symbol=symbol,
+                        candle_type=candle_type,
+                        aggregation_days=agg_days
+                    )
+                    self.logger.info(
+                        f"Saved {rows} {candle_type} "
+                        f"{agg_days}-day candles for {symbol}"
+                    )
+
+                except Exception as e:
+                    self.logger.error(
+                        f"Failed to save {candle_type} "
+                        f"{agg_days}-day candles for {symbol}: {e}"
+                    )
+                    self.db.log_agent_activity(
+                        agent_name='candle_generator',
+                        phase=1,
+                        level='ERROR',
+                        message="Failed to save candles",
                         context={
                             'symbol': symbol,
                             'candle_type': candle_type,
@@ -123,16 +298,18 @@ class CandleGenerator:
                     )
 
         self.logger.info(
-            f"Generated {len(results)} candle combinations for {symbol}"
+            f"Generated {len(cube)} candle combinations for {symbol} "
+            f"({cube.nbytes / 1024:.0f} KB cube)"
         )
 
-        return results
+        return cube
 
     def generate_candles(
         self,
         df: pd.DataFrame,
         candle_type: str,
-        aggregation_days: int
+        aggregation_days: int,
+        mode: Optional[str] = None
     ) -> pd.DataFrame:
         """
         Generate specific candle type.
@@ -141,30 +318,80 @@ class CandleGenerator:
             df: DataFrame with OHLC data
             candle_type: 'regular', 'heiken_ashi', or 'linear_regression'
             aggregation_days: Number of days to aggregate (1-5)
+            mode: 'rolling' or 'epoch' (default: configured mode for the type)
 
         Returns:
             DataFrame with generated candles
         """
+        mode = mode or self.aggregation_modes.get(candle_type, 'rolling')
+
         if candle_type == 'regular':
-            return generate_regular_candles(df, aggregation_days)
+            return generate_regular_candles(df, aggregation_days, mode=mode)
 
         elif candle_type == 'heiken_ashi':
-            return generate_heiken_ashi_candles(df, aggregation_days)
+            return generate_heiken_ashi_candles(df, aggregation_days, mode=mode)
 
         elif candle_type == 'linear_regression':
             return generate_linear_regression_candles(
                 df,
                 aggregation_days,
-                window=5
+                window=self.LR_WINDOW,
+                mode=mode
             )
 
         else:
             raise ValueError(f"Unknown candle type: {candle_type}")
 
+    def update_candles(self, symbol: str) -> Dict[Tuple[str, int], int]:
+        """
+        Append candles dated after the last stored candle for a symbol.
+
+        Falls back to full generation when any combination has no stored
+        candles yet. Epoch-mode candle types are regenerated in full, since
+        their last stored bar may still be open.
+
+        Args:
+            symbol: Stock ticker symbol
+
+        Returns:
+            Dictionary mapping (candle_type, aggregation_days) to rows saved
+        """
+        rolling_types = self._types_in_mode('rolling')
+        epoch_types = self._types_in_mode('epoch')
+
+        updater = IncrementalCandleUpdater(
+            self.db,
+            aggregation_periods={
+                candle_type: self.AGGREGATION_PERIODS[candle_type]
+                for candle_type in rolling_types
+            },
+            lr_window=self.LR_WINDOW
+        )
+
+        counts = updater.update(symbol) if rolling_types else {}
+        if counts is not None:
+            if epoch_types:
+                df = self.db.load_stock_data(symbol)
+                if not df.empty:
+                    results = self._generate_combinations(
+                        symbol, df, epoch_types, save_to_db=True
+                    )
+                    counts.update(
+                        (key, len(candles)) for key, candles in results.items()
+                    )
+            return counts
+
+        self.logger.info(f"No stored candles to resume for {symbol}, generating all")
+        results = self.generate_all_candles(symbol, save_to_db=True)
+
+        return {key: len(candles) for key, candles in results.items()}
+
     def generate_for_all_symbols(
         self,
         symbols: Optional[List[str]] = None,
-        limit: Optional[int] = None
+        limit: Optional[int] = None,
+        incremental: bool = False,
+        n_jobs: int = 1
     ) -> int:
         """
         Generate all candles for multiple symbols.
@@ -172,6 +399,9 @@ class CandleGenerator:
         Args:
             symbols: List of symbols (loads from DB if None)
             limit: Limit to first N symbols (for testing)
+            incremental: Only append candles newer than those already stored
+            n_jobs: Worker processes, each with its own database connections
+                (1 = serial, -1 = all cores)
 
         Returns:
             Number of symbols processed
@@ -189,10 +419,22 @@ class CandleGenerator:
         processed = 0
         failed = 0
 
-        # Process each symbol
-        for symbol in tqdm(symbols, desc="Generating candles"):
-            try:
-                self.generate_all_candles(symbol, save_to_db=True)
+        # Process each symbol (sharded across worker processes if n_jobs > 1)
+        outcomes = map_with_db_workers(
+            partial(
+                _process_symbol,
+                generator_cls=type(self),
+                aggregation_modes=self.aggregation_modes,
+                incremental=incremental
+            ),
+            symbols,
+            self.db,
+            n_jobs=n_jobs,
+            desc="Generating candles"
+        )
+
+        for symbol, _, error in outcomes:
+            if error is None:
                 processed += 1
 
                 # Log success
@@ -204,9 +446,9 @@ class CandleGenerator:
                     context={'symbol': symbol, 'success': True}
                 )
 
-            except Exception as e:
+            else:
                 failed += 1
-                self.logger.error(f"Failed to process {symbol}: {e}")
+                self.logger.error(f"Failed to process {symbol}: {error}")
 
                 # Log failure
                 self.db.log_agent_activity(
@@ -214,7 +456,7 @@ class CandleGenerator:
                     phase=1,
                     level='ERROR',
                     message=f"Failed to generate candles for {symbol}",
-                    context={'symbol': symbol, 'error': str(e)}
+                    context={'symbol': symbol, 'error': error}
                 )
 
         self.logger.info(
@@ -260,12 +502,37 @@ class CandleGenerator:
         return df
 
 
+def _process_symbol(
+    db_manager: DatabaseManager,
+    symbol: str,
+    generator_cls: type,
+    aggregation_modes: Dict[str, str],
+    incremental: bool
+):
+    """
+    Generate and save candles for one symbol (runs inside a worker process).
+
+    Args:
+        db_manager: Database manager owned by the worker
+        symbol: Stock ticker symbol
+        generator_cls: CandleGenerator class (or subclass) to use
+        aggregation_modes: Per candle type 'rolling' or 'epoch'
+        incremental: Only append candles newer than those already stored
+    """
+    generator = generator_cls(db_manager, aggregation_modes=aggregation_modes)
+
+    if incremental:
+        generator.update_candles(symbol)
+    else:
+        generator.generate_all_candles(symbol, save_to_db=True)
+
+
 # Convenience functions
 def generate_all_candles_for_symbol(
     symbol: str,
     df: Optional[pd.DataFrame] = None,
     db_manager: Optional[DatabaseManager] = None
-) -> Dict[Tuple[str, int], pd.DataFrame]:
+) -> Mapping[Tuple[str, int], pd.DataFrame]:
     """
     Generate all candle types for a symbol.
 
@@ -275,7 +542,7 @@ def generate_all_candles_for_symbol(
         db_manager: Database manager instance
 
     Returns:
-        Dictionary of candle DataFrames
+        CandleCube mapping (candle_type, aggregation_days) to DataFrame
     """
     generator = CandleGenerator(db_manager)
     return generator.generate_all_candles(symbol, df)
@@ -307,6 +574,27 @@ if __name__ == '__main__':
         help='Limit to first N symbols'
     )
 
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Only append candles newer than those already stored'
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Worker processes for --all (-1 = all cores)'
+    )
+
+    parser.add_argument(
+        '--epoch',
+        nargs='+',
+        default=[],
+        choices=CandleGenerator.CANDLE_TYPES,
+        help='Candle types to aggregate into non-overlapping epoch-aligned bars'
+    )
+
     parser.add_argument(
         '--summary',
         action='store_true',
@@ -315,7 +603,9 @@ if __name__ == '__main__':
 
     args = parser.parse_args()
 
-    generator = CandleGenerator()
+    generator = CandleGenerator(
+        aggregation_modes={candle_type: 'epoch' for candle_type in args.epoch}
+    )
 
     if args.summary:
         summary = generator.get_candle_summary()
@@ -325,10 +615,17 @@ if __name__ == '__main__':
         print(summary.to_string(index=False))
 
     elif args.symbol:
-        generator.generate_all_candles(args.symbol)
+        if args.incremental:
+            generator.update_candles(args.symbol)
+        else:
+            generator.generate_all_candles(args.symbol)
 
     elif args.all:
-        generator.generate_for_all_symbols(limit=args.limit)
+        generator.generate_for_all_symbols(
+            limit=args.limit,
+            incremental=args.incremental,
+            n_jobs=args.workers
+        )
 
     else:
         parser.print_help()
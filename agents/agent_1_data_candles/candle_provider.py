@@ -0,0 +1,223 @@
+"""
+Lazy Candle Provider
+Candles computed on demand from stock_data and memoized in a memory-bounded LRU
+"""
+
+import numpy as np
+import pandas as pd
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Optional, Tuple
+import logging
+
+from agents.agent_1_data_candles.aggregation import EPOCH_SUFFIX, OHLCV_COLUMNS
+from agents.agent_1_data_candles.heiken_ashi import generate_heiken_ashi_candles
+from agents.agent_1_data_candles.linear_regression import generate_linear_regression_candles
+from agents.agent_1_data_candles.regular_candles import generate_regular_candles
+from agents.agent_5_infrastructure.memory_cache import MemoryBoundedLRU
+
+logger = logging.getLogger(__name__)
+
+# LR window each stored candle type was generated with
+# ('linear_regression' by CandleGenerator, 'linreg' by scripts/generate_candles.py)
+DEFAULT_LR_WINDOWS = {
+    'linear_regression': 5,
+    'linreg': 14
+}
+
+# Decimal places of the candles table's price columns (DECIMAL(10,2))
+PRICE_DECIMALS = 2
+PRICE_COLUMNS = ['open', 'high', 'low', 'close']
+
+
+class LazyCandleProvider:
+    """
+    Serve any candle combination without reading the candles table.
+
+    Daily stock_data is loaded once per symbol; each requested
+    (candle_type, aggregation_days, window) series is computed over the full
+    history (so warm-up matches the pre-generated table) and memoized. Both
+    the daily data and the derived candles share one memory-bounded LRU.
+
+    Candle types accept the stored names: 'regular', 'heiken_ashi',
+    'linear_regression' / 'linreg', each optionally suffixed with '_epoch'
+    for epoch-aligned non-overlapping bars.
+
+    Prices are rounded to the candles table's 2 decimals exactly as storing
+    them would round them, so backtests on lazy candles match backtests on
+    the table.
+    """
+
+    def __init__(
+        self,
+        db_manager,
+        max_cache_bytes: int = 512 * 1024 * 1024,
+        cache: Optional[MemoryBoundedLRU] = None
+    ):
+        """
+        Initialize candle provider.
+
+        Args:
+            db_manager: DatabaseManager instance (source of stock_data)
+            max_cache_bytes: Memory budget for cached data (default: 512 MB)
+            cache: Existing cache to share (overrides max_cache_bytes)
+        """
+        self.db = db_manager
+        self.cache = cache or MemoryBoundedLRU(max_cache_bytes)
+        self.logger = logging.getLogger(__name__)
+
+    def get_candles(
+        self,
+        symbol: str,
+        candle_type: str,
+        aggregation_days: int,
+        window: Optional[int] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Get candles for a symbol, computing them on first request.
+
+        Args:
+            symbol: Stock symbol
+            candle_type: Stored candle type name (see class docstring)
+            aggregation_days: Aggregation period
+            window: LR window (default: window the stored type used)
+            start_date: Optional start date (YYYY-MM-DD)
+            end_date: Optional end date (YYYY-MM-DD)
+
+        Returns:
+            DataFrame indexed by date with [open, high, low, close, volume]
+            (empty if the symbol has no stock data)
+        """
+        base_type, mode = _parse_candle_type(candle_type)
+        if base_type in DEFAULT_LR_WINDOWS:
+            window = window or DEFAULT_LR_WINDOWS[base_type]
+            # Both LR names produce the same candles for the same window
+            base_type = 'linear_regression'
+        else:
+            window = None
+
+        key = ('candles', symbol, base_type, aggregation_days, window, mode)
+        candles = self.cache.get_or_compute(
+            key,
+            lambda: self._compute(symbol, base_type, aggregation_days, window, mode)
+        )
+
+        if start_date or end_date:
+            candles = candles.loc[start_date:end_date]
+
+        return candles.copy()
+
+    def get_daily(self, symbol: str) -> pd.DataFrame:
+        """
+        Get cached daily OHLCV for a symbol.
+
+        Args:
+            symbol: Stock symbol
+
+        Returns:
+            DataFrame indexed by date with float OHLCV columns
+        """
+        return self.cache.get_or_compute(
+            ('daily', symbol),
+            lambda: self._load_daily(symbol)
+        )
+
+    def invalidate(self, symbol: Optional[str] = None):
+        """
+        Drop cached data (e.g. after new stock_data has been loaded).
+
+        Args:
+            symbol: Only drop this symbol (None = everything)
+        """
+        self.cache.invalidate(
+            None if symbol is None else (lambda key: key[1] == symbol)
+        )
+
+    def _load_daily(self, symbol: str) -> pd.DataFrame:
+        """Load daily OHLCV from stock_data as floats."""
+        df = self.db.load_stock_data(symbol)
+        if df.empty:
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+        return df[OHLCV_COLUMNS].astype(float)
+
+    def _compute(
+        self,
+        symbol: str,
+        base_type: str,
+        aggregation_days: int,
+        window: Optional[int],
+        mode: str
+    ) -> pd.DataFrame:
+        """Compute one candle series over the symbol's full history."""
+        daily = self.get_daily(symbol)
+        if daily.empty:
+            return daily
+
+        if base_type == 'regular':
+            candles = generate_regular_candles(daily, aggregation_days, mode=mode)
+        elif base_type == 'heiken_ashi':
+            candles = generate_heiken_ashi_candles(daily, aggregation_days, mode=mode)
+        else:
+            candles = generate_linear_regression_candles(
+                daily, aggregation_days, window=window, mode=mode
+            )
+
+        # Match the candles table (DECIMAL(10,2))
+        candles[PRICE_COLUMNS] = round_numeric(
+            candles[PRICE_COLUMNS].to_numpy(), PRICE_DECIMALS
+        )
+
+        self.logger.debug(
+            f"Computed {len(candles)} {base_type} {aggregation_days}d "
+            f"({mode}) candles for {symbol}"
+        )
+
+        return candles
+
+
+def round_numeric(values, decimals: int = PRICE_DECIMALS) -> np.ndarray:
+    """
+    Round floats as storing them in a PostgreSQL NUMERIC column does.
+
+    Candles reach the table as CSV text (the shortest repr of each float),
+    which NUMERIC rounds half away from zero. np.round instead rounds the
+    binary value half to even, which differs on ties such as 2.675.
+
+    Args:
+        values: Array-like of floats (NaN is kept)
+        decimals: Decimal places of the column
+
+    Returns:
+        float array of the values the column would return
+    """
+    quantum = Decimal(1).scaleb(-decimals)
+
+    def round_one(value):
+        if not np.isfinite(value):
+            return value
+        return float(Decimal(repr(float(value))).quantize(quantum, rounding=ROUND_HALF_UP))
+
+    values = np.asarray(values, dtype=float)
+    return np.frompyfunc(round_one, 1, 1)(values).astype(float)
+
+
+def _parse_candle_type(candle_type: str) -> Tuple[str, str]:
+    """
+    Split a stored candle type name into (base type, aggregation mode).
+
+    Args:
+        candle_type: e.g. 'heiken_ashi' or 'linreg_epoch'
+
+    Returns:
+        Tuple of (base candle type, 'rolling' or 'epoch')
+    """
+    mode = 'rolling'
+    if candle_type.endswith(EPOCH_SUFFIX):
+        candle_type = candle_type[:-len(EPOCH_SUFFIX)]
+        mode = 'epoch'
+
+    if candle_type not in ('regular', 'heiken_ashi') and candle_type not in DEFAULT_LR_WINDOWS:
+        raise ValueError(f"Unknown candle type: {candle_type}")
+
+    return candle_type, mode
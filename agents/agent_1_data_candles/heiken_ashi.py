@@ -5,7 +5,11 @@ Smoothed candles that reduce noise and highlight trends
 
 import pandas as pd
 import numpy as np
+from scipy.signal import lfilter
 import logging
+from typing import Optional
+
+from agents.agent_1_data_candles.aggregation import aggregate_candles
 
 logger = logging.getLogger(__name__)
 
@@ -27,7 +31,9 @@ class HeikenAshiCandleGenerator:
     def generate(
         self,
         df: pd.DataFrame,
-        aggregation_days: int = 1
+        aggregation_days: int = 1,
+        first_open: Optional[float] = None,
+        mode: str = 'rolling'
     ) -> pd.DataFrame:
         """
         Generate Heiken Ashi candles.
@@ -35,6 +41,10 @@ class HeikenAshiCandleGenerator:
         Args:
             df: DataFrame with columns [date, open, high, low, close, volume]
             aggregation_days: Number of days to aggregate (1, 2, 3, 4, 5)
+            first_open: HA open of the first row (None = regular open);
+                used to resume the recurrence from previously stored candles
+            mode: 'rolling' (overlapping N-day candles) or 'epoch'
+                (non-overlapping epoch-aligned bins)
 
         Returns:
             DataFrame with Heiken Ashi candles
@@ -47,20 +57,25 @@ class HeikenAshiCandleGenerator:
             df = df.set_index('date')
 
         # First generate base HA candles
-        ha_df = self._calculate_heiken_ashi(df.copy())
+        ha_df = self._calculate_heiken_ashi(df.copy(), first_open)
 
         # Then apply aggregation if needed
         if aggregation_days > 1:
-            ha_df = self._aggregate(ha_df, aggregation_days)
+            ha_df = self._aggregate(ha_df, aggregation_days, mode)
 
         return ha_df
 
-    def _calculate_heiken_ashi(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _calculate_heiken_ashi(
+        self,
+        df: pd.DataFrame,
+        first_open: Optional[float] = None
+    ) -> pd.DataFrame:
         """
         Calculate Heiken Ashi candles from regular OHLC data.
 
         Args:
             df: DataFrame with OHLC data
+            first_open: HA open of the first row (None = regular open)
 
         Returns:
             DataFrame with Heiken Ashi candles
@@ -70,16 +85,14 @@ class HeikenAshiCandleGenerator:
         # HA_Close = (Open + High + Low + Close) / 4
         ha_df['close'] = (df['open'] + df['high'] + df['low'] + df['close']) / 4
 
-        # Initialize HA_Open for first row
-        # Common practice: use regular candle's open for first HA candle
-        ha_df['open'] = np.nan
-        ha_df.loc[ha_df.index[0], 'open'] = df.loc[df.index[0], 'open']
-
         # HA_Open = (Previous HA_Open + Previous HA_Close) / 2
-        for i in range(1, len(ha_df)):
-            ha_df.iloc[i, ha_df.columns.get_loc('open')] = (
-                (ha_df.iloc[i-1]['open'] + ha_df.iloc[i-1]['close']) / 2
-            )
+        # Common practice: use regular candle's open for first HA candle
+        if first_open is None:
+            first_open = df.loc[df.index[0], 'open']
+        ha_df['open'] = heiken_ashi_open(
+            ha_df['close'].to_numpy(dtype=float),
+            float(first_open)
+        )
 
         # HA_High = max(High, HA_Open, HA_Close)
         ha_df['high'] = df[['high']].join(ha_df[['open', 'close']]).max(axis=1)
@@ -97,40 +110,73 @@ class HeikenAshiCandleGenerator:
 
         return ha_df
 
-    def _aggregate(self, df: pd.DataFrame, n_days: int) -> pd.DataFrame:
+    def _aggregate(
+        self,
+        df: pd.DataFrame,
+        n_days: int,
+        mode: str = 'rolling'
+    ) -> pd.DataFrame:
         """
         Aggregate Heiken Ashi candles over N-day periods.
 
         Args:
             df: DataFrame with HA candles
             n_days: Number of days to aggregate
+            mode: 'rolling' or 'epoch'
 
         Returns:
             Aggregated DataFrame
         """
-        # Create rolling windows manually since 'first'/'last' don't work with pandas rolling
-        rolling = df.rolling(window=n_days, min_periods=n_days)
-
-        result = pd.DataFrame(index=df.index)
-        result['open'] = rolling['open'].apply(lambda x: x.iloc[0], raw=False)
-        result['high'] = rolling['high'].max()
-        result['low'] = rolling['low'].min()
-        result['close'] = rolling['close'].apply(lambda x: x.iloc[-1], raw=False)
-        result['volume'] = rolling['volume'].sum()
-
-        result = result.dropna()
+        # Shift-based first/last with strided rolling max/min/sum,
+        # or epoch-aligned resampling
+        result = aggregate_candles(df, n_days, mode)
 
         self.logger.info(
-            f"Aggregated {len(result)} {n_days}-day Heiken Ashi candles "
+            f"Aggregated {len(result)} {n_days}-day {mode} Heiken Ashi candles "
             f"from {len(df)} daily candles"
         )
 
         return result
 
 
+def heiken_ashi_open(ha_close, first_open) -> np.ndarray:
+    """
+    Solve the HA_Open recurrence for a whole series in one call.
+
+    HA_Open[i] = (HA_Open[i-1] + HA_Close[i-1]) / 2 is a first-order linear
+    filter over the lagged HA_Close series, so it is evaluated with
+    scipy.signal.lfilter rather than a Python loop. Halving is exact in
+    binary floating point, which keeps the result bit-for-bit identical to
+    the iterative form.
+
+    Args:
+        ha_close: HA close values, shape (n,) or (n, n_symbols) with dates on axis 0
+        first_open: HA open of the first row (scalar, or one value per symbol)
+
+    Returns:
+        Array of HA open values with the same shape as ha_close
+    """
+    ha_close = np.asarray(ha_close, dtype=float)
+    first_open = np.asarray(first_open, dtype=float)
+
+    ha_open = np.empty_like(ha_close)
+    if len(ha_close) == 0:
+        return ha_open
+
+    ha_open[0] = first_open
+    if len(ha_close) > 1:
+        # Filter state 0.5 * HA_Open[0] seeds the first step of the recurrence
+        zi = (0.5 * np.broadcast_to(first_open, ha_close.shape[1:]))[np.newaxis]
+        ha_open[1:], _ = lfilter([0.5], [1.0, -0.5], ha_close[:-1], axis=0, zi=zi)
+
+    return ha_open
+
+
 def generate_heiken_ashi_candles(
     df: pd.DataFrame,
-    aggregation_days: int = 1
+    aggregation_days: int = 1,
+    first_open: Optional[float] = None,
+    mode: str = 'rolling'
 ) -> pd.DataFrame:
     """
     Convenience function to generate Heiken Ashi candles.
@@ -138,9 +184,11 @@ def generate_heiken_ashi_candles(
     Args:
         df: DataFrame with OHLC data
         aggregation_days: Number of days to aggregate
+        first_open: HA open of the first row (None = regular open)
+        mode: 'rolling' or 'epoch'
 
     Returns:
         DataFrame with Heiken Ashi candles
     """
     generator = HeikenAshiCandleGenerator()
-    return generator.generate(df, aggregation_days)
+    return generator.generate(df, aggregation_days, first_open, mode)
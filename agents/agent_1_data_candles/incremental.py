@@ -0,0 +1,277 @@
+"""
+Incremental Candle Generation
+Append-only updates that resume candle state from the candles already stored
+"""
+
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from agents.agent_1_data_candles.aggregation import OHLCV_COLUMNS, aggregate_candles
+from agents.agent_1_data_candles.candle_cube import CandleCube
+from agents.agent_1_data_candles.heiken_ashi import generate_heiken_ashi_candles
+
+logger = logging.getLogger(__name__)
+
+CandleKey = Tuple[str, int]
+
+
+class IncrementalCandleUpdater:
+    """
+    Generate only the candles newer than what is already stored.
+
+    For each (candle_type, aggregation_days) the last stored date is read with
+    one MAX(date) query per symbol. Only a short warm-up tail of daily data
+    before the oldest of those dates is reloaded:
+
+    - Regular and linear regression candles are recomputed over the tail
+      (lr_window + max aggregation rows covers every regression window and
+      aggregation window ending after the resume point).
+    - Heiken Ashi is path dependent, so its recurrence is seeded from the
+      stored 1-day HA candle at the resume point and the stored 1-day tail is
+      reused as the base for the aggregated periods.
+
+    Stored prices are rounded to the candles table precision; the HA
+    recurrence halves any seed difference on every new bar.
+    """
+
+    def __init__(
+        self,
+        db_manager,
+        aggregation_periods: Dict[str, List[int]],
+        lr_window: int = 5
+    ):
+        """
+        Initialize incremental updater.
+
+        Args:
+            db_manager: Database manager instance
+            aggregation_periods: Mapping of candle_type to aggregation days
+            lr_window: Window size for linear regression candles
+        """
+        self.db = db_manager
+        self.aggregation_periods = aggregation_periods
+        self.lr_window = lr_window
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def warmup_rows(self) -> int:
+        """Daily rows needed before the resume point to rebuild new candles."""
+        max_agg = max(
+            (max(periods) for periods in self.aggregation_periods.values() if periods),
+            default=1
+        )
+        return self.lr_window + max_agg
+
+    def get_last_dates(self, symbol: str) -> Dict[CandleKey, pd.Timestamp]:
+        """
+        Get the last stored candle date per (candle_type, aggregation_days).
+
+        Args:
+            symbol: Stock ticker symbol
+
+        Returns:
+            Dictionary mapping (candle_type, aggregation_days) to last date
+        """
+        query = """
+            SELECT candle_type, aggregation_days, MAX(date)
+            FROM candles
+            WHERE symbol = %s
+            GROUP BY candle_type, aggregation_days
+        """
+        results = self.db.execute_query(query, (symbol,))
+
+        return {
+            (candle_type, agg_days): pd.Timestamp(last_date)
+            for candle_type, agg_days, last_date in results or []
+        }
+
+    def generate(self, symbol: str) -> Optional[Dict[CandleKey, pd.DataFrame]]:
+        """
+        Generate the candles dated after the last stored candle.
+
+        Args:
+            symbol: Stock ticker symbol
+
+        Returns:
+            Dictionary mapping (candle_type, aggregation_days) to new candles,
+            or None if some combination has no stored candles yet (a full
+            generation is required)
+        """
+        last_dates = self.get_last_dates(symbol)
+
+        keys = [
+            (candle_type, agg_days)
+            for candle_type, periods in self.aggregation_periods.items()
+            for agg_days in periods
+        ]
+        ha_types = ['heiken_ashi'] if 'heiken_ashi' in self.aggregation_periods else []
+        required = keys + [(candle_type, 1) for candle_type in ha_types]
+
+        if any(key not in last_dates for key in required):
+            return None
+
+        resume_date = min(last_dates[key] for key in required)
+        start_date = self._warmup_start(symbol, resume_date)
+
+        daily = self.db.load_stock_data(symbol, start_date=start_date)
+        if daily.empty or daily.index.max() <= resume_date:
+            return {key: pd.DataFrame(columns=OHLCV_COLUMNS) for key in keys}
+        daily = daily[OHLCV_COLUMNS].astype(float)
+
+        results = {}
+
+        # Regular and LR candles depend only on the daily tail
+        stateless = {
+            candle_type: periods
+            for candle_type, periods in self.aggregation_periods.items()
+            if candle_type not in ha_types
+        }
+        if stateless:
+            cube = CandleCube.build(daily, stateless, lr_window=self.lr_window)
+            for key in cube:
+                candles = cube[key]
+                results[key] = candles[candles.index > last_dates[key]]
+
+        for candle_type in ha_types:
+            base = self._resume_heiken_ashi(
+                symbol, candle_type, daily, last_dates[(candle_type, 1)]
+            )
+            for agg_days in self.aggregation_periods[candle_type]:
+                candles = base if agg_days == 1 else aggregate_candles(base, agg_days)
+                key = (candle_type, agg_days)
+                results[key] = candles[candles.index > last_dates[key]]
+
+        return results
+
+    def update(self, symbol: str) -> Optional[Dict[CandleKey, int]]:
+        """
+        Generate and save the new candles for a symbol.
+
+        Args:
+            symbol: Stock ticker symbol
+
+        Returns:
+            Dictionary mapping (candle_type, aggregation_days) to rows saved,
+            or None if a full generation is required
+        """
+        results = self.generate(symbol)
+        if results is None:
+            return None
+
+        counts = {}
+        for (candle_type, agg_days), candles in results.items():
+            counts[(candle_type, agg_days)] = 0
+            if candles.empty:
+                continue
+
+            self.db.save_candles(
+                df=candles,
+                symbol=symbol,
+                candle_type=candle_type,
+                aggregation_days=agg_days
+            )
+            counts[(candle_type, agg_days)] = len(candles)
+
+        self.logger.info(
+            f"Appended {sum(counts.values())} candles for {symbol}"
+        )
+
+        return counts
+
+    def _warmup_start(
+        self,
+        symbol: str,
+        resume_date: pd.Timestamp
+    ) -> Optional[pd.Timestamp]:
+        """
+        Find the first daily date of the warm-up tail before resume_date.
+
+        Args:
+            symbol: Stock ticker symbol
+            resume_date: Oldest last-stored candle date
+
+        Returns:
+            Start date for loading daily data (None = full history)
+        """
+        query = """
+            SELECT date
+            FROM stock_data
+            WHERE symbol = %s AND date <= %s
+            ORDER BY date DESC
+            OFFSET %s LIMIT 1
+        """
+        results = self.db.execute_query(
+            query, (symbol, resume_date.date(), self.warmup_rows)
+        )
+
+        if not results:
+            return None
+
+        return pd.Timestamp(results[0][0])
+
+    def _resume_heiken_ashi(
+        self,
+        symbol: str,
+        candle_type: str,
+        daily: pd.DataFrame,
+        last_date: pd.Timestamp
+    ) -> pd.DataFrame:
+        """
+        Extend the stored 1-day Heiken Ashi series over the new daily rows.
+
+        Args:
+            symbol: Stock ticker symbol
+            candle_type: Stored candle type name for Heiken Ashi
+            daily: Daily OHLCV tail
+            last_date: Last stored 1-day HA date
+
+        Returns:
+            1-day HA candles covering the daily tail
+        """
+        stored = self.db.load_candles(
+            symbol,
+            candle_type,
+            1,
+            start_date=daily.index[0].date(),
+            end_date=last_date.date()
+        )
+        if stored.empty or stored.index[-1] != last_date:
+            raise ValueError(
+                f"Stored {candle_type} 1-day candles for {symbol} "
+                f"do not reach {last_date.date()}"
+            )
+        stored = stored[OHLCV_COLUMNS].astype(float)
+
+        new_daily = daily[daily.index > last_date]
+        if new_daily.empty:
+            return stored
+
+        # HA_Open = (Previous HA_Open + Previous HA_Close) / 2
+        first_open = (stored['open'].iloc[-1] + stored['close'].iloc[-1]) / 2
+        new_candles = generate_heiken_ashi_candles(new_daily, 1, first_open)
+
+        return pd.concat([stored, new_candles])
+
+
+def update_candles_incrementally(
+    symbol: str,
+    db_manager,
+    aggregation_periods: Dict[str, List[int]],
+    lr_window: int = 5
+) -> Optional[Dict[CandleKey, int]]:
+    """
+    Convenience function to append new candles for a symbol.
+
+    Args:
+        symbol: Stock ticker symbol
+        db_manager: Database manager instance
+        aggregation_periods: Mapping of candle_type to aggregation days
+        lr_window: Window size for linear regression candles
+
+    Returns:
+        Rows saved per (candle_type, aggregation_days), or None if a full
+        generation is required
+    """
+    updater = IncrementalCandleUpdater(db_manager, aggregation_periods, lr_window)
+    return updater.update(symbol)
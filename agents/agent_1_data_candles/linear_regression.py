@@ -4,10 +4,11 @@ Candles based on linear regression of price data
 """
 
 import pandas as pd
-import numpy as np
-from scipy import stats
 import logging
 
+from agents.agent_1_data_candles.aggregation import aggregate_candles
+from agents.agent_1_data_candles.rolling_regression import rolling_linear_regression
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,7 +36,8 @@ class LinearRegressionCandleGenerator:
     def generate(
         self,
         df: pd.DataFrame,
-        aggregation_days: int = 1
+        aggregation_days: int = 1,
+        mode: str = 'rolling'
     ) -> pd.DataFrame:
         """
         Generate Linear Regression candles.
@@ -43,6 +45,8 @@ class LinearRegressionCandleGenerator:
         Args:
             df: DataFrame with columns [date, open, high, low, close, volume]
             aggregation_days: Number of days to aggregate (1, 2, 3, 4, 5)
+            mode: 'rolling' (overlapping N-day candles) or 'epoch'
+                (non-overlapping epoch-aligned bins)
 
         Returns:
             DataFrame with Linear Regression candles
@@ -59,7 +63,7 @@ class LinearRegressionCandleGenerator:
 
         # Then apply aggregation if needed
         if aggregation_days > 1:
-            lr_df = self._aggregate(lr_df, aggregation_days)
+            lr_df = self._aggregate(lr_df, aggregation_days, mode)
 
         return lr_df
 
@@ -135,74 +139,39 @@ class LinearRegressionCandleGenerator:
         Returns:
             Series with regression predictions
         """
-        predictions = []
-
-        for i in range(len(series)):
-            if i < window - 1:
-                # Not enough data yet
-                predictions.append(np.nan)
-            else:
-                # Get window of data
-                window_data = series.iloc[i - window + 1:i + 1].values
-
-                # Convert to float array (handles Decimal types from database)
-                try:
-                    window_data = np.array(window_data, dtype=float)
-                except (ValueError, TypeError):
-                    predictions.append(np.nan)
-                    continue
-
-                # Validate data
-                if len(window_data) != window or np.any(np.isnan(window_data)):
-                    predictions.append(np.nan)
-                    continue
-
-                try:
-                    # Fit linear regression
-                    x = np.arange(window)
-                    result = stats.linregress(x, window_data)
-
-                    # Handle both old tuple format and new LinregressResult object
-                    if hasattr(result, 'slope'):
-                        slope = result.slope
-                        intercept = result.intercept
-                    else:
-                        slope, intercept = result[0], result[1]
-
-                    # Predict value at end of window (last position)
-                    prediction = slope * (window - 1) + intercept
-
-                    predictions.append(prediction)
-                except Exception:
-                    predictions.append(np.nan)
-
-        return pd.Series(predictions, index=series.index)
-
-    def _aggregate(self, df: pd.DataFrame, n_days: int) -> pd.DataFrame:
+        # Convert to float (handles Decimal types from database);
+        # unconvertible values become NaN and invalidate their windows
+        values = pd.to_numeric(series, errors='coerce').to_numpy(dtype=float)
+
+        # All windows in one pass from running sums
+        fit = rolling_linear_regression(values, window)
+
+        # Predict value at end of window (last position)
+        return pd.Series(fit.fitted, index=series.index)
+
+    def _aggregate(
+        self,
+        df: pd.DataFrame,
+        n_days: int,
+        mode: str = 'rolling'
+    ) -> pd.DataFrame:
         """
         Aggregate Linear Regression candles over N-day periods.
 
         Args:
             df: DataFrame with LR candles
             n_days: Number of days to aggregate
+            mode: 'rolling' or 'epoch'
 
         Returns:
             Aggregated DataFrame
         """
-        # Create rolling windows manually since 'first'/'last' don't work with pandas rolling
-        rolling = df.rolling(window=n_days, min_periods=n_days)
-
-        result = pd.DataFrame(index=df.index)
-        result['open'] = rolling['open'].apply(lambda x: x.iloc[0], raw=False)
-        result['high'] = rolling['high'].max()
-        result['low'] = rolling['low'].min()
-        result['close'] = rolling['close'].apply(lambda x: x.iloc[-1], raw=False)
-        result['volume'] = rolling['volume'].sum()
-
-        result = result.dropna()
+        # Shift-based first/last with strided rolling max/min/sum,
+        # or epoch-aligned resampling
+        result = aggregate_candles(df, n_days, mode)
 
         self.logger.info(
-            f"Aggregated {len(result)} {n_days}-day Linear Regression candles "
+            f"Aggregated {len(result)} {n_days}-day {mode} Linear Regression candles "
             f"from {len(df)} daily candles"
         )
 
@@ -212,7 +181,8 @@ class LinearRegressionCandleGenerator:
 def generate_linear_regression_candles(
     df: pd.DataFrame,
     aggregation_days: int = 1,
-    window: int = 5
+    window: int = 5,
+    mode: str = 'rolling'
 ) -> pd.DataFrame:
     """
     Convenience function to generate Linear Regression candles.
@@ -221,9 +191,10 @@ def generate_linear_regression_candles(
         df: DataFrame with OHLC data
         aggregation_days: Number of days to aggregate
         window: Window size for linear regression
+        mode: 'rolling' or 'epoch'
 
     Returns:
         DataFrame with Linear Regression candles
     """
     generator = LinearRegressionCandleGenerator(window=window)
-    return generator.generate(df, aggregation_days)
+    return generator.generate(df, aggregation_days, mode)
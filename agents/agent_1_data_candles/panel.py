@@ -0,0 +1,151 @@
+"""
+Panel Candle Generation
+All candle types for a dates x symbols universe computed on 2-D arrays
+"""
+
+import numpy as np
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from agents.agent_1_data_candles.aggregation import OHLCV_COLUMNS, rolling_ohlcv
+from agents.agent_1_data_candles.candle_cube import _base_series
+
+CandleKey = Tuple[str, int]
+
+
+class CandlePanel(NamedTuple):
+    """
+    One (candle_type, aggregation_days) combination for every symbol.
+
+    Fields:
+        values: Array shaped (5, dates, symbols) in OHLCV order
+        present: Boolean array shaped (dates, symbols); False where the
+            symbol has no candle (invalid input rows, warm-up rows)
+    """
+    values: np.ndarray
+    present: np.ndarray
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Get one OHLCV column with NaN where no candle exists.
+
+        Args:
+            name: 'open', 'high', 'low', 'close' or 'volume'
+
+        Returns:
+            Array shaped (dates, symbols)
+        """
+        return np.where(self.present, self.values[OHLCV_COLUMNS.index(name)], np.nan)
+
+
+def generate_panel_candles(
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray,
+    aggregation_periods: Dict[str, List[int]],
+    valid: Optional[np.ndarray] = None,
+    lr_window: int = 5
+) -> Dict[CandleKey, CandlePanel]:
+    """
+    Generate candles for every symbol of a panel at once.
+
+    Symbols may trade on different dates. Each symbol's valid rows are packed
+    to the top of its column, so the shared 2-D kernels see the same
+    contiguous series the single-symbol generators would, and results are
+    scattered back to the original dates. Per symbol the output equals
+    CandleCube.build on that symbol's valid rows.
+
+    Args:
+        open_, high, low, close, volume: Arrays shaped (dates, symbols)
+        aggregation_periods: Mapping of candle_type to aggregation days
+        valid: Boolean array shaped (dates, symbols) marking rows that exist
+            for each symbol (default: close is not NaN)
+        lr_window: Window size for linear regression candles
+
+    Returns:
+        Dictionary mapping (candle_type, aggregation_days) to CandlePanel
+    """
+    daily = np.stack([
+        np.asarray(values, dtype=float)
+        for values in (open_, high, low, close, volume)
+    ])
+    if daily.ndim != 3:
+        raise ValueError("OHLCV arrays must be shaped (dates, symbols)")
+
+    if valid is None:
+        valid = ~np.isnan(daily[3])
+    valid = np.asarray(valid, dtype=bool)
+    if valid.shape != daily.shape[1:]:
+        raise ValueError(
+            f"valid mask shape {valid.shape} does not match data {daily.shape[1:]}"
+        )
+
+    packed_daily, daily_order, packed_valid = _pack(daily, valid)
+
+    results = {}
+    for candle_type, periods in aggregation_periods.items():
+        base, base_present = _base_series(candle_type, packed_daily, lr_window)
+        base_present = base_present & packed_valid
+
+        for agg_days in periods:
+            if agg_days == 1:
+                values, present = base, base_present
+            else:
+                # Aggregate over the rows the base series actually produced
+                packed_base, base_order, _ = _pack(base, base_present)
+                aggregated = np.stack([
+                    rolling_ohlcv(*packed_base, agg_days)[column]
+                    for column in OHLCV_COLUMNS
+                ])
+                values = _unpack(aggregated, base_order)
+                present = base_present & ~np.isnan(values).any(axis=0)
+
+            results[(candle_type, agg_days)] = CandlePanel(
+                values=_unpack(values, daily_order),
+                present=_unpack(present, daily_order)
+            )
+
+    return results
+
+
+def _pack(
+    values: np.ndarray,
+    mask: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Move each symbol's masked rows to the top of its column, keeping order.
+
+    Args:
+        values: Array shaped (fields, dates, symbols)
+        mask: Boolean array shaped (dates, symbols)
+
+    Returns:
+        Tuple of (packed values with NaN below each symbol's rows,
+        row order for _unpack, packed mask)
+    """
+    order = np.argsort(~mask, axis=0, kind='stable')
+    packed = np.take_along_axis(values, order[np.newaxis], axis=1)
+    packed_mask = np.arange(mask.shape[0])[:, np.newaxis] < mask.sum(axis=0)
+    packed[:, ~packed_mask] = np.nan
+    return packed, order, packed_mask
+
+
+def _unpack(packed: np.ndarray, order: np.ndarray) -> np.ndarray:
+    """
+    Scatter packed rows back to their original dates (inverse of _pack).
+
+    Args:
+        packed: Array shaped (dates, symbols) or (fields, dates, symbols)
+        order: Row order returned by _pack
+
+    Returns:
+        Array in original row order; rows outside the mask keep the packed
+        fill (NaN for values, False for masks)
+    """
+    out = np.empty_like(packed)
+    if packed.ndim == order.ndim:
+        np.put_along_axis(out, order, packed, axis=0)
+    else:
+        np.put_along_axis(out, order[np.newaxis], packed, axis=1)
+    return out
@@ -8,6 +8,8 @@ import numpy as np
 from typing import Optional
 import logging
 
+from agents.agent_1_data_candles.aggregation import aggregate_candles
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,7 +22,8 @@ class RegularCandleGenerator:
     def generate(
         self,
         df: pd.DataFrame,
-        aggregation_days: int = 1
+        aggregation_days: int = 1,
+        mode: str = 'rolling'
     ) -> pd.DataFrame:
         """
         Generate regular OHLC candles.
@@ -31,6 +34,8 @@ class RegularCandleGenerator:
         Args:
             df: DataFrame with columns [date, open, high, low, close, volume]
             aggregation_days: Number of days to aggregate (1, 2, 3, 4, 5)
+            mode: 'rolling' (overlapping N-day candles) or 'epoch'
+                (non-overlapping epoch-aligned bins)
 
         Returns:
             DataFrame with regular OHLC candles
@@ -47,9 +52,14 @@ class RegularCandleGenerator:
             return df[['open', 'high', 'low', 'close', 'volume']].copy()
 
         # Aggregate multiple days
-        return self._aggregate(df, aggregation_days)
+        return self._aggregate(df, aggregation_days, mode)
 
-    def _aggregate(self, df: pd.DataFrame, n_days: int) -> pd.DataFrame:
+    def _aggregate(
+        self,
+        df: pd.DataFrame,
+        n_days: int,
+        mode: str = 'rolling'
+    ) -> pd.DataFrame:
         """
         Aggregate OHLC data over N-day periods.
 
@@ -63,25 +73,17 @@ class RegularCandleGenerator:
         Args:
             df: DataFrame with OHLC data
             n_days: Number of days to aggregate
+            mode: 'rolling' or 'epoch'
 
         Returns:
             Aggregated DataFrame
         """
-        # Create rolling windows manually since 'first'/'last' don't work with pandas rolling
-        rolling = df.rolling(window=n_days, min_periods=n_days)
-
-        result = pd.DataFrame(index=df.index)
-        result['open'] = rolling['open'].apply(lambda x: x.iloc[0], raw=False)
-        result['high'] = rolling['high'].max()
-        result['low'] = rolling['low'].min()
-        result['close'] = rolling['close'].apply(lambda x: x.iloc[-1], raw=False)
-        result['volume'] = rolling['volume'].sum()
-
-        # Drop NaN rows from initial periods
-        result = result.dropna()
+        # Shift-based first/last with strided rolling max/min/sum,
+        # or epoch-aligned resampling
+        result = aggregate_candles(df, n_days, mode)
 
         self.logger.info(
-            f"Generated {len(result)} {n_days}-day regular candles "
+            f"Generated {len(result)} {n_days}-day {mode} regular candles "
             f"from {len(df)} daily candles"
         )
 
@@ -90,7 +92,8 @@ class RegularCandleGenerator:
 
 def generate_regular_candles(
     df: pd.DataFrame,
-    aggregation_days: int = 1
+    aggregation_days: int = 1,
+    mode: str = 'rolling'
 ) -> pd.DataFrame:
     """
     Convenience function to generate regular candles.
@@ -98,9 +101,10 @@ def generate_regular_candles(
     Args:
         df: DataFrame with OHLC data
         aggregation_days: Number of days to aggregate
+        mode: 'rolling' or 'epoch'
 
     Returns:
         DataFrame with regular candles
     """
     generator = RegularCandleGenerator()
-    return generator.generate(df, aggregation_days)
+    return generator.generate(df, aggregation_days, mode)
@@ -0,0 +1,257 @@
+"""
+Rolling Linear Regression Engine
+Least-squares fits over every sliding window of a series in one vectorized pass
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict, NamedTuple
+
+
+class RegressionFit(NamedTuple):
+    """
+    Rolling least-squares fit results, one value per bar.
+
+    Each window is regressed against x = 0, 1, ..., window-1, matching
+    scipy.stats.linregress / np.polyfit on np.arange(window). Bars without a
+    full window, and windows containing NaN, are NaN.
+
+    Fields:
+        slope: Slope of the fitted line
+        intercept: Fitted line value at the first bar of the window (x = 0)
+        r_squared: Coefficient of determination, clamped to [0, 1]
+        window: Window size used for the fit
+    """
+    slope: np.ndarray
+    intercept: np.ndarray
+    r_squared: np.ndarray
+    window: int
+
+    def project(self, x) -> np.ndarray:
+        """
+        Evaluate the fitted line at position x within each window.
+
+        Args:
+            x: Position relative to the first bar of the window
+               (window - 1 = current bar, window = one bar ahead)
+
+        Returns:
+            Array of projected values
+        """
+        return self.intercept + self.slope * x
+
+    @property
+    def fitted(self) -> np.ndarray:
+        """Fitted value at the last bar of each window."""
+        return self.project(self.window - 1)
+
+
+class RollingRegressionEngine:
+    """
+    Rolling least-squares engine built on running (prefix) sums.
+
+    Prefix sums of y, t*y and y^2 are computed once for the series, after which
+    the fit for any window size is O(n) array arithmetic. Several window sizes
+    can be fitted from the same engine without recomputing the sums.
+
+    Values may be 1-D (one series) or 2-D (dates x symbols, dates on axis 0).
+    Each column is centred on its mean before summing to keep the sums well
+    conditioned; slope and R² are unaffected and the offset is added back to
+    the intercept.
+    """
+
+    def __init__(self, values):
+        """
+        Initialize engine and precompute prefix sums.
+
+        Args:
+            values: Array-like of prices (NaN marks missing values)
+        """
+        values = np.asarray(values, dtype=float)
+        self.n = len(values)
+
+        missing = np.isnan(values)
+        filled = np.where(missing, 0.0, values)
+        count = (~missing).sum(axis=0)
+        self.offset = filled.sum(axis=0) / np.maximum(count, 1)
+
+        y = np.where(missing, 0.0, filled - self.offset)
+        t = np.arange(self.n, dtype=float).reshape((-1,) + (1,) * (y.ndim - 1))
+
+        self._missing = self._prefix(missing.astype(float))
+        self._sum_y = self._prefix(y)
+        self._sum_ty = self._prefix(t * y)
+        self._sum_yy = self._prefix(y * y)
+
+    @staticmethod
+    def _prefix(a: np.ndarray) -> np.ndarray:
+        """Cumulative sum along axis 0 with a leading zero row."""
+        out = np.zeros((len(a) + 1,) + a.shape[1:])
+        np.cumsum(a, axis=0, out=out[1:])
+        return out
+
+    def fit(self, window: int) -> RegressionFit:
+        """
+        Fit every trailing window of the given size.
+
+        Args:
+            window: Number of bars per regression window (>= 2)
+
+        Returns:
+            RegressionFit with arrays shaped like the input values
+        """
+        if window < 2:
+            raise ValueError("window must be >= 2")
+
+        shape = self._sum_y.shape
+        shape = (shape[0] - 1,) + shape[1:]
+        slope = np.full(shape, np.nan)
+        intercept = np.full(shape, np.nan)
+        r_squared = np.full(shape, np.nan)
+
+        if self.n < window:
+            return RegressionFit(slope, intercept, r_squared, window)
+
+        # Window ending at bar i covers bars [i - window + 1, i]
+        hi = slice(window, self.n + 1)
+        lo = slice(0, self.n - window + 1)
+        start = np.arange(self.n - window + 1, dtype=float).reshape(
+            (-1,) + (1,) * (len(shape) - 1)
+        )
+
+        sum_y = self._sum_y[hi] - self._sum_y[lo]
+        sum_ty = self._sum_ty[hi] - self._sum_ty[lo]
+        sum_yy = self._sum_yy[hi] - self._sum_yy[lo]
+        has_missing = (self._missing[hi] - self._missing[lo]) > 0
+
+        # Re-base t to x = t - start so every window is regressed on 0..window-1
+        sum_xy = sum_ty - start * sum_y
+
+        win = fit_from_sums(sum_y, sum_xy, sum_yy, window, self.offset)
+
+        tail = slice(window - 1, self.n)
+        slope[tail] = np.where(has_missing, np.nan, win.slope)
+        intercept[tail] = np.where(has_missing, np.nan, win.intercept)
+        r_squared[tail] = np.where(has_missing, np.nan, win.r_squared)
+
+        return RegressionFit(slope, intercept, r_squared, window)
+
+
+def fit_from_sums(sum_y, sum_xy, sum_yy, window: int, offset=0.0) -> RegressionFit:
+    """
+    Least-squares line for windows summarized by their sums.
+
+    Works on scalars (one window, e.g. an incrementally updated indicator)
+    or arrays (many windows at once).
+
+    Args:
+        sum_y: Sum of (y - offset) over the window
+        sum_xy: Sum of x * (y - offset) with x = 0..window-1
+        sum_yy: Sum of (y - offset)^2
+        window: Number of bars in the window
+        offset: Value subtracted from y before summing (added back to intercept)
+
+    Returns:
+        RegressionFit for the window(s)
+    """
+    sum_x = window * (window - 1) / 2.0
+    sxx = window * (window * window - 1) / 12.0
+    sxy = sum_xy - sum_x * sum_y / window
+    syy = sum_yy - sum_y * sum_y / window
+
+    slope = sxy / sxx
+    intercept = (sum_y - slope * sum_x) / window + offset
+
+    # Flat windows (zero variance up to rounding) have no explanatory power
+    flat = syy <= 8 * window * np.finfo(float).eps * sum_yy
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r_squared = np.where(flat, 0.0, (sxy * sxy) / (sxx * syy))
+    r_squared = np.clip(r_squared, 0.0, 1.0)
+
+    return RegressionFit(slope, intercept, r_squared, window)
+
+
+def multi_period_regression(values, periods) -> Dict[int, RegressionFit]:
+    """
+    Fit trailing windows of several sizes from one set of shared sums.
+
+    Each bar's longest window is read from a strided view and centred on the
+    bar's own value. Cumulative sums taken backwards along the window then
+    give the sums of the last p bars for every period p at once, so all
+    periods cost one pass. The sums are formed locally, so R² keeps full
+    precision on long histories where whole-series prefix sums would lose
+    digits to cancellation. Costs O(n * max(periods)); intended for indicator
+    windows on 1-D series.
+
+    Args:
+        values: 1-D array-like of prices (NaN marks missing values)
+        periods: Window sizes to fit (each >= 2)
+
+    Returns:
+        Dictionary mapping period to RegressionFit shaped like the input
+    """
+    periods = sorted(set(int(period) for period in periods))
+    if not periods or periods[0] < 2:
+        raise ValueError("periods must all be >= 2")
+
+    values = np.asarray(values, dtype=float)
+    longest = periods[-1]
+
+    if len(values) == 0:
+        empty = np.empty(0)
+        return {
+            period: RegressionFit(empty, empty, empty, period)
+            for period in periods
+        }
+
+    # Pad so every bar has a full-length window; padding only reaches
+    # periods longer than the bars available, which must be NaN anyway
+    padded = np.concatenate([np.full(longest - 1, np.nan), values])
+    windows = sliding_window_view(padded, longest)
+
+    # k = bars back from the current bar (0 = current)
+    y = windows[:, ::-1] - values[:, np.newaxis]
+    k = np.arange(longest, dtype=float)
+    sum_y = np.cumsum(y, axis=1)
+    sum_ky = np.cumsum(y * k, axis=1)
+    sum_yy = np.cumsum(y * y, axis=1)
+
+    fits = {}
+    for period in periods:
+        i = period - 1
+        # x = period - 1 - k within the window
+        sum_xy = (period - 1) * sum_y[:, i] - sum_ky[:, i]
+        fits[period] = fit_from_sums(sum_y[:, i], sum_xy, sum_yy[:, i], period, values)
+
+    return fits
+
+
+def windowed_linear_regression(values, window: int) -> RegressionFit:
+    """
+    Fit every trailing window of one size with locally formed sums.
+
+    Precise alternative to rolling_linear_regression for short indicator
+    windows (see multi_period_regression).
+
+    Args:
+        values: 1-D array-like of prices (NaN marks missing values)
+        window: Window size for regression (>= 2)
+
+    Returns:
+        RegressionFit with arrays shaped like the input values
+    """
+    return multi_period_regression(values, [window])[window]
+
+
+def rolling_linear_regression(values, window: int) -> RegressionFit:
+    """
+    Convenience function to fit every trailing window of a series.
+
+    Args:
+        values: Array-like of prices, 1-D or 2-D (dates on axis 0)
+        window: Window size for regression
+
+    Returns:
+        RegressionFit with slope, intercept and R² per bar
+    """
+    return RollingRegressionEngine(values).fit(window)
@@ -11,11 +11,9 @@ Multi-regime strategy that:
 Designed to work in 2023-2025 markets (rapid regime changes).
 """
 import backtrader as bt
-from .linear_regression_indicators import (
-    LinearRegressionSlope,
-    LinearRegressionR2,
-    MultiTimeframeSlope
-)
+from .linear_regression_indicators import MultiTimeframeSlope
+from .regime_store import TREND_REGIMES
+from .true_range import WilderATR
 
 
 class AdaptiveLinRegStrategy(bt.Strategy):
@@ -56,10 +54,13 @@ class AdaptiveLinRegStrategy(bt.Strategy):
         # Logging
         ('log_trades', False),
         ('log_regime', False),
+
+        # Optional RegimeStore serving precomputed R² regime labels
+        ('regime_store', None),
     )
 
     def __init__(self):
-        # Multi-timeframe slopes
+        # Multi-timeframe slopes and R² from one shared regression pass
         self.mtf_slope = MultiTimeframeSlope(
             self.data,
             period_short=self.params.lr_short,
@@ -67,14 +68,21 @@ class AdaptiveLinRegStrategy(bt.Strategy):
             period_long=self.params.lr_long
         )
 
-        # R² for regime detection
-        self.r_squared = LinearRegressionR2(
-            self.data,
-            period=self.params.lr_medium
-        )
+        # R² for regime detection (medium period)
+        self.r_squared = self.mtf_slope.r_squared_medium
+
+        # Precomputed regime labels, shared across threshold sweeps
+        self.regime = None
+        if self.params.regime_store is not None:
+            self.regime = self.params.regime_store.trend(
+                self.data,
+                period=self.params.lr_medium,
+                strong=self.params.r2_strong_trend,
+                weak=self.params.r2_weak_trend
+            )
 
         # ATR for stops
-        self.atr = bt.indicators.ATR(self.data, period=14)
+        self.atr = WilderATR(self.data, period=14)
 
         # Track state
         self.order = None
@@ -88,6 +96,9 @@ class AdaptiveLinRegStrategy(bt.Strategy):
 
         Returns: 'strong_trend', 'weak_trend', or 'choppy'
         """
+        if self.regime is not None:
+            return TREND_REGIMES[int(self.regime[0])]
+
         r2 = self.r_squared[0]
 
         if r2 >= self.params.r2_strong_trend:
@@ -5,7 +5,8 @@ Main Backtrader strategy implementing mean reversion logic
 
 import backtrader as bt
 from agents.agent_2_strategy_core.mean_calculators import get_mean_indicator
-from agents.agent_2_strategy_core.stddev_bands import StdDevBands
+from agents.agent_2_strategy_core.stddev_bands import PrecomputedBands, StdDevBands
+from agents.agent_2_strategy_core.true_range import WilderATR
 
 
 class MeanReversionStrategy(bt.Strategy):
@@ -28,6 +29,7 @@ class MeanReversionStrategy(bt.Strategy):
         ('mean_lookback', 20),
         ('stddev_lookback', 20),
         ('entry_threshold', 2.0),       # StdDev for entry
+        ('band_tensor', None),          # Precomputed BandTensor covering the above
 
         # Exit configuration
         ('exit_type', 'mean'),          # 'mean', 'opposite_band', 'profit_target', 'time_based'
@@ -57,22 +59,32 @@ class MeanReversionStrategy(bt.Strategy):
     def __init__(self):
         """Initialize strategy indicators and state"""
 
-        # Mean indicator
-        mean_indicator_class = get_mean_indicator(
-            self.params.mean_type,
-            self.params.mean_lookback
-        )
-        self.mean = mean_indicator_class(
-            self.data,
-            period=self.params.mean_lookback
-        )
-
-        # Standard deviation bands
-        self.bands = StdDevBands(
-            mean=self.mean,
-            stddev_period=self.params.stddev_lookback,
-            threshold=self.params.entry_threshold
-        )
+        if self.params.band_tensor is not None:
+            # Standard deviation bands sliced from a precomputed grid
+            self.params.band_tensor.check_mean_type(self.params.mean_type)
+            self.bands = PrecomputedBands(
+                tensor=self.params.band_tensor,
+                mean_lookback=self.params.mean_lookback,
+                stddev_lookback=self.params.stddev_lookback,
+                threshold=self.params.entry_threshold
+            )
+        else:
+            # Mean indicator
+            mean_indicator_class = get_mean_indicator(
+                self.params.mean_type,
+                self.params.mean_lookback
+            )
+            self.mean = mean_indicator_class(
+                self.data,
+                period=self.params.mean_lookback
+            )
+
+            # Standard deviation bands
+            self.bands = StdDevBands(
+                mean=self.mean,
+                stddev_period=self.params.stddev_lookback,
+                threshold=self.params.entry_threshold
+            )
 
         # Additional indicators for filters (if enabled)
         if self.params.use_rsi_filter:
@@ -85,7 +97,7 @@ class MeanReversionStrategy(bt.Strategy):
             )
 
         if self.params.use_volatility_filter:
-            self.atr = bt.indicators.ATR(self.data, period=14)
+            self.atr = WilderATR(self.data, period=14)
 
         if self.params.use_volume_filter:
             self.volume_ma = bt.indicators.SimpleMovingAverage(
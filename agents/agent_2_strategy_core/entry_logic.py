@@ -3,6 +3,8 @@ Entry Logic for Mean Reversion Strategy
 Different methods to trigger entry signals
 """
 
+import numpy as np
+
 
 class EntryLogic:
     """Entry logic variations for mean reversion"""
@@ -59,6 +61,33 @@ class EntryLogic:
 
         return True
 
+    @staticmethod
+    def consecutive_below_count(closes, lower_bands):
+        """
+        Count consecutive periods below band ending at every bar.
+
+        A bar counts as below unless close >= lower band, as in
+        consecutive_below.
+
+        Args:
+            closes: Array of close prices
+            lower_bands: Array of lower band values
+
+        Returns:
+            Integer array; consecutive_below(closes[:i+1], lower_bands[:i+1], n)
+            is True exactly where the count at bar i is >= n
+        """
+        closes = np.asarray(closes, dtype=float)
+        lower_bands = np.asarray(lower_bands, dtype=float)
+
+        index = np.arange(len(closes))
+        # Position of the most recent bar that was not below the band
+        last_reset = np.maximum.accumulate(
+            np.where(closes >= lower_bands, index, -1)
+        ) if len(closes) else index
+
+        return index - last_reset
+
     @staticmethod
     def percent_below_band(close, lower_band, min_percent=1.0):
         """
@@ -145,3 +174,38 @@ class EntryManager:
 
         else:
             raise ValueError(f"Unknown entry type: {self.entry_type}")
+
+    def entry_mask(self, closes, lower_bands):
+        """
+        Evaluate the entry condition for every bar of a series at once.
+
+        Args:
+            closes: Array of close prices
+            lower_bands: Array of lower band values
+
+        Returns:
+            Boolean array; element i equals check_entry at bar i (with the
+            full history up to i for consecutive checks)
+        """
+        closes = np.asarray(closes, dtype=float)
+        lower_bands = np.asarray(lower_bands, dtype=float)
+
+        if self.entry_type == 'close_below':
+            return closes < lower_bands
+
+        elif self.entry_type == 'touch':
+            tolerance = self.params.get('tolerance', 0.001)
+            return closes <= lower_bands * (1 + tolerance)
+
+        elif self.entry_type in ('consecutive_2', 'consecutive_3'):
+            n_periods = int(self.entry_type[-1])
+            return EntryLogic.consecutive_below_count(closes, lower_bands) >= n_periods
+
+        elif self.entry_type == 'percent_below':
+            min_percent = self.params.get('min_percent', 1.0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                percent_below = ((lower_bands - closes) / lower_bands) * 100
+            return (lower_bands != 0) & (percent_below >= min_percent)
+
+        else:
+            raise ValueError(f"Unknown entry type: {self.entry_type}")
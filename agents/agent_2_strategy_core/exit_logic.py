@@ -3,6 +3,8 @@ Exit Logic for Mean Reversion Strategy
 Different methods to trigger exit signals
 """
 
+import numpy as np
+
 
 class ExitLogic:
     """Exit logic variations for mean reversion"""
@@ -125,3 +127,59 @@ class ExitManager:
 
         else:
             raise ValueError(f"Unknown exit type: {self.exit_type}")
+
+    def exit_mask(self, closes, means, upper_bands, entry_index=None, entry_prices=None):
+        """
+        Evaluate the exit condition for every bar of a series at once.
+
+        Args:
+            closes: Array of close prices
+            means: Array of mean values
+            upper_bands: Array of upper band values
+            entry_index: Integer array giving, per bar, the bar index at which
+                the open trade was entered (-1 = no open trade). Required for
+                profit_target and time_based; bars without an open trade are
+                False.
+            entry_prices: Array of entry prices per bar (default: close at
+                entry_index)
+
+        Returns:
+            Boolean array; element i equals check_exit at bar i with
+            bars_in_trade = i - entry_index[i]
+        """
+        closes = np.asarray(closes, dtype=float)
+
+        if self.exit_type == 'mean':
+            mask = closes >= np.asarray(means, dtype=float)
+
+        elif self.exit_type == 'opposite_band':
+            mask = closes >= np.asarray(upper_bands, dtype=float)
+
+        elif self.exit_type == 'profit_target':
+            if entry_index is None:
+                raise ValueError("entry_index required for profit_target exit")
+            entry_index = np.asarray(entry_index)
+            if entry_prices is None:
+                entry_prices = closes[np.maximum(entry_index, 0)]
+            entry_prices = np.asarray(entry_prices, dtype=float)
+
+            target_pct = self.params.get('target_percent', 5.0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                profit_pct = ((closes - entry_prices) / entry_prices) * 100
+            mask = (entry_prices != 0) & (profit_pct >= target_pct)
+
+        elif self.exit_type == 'time_based':
+            if entry_index is None:
+                raise ValueError("entry_index required for time_based exit")
+            entry_index = np.asarray(entry_index)
+
+            max_bars = self.params.get('max_bars', 20)
+            mask = (np.arange(len(closes)) - entry_index) >= max_bars
+
+        else:
+            raise ValueError(f"Unknown exit type: {self.exit_type}")
+
+        if entry_index is not None:
+            mask &= np.asarray(entry_index) >= 0
+
+        return mask
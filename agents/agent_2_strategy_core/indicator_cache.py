@@ -0,0 +1,285 @@
+"""
+Indicator Cache
+Process-wide reuse of indicator outputs keyed by data fingerprint, indicator class and params
+"""
+
+import array
+import hashlib
+import backtrader as bt
+from backtrader.metabase import findowner
+import numpy as np
+from typing import Any, Dict, Hashable, Optional
+import logging
+
+from agents.agent_5_infrastructure.memory_cache import MemoryBoundedLRU
+
+logger = logging.getLogger(__name__)
+
+
+class CachedIndicator(bt.Indicator):
+    """
+    Base for indicators that replay cached output of another indicator.
+
+    Subclasses (built by _wrapper_class) declare the same lines as the
+    wrapped indicator. On a cache miss the real indicator is created as a
+    child and its lines are copied through and stored once complete; on a
+    hit the stored arrays are replayed and nothing is recomputed.
+    """
+
+    params = (
+        ('indicator', None),
+        ('indicator_params', None),
+        ('cache_key', None),
+        ('cache', None),
+    )
+
+    def __init__(self):
+        self.cached = self.p.cache.lru.get(self.p.cache_key)
+
+        if self.cached is None:
+            self.source = self.p.indicator(self.data, **self.p.indicator_params)
+            self.source.plotinfo.plot = False
+        else:
+            # Same warm-up as the indicator that produced the arrays
+            minperiod, _ = self.cached
+            self.addminperiod(minperiod - self._minperiod + 1)
+
+    def next(self):
+        if self.cached is None:
+            for line, source in zip(self.lines, self.source.lines):
+                line[0] = source[0]
+
+            if len(self) == self.data.buflen():
+                self._store()
+        else:
+            i = len(self) - 1
+            for line, values in zip(self.lines, self.cached[1]):
+                line[0] = values[i]
+
+    def once(self, start, end):
+        if self.cached is None:
+            columns = [source.array for source in self.source.lines]
+        else:
+            columns = self.cached[1]
+
+        for line, values in zip(self.lines, columns):
+            line.array[start:end] = array.array('d', values[start:end])
+
+        if self.cached is None and end == self.buflen():
+            self._store()
+
+    def _store(self):
+        """Put the completed child indicator output in the cache."""
+        arrays = tuple(
+            np.array(source.array, dtype=float) for source in self.source.lines
+        )
+        self.p.cache.lru.put(self.p.cache_key, (self.source._minperiod, arrays))
+
+
+class IndicatorCache:
+    """
+    Memory-bounded cache of indicator outputs shared across Cerebro runs.
+
+    Entries are keyed by (data fingerprint, indicator class, params), so
+    re-running a grid over the same symbol computes each distinct indicator
+    once instead of once per parameter combination. Within one strategy,
+    identical requests return the same indicator instance.
+
+    Caching needs preloaded data (the Cerebro default). For other inputs
+    (live feeds, indicators as data) the indicator is created normally.
+    Cached indicators expose the wrapped indicator's lines only, not its
+    other attributes.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 256 * 1024 * 1024,
+        lru: Optional[MemoryBoundedLRU] = None
+    ):
+        """
+        Initialize indicator cache.
+
+        Args:
+            max_bytes: Memory budget for cached outputs (default: 256 MB)
+            lru: Existing LRU to share (overrides max_bytes)
+        """
+        self.lru = lru or MemoryBoundedLRU(max_bytes)
+
+    def indicator(self, data, indicator_cls, **params):
+        """
+        Get an indicator whose output is reused when already computed.
+
+        Call from a strategy (or indicator) __init__ in place of
+        indicator_cls(data, **params).
+
+        Args:
+            data: Data feed the indicator runs on
+            indicator_cls: Backtrader indicator class
+            **params: Indicator parameters
+
+        Returns:
+            Indicator with the same lines as indicator_cls
+        """
+        fingerprint = data_fingerprint(data)
+        if fingerprint is None:
+            return indicator_cls(data, **params)
+
+        key = self.key(fingerprint, indicator_cls, params)
+
+        # Identical requests from one owner share a single instance
+        owner = findowner(None, bt.LineIterator, startlevel=1)
+        shared = {}
+        if owner is not None:
+            shared = owner.__dict__.setdefault('_cached_indicators', {})
+        if key not in shared:
+            shared[key] = _wrapper_class(indicator_cls)(
+                data,
+                indicator=indicator_cls,
+                indicator_params=params,
+                cache_key=key,
+                cache=self
+            )
+
+        return shared[key]
+
+    def array(self, data, name: Hashable, compute):
+        """
+        Get an array derived from a data feed, computing it at most once.
+
+        Lets indicators share intermediate series (e.g. true range for ATRs
+        of several periods) across instances and Cerebro runs.
+
+        Args:
+            data: Data feed the array is derived from
+            name: Hashable name identifying the derived series (and its params)
+            compute: Callable with no arguments returning the array
+
+        Returns:
+            The cached or freshly computed array
+        """
+        fingerprint = data_fingerprint(data)
+        if fingerprint is None:
+            return compute()
+
+        key = (fingerprint, name)
+        values = self.lru.get(key)
+        if values is None:
+            values = compute()
+            self.lru.put(key, values)
+        return values
+
+    @staticmethod
+    def key(fingerprint: str, indicator_cls, params: Dict[str, Any]) -> Hashable:
+        """
+        Build the cache key for an indicator request.
+
+        Args:
+            fingerprint: Data fingerprint (see data_fingerprint)
+            indicator_cls: Backtrader indicator class
+            params: Indicator parameters (defaults are filled in)
+
+        Returns:
+            Hashable cache key
+        """
+        defaults = indicator_cls.params._getpairs()
+        unknown = set(params) - set(defaults)
+        if unknown:
+            raise ValueError(
+                f"Unknown parameters for {indicator_cls.__name__}: {sorted(unknown)}"
+            )
+
+        resolved = dict(defaults, **params)
+        return (
+            fingerprint,
+            f"{indicator_cls.__module__}.{indicator_cls.__qualname__}",
+            tuple(sorted(resolved.items()))
+        )
+
+    def clear(self):
+        """Drop all cached outputs."""
+        self.lru.invalidate()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with entries, nbytes, max_bytes, hits and misses
+        """
+        return self.lru.stats()
+
+
+def data_fingerprint(data) -> Optional[str]:
+    """
+    Hash the full contents of a preloaded data feed.
+
+    Args:
+        data: Backtrader data feed
+
+    Returns:
+        Hex digest over every line of the feed, or None if the data is not a
+        preloaded feed (its values are not known yet)
+    """
+    if not isinstance(data, bt.AbstractDataBase) or data.buflen() == 0:
+        return None
+
+    fingerprint = getattr(data, '_indicator_fingerprint', None)
+    if fingerprint is None:
+        digest = hashlib.blake2b(digest_size=16)
+        for line in data.lines:
+            digest.update(line.array.tobytes())
+        fingerprint = digest.hexdigest()
+        data._indicator_fingerprint = fingerprint
+
+    return fingerprint
+
+
+_wrappers: Dict[type, type] = {}
+
+
+def _wrapper_class(indicator_cls) -> type:
+    """Get the CachedIndicator subclass declaring indicator_cls's lines."""
+    wrapper = _wrappers.get(indicator_cls)
+    if wrapper is None:
+        wrapper = type(
+            f'Cached{indicator_cls.__name__}',
+            (CachedIndicator,),
+            {
+                'lines': indicator_cls.lines._getlines(),
+                'plotinfo': dict(subplot=indicator_cls.plotinfo.subplot)
+            }
+        )
+        _wrappers[indicator_cls] = wrapper
+    return wrapper
+
+
+_default_cache: Optional[IndicatorCache] = None
+
+
+def get_indicator_cache() -> IndicatorCache:
+    """
+    Get the process-wide indicator cache (created on first use).
+
+    Returns:
+        Shared IndicatorCache instance
+    """
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = IndicatorCache()
+    return _default_cache
+
+
+def cached_indicator(data, indicator_cls, cache: Optional[IndicatorCache] = None, **params):
+    """
+    Convenience function to create an indicator through the shared cache.
+
+    Args:
+        data: Data feed the indicator runs on
+        indicator_cls: Backtrader indicator class
+        cache: Cache to use (default: process-wide cache)
+        **params: Indicator parameters
+
+    Returns:
+        Indicator with the same lines as indicator_cls
+    """
+    return (cache or get_indicator_cache()).indicator(data, indicator_cls, **params)
@@ -3,85 +3,124 @@ Linear Regression Indicators for Adaptive Trading
 
 Provides slope, R-squared, and intercept for trend analysis and regime detection.
 """
+import array
+
 import backtrader as bt
 import numpy as np
 
+from agents.agent_1_data_candles.rolling_regression import (
+    RegressionFit,
+    fit_from_sums,
+    multi_period_regression,
+    windowed_linear_regression
+)
+
 
-class LinearRegressionSlope(bt.Indicator):
+class _RollingRegressionIndicator(bt.Indicator):
     """
-    Calculate the slope of linear regression line.
+    Base for indicators derived from a least-squares fit of the last
+    `period` closes against x = 0, 1, ..., period-1 (same fit as np.polyfit).
 
-    Positive slope = uptrend
-    Negative slope = downtrend
-    Magnitude = trend strength
+    Event mode (next) keeps running sums of the window so each bar costs O(1);
+    the sums are centred on the window mean and rebuilt every `period` bars to
+    stop rounding drift. Vectorized mode (once) fits the whole series in one
+    call over a strided view of all windows.
+
+    Subclasses implement _value(fit) to turn a RegressionFit into the line value.
     """
-    lines = ('slope',)
     params = (('period', 20),)
 
     def __init__(self):
         self.addminperiod(self.params.period)
+        self._sums = None
+        self._bars_since_sync = 0
+
+    def _value(self, fit: RegressionFit):
+        raise NotImplementedError
 
     def next(self):
-        # Get last N prices
-        prices = np.array([self.data.close[-i] for i in range(self.params.period - 1, -1, -1)])
+        self.lines[0][0] = float(self._value(self._running_fit()))
 
-        # X values (time: 0, 1, 2, ..., period-1)
-        x = np.arange(self.params.period)
+    def once(self, start, end):
+        closes = np.asarray(self.data.close.array[:end], dtype=float)
+        values = self._value(windowed_linear_regression(closes, self.params.period))
 
-        # Linear regression: y = mx + b
-        # Slope (m) = covariance(x,y) / variance(x)
-        slope = np.polyfit(x, prices, 1)[0]
+        self.lines[0].array[start:end] = array.array('d', values[start:end])
 
-        self.lines.slope[0] = slope
+    def _running_fit(self) -> RegressionFit:
+        """Fit the current window by sliding the running sums one bar."""
+        period = self.params.period
 
+        if self._sums is None or self._bars_since_sync >= period:
+            return self._sync()
 
-class LinearRegressionR2(bt.Indicator):
-    """
-    Calculate R-squared (coefficient of determination) of linear regression.
+        offset, sum_y, sum_xy, sum_yy = self._sums
+        y_old = self.data.close[-period] - offset
+        y_new = self.data.close[0] - offset
 
-    R² near 1.0 = strong linear trend (trending market)
-    R² near 0.0 = poor fit (choppy/ranging market)
+        # Drop the oldest bar (x=0), shift the rest down one, add the new bar at x=period-1
+        sum_xy += (period - 1) * y_new - (sum_y - y_old)
+        sum_y += y_new - y_old
+        sum_yy += y_new * y_new - y_old * y_old
 
-    Use for regime detection.
-    """
-    lines = ('r_squared',)
-    params = (('period', 20),)
+        if not np.isfinite(sum_yy):
+            return self._sync()
 
-    def __init__(self):
-        self.addminperiod(self.params.period)
+        self._sums = (offset, sum_y, sum_xy, sum_yy)
+        self._bars_since_sync += 1
 
-    def next(self):
-        # Get last N prices
-        prices = np.array([self.data.close[-i] for i in range(self.params.period - 1, -1, -1)])
+        return fit_from_sums(sum_y, sum_xy, sum_yy, period, offset)
 
-        # X values
-        x = np.arange(self.params.period)
+    def _sync(self) -> RegressionFit:
+        """Rebuild the window sums from scratch."""
+        period = self.params.period
+        prices = np.array(self.data.close.get(size=period), dtype=float)
 
-        # Fit linear regression
-        coeffs = np.polyfit(x, prices, 1)
-        slope, intercept = coeffs[0], coeffs[1]
+        offset = prices.mean()
+        y = prices - offset
+        x = np.arange(period)
 
-        # Predicted values
-        y_pred = slope * x + intercept
+        self._sums = (offset, y.sum(), (x * y).sum(), (y * y).sum())
+        self._bars_since_sync = 0
 
-        # R² = 1 - (SS_res / SS_tot)
-        # SS_res = sum of squared residuals
-        # SS_tot = total sum of squares
-        ss_res = np.sum((prices - y_pred) ** 2)
-        ss_tot = np.sum((prices - np.mean(prices)) ** 2)
+        return fit_from_sums(*self._sums[1:], period, offset)
 
-        if ss_tot == 0:
-            r_squared = 0.0
-        else:
-            r_squared = 1 - (ss_res / ss_tot)
 
-        # Clamp to [0, 1]
-        r_squared = max(0.0, min(1.0, r_squared))
+class LinearRegressionSlope(_RollingRegressionIndicator):
+    """
+    Calculate the slope of linear regression line.
+
+    Positive slope = uptrend
+    Negative slope = downtrend
+    Magnitude = trend strength
+    """
+    lines = ('slope',)
+    params = (('period', 20),)
+
+    def _value(self, fit):
+        # Slope (m) = covariance(x,y) / variance(x)
+        return fit.slope
 
-        self.lines.r_squared[0] = r_squared
 
+class LinearRegressionR2(_RollingRegressionIndicator):
+    """
+    Calculate R-squared (coefficient of determination) of linear regression.
+
+    R² near 1.0 = strong linear trend (trending market)
+    R² near 0.0 = poor fit (choppy/ranging market)
 
-class LinearRegressionIntercept(bt.Indicator):
+    Use for regime detection.
+    """
+    lines = ('r_squared',)
+    params = (('period', 20),)
+
+    def _value(self, fit):
+        # R² = Sxy² / (Sxx * Syy) = 1 - SS_res / SS_tot, clamped to [0, 1]
+        # (0 for flat windows)
+        return fit.r_squared
+
+
+class LinearRegressionIntercept(_RollingRegressionIndicator):
     """
     Calculate the intercept of linear regression line.
 
@@ -92,23 +131,12 @@ class LinearRegressionIntercept(bt.Indicator):
     lines = ('intercept',)
     params = (('period', 20),)
 
-    def __init__(self):
-        self.addminperiod(self.params.period)
-
-    def next(self):
-        # Get last N prices
-        prices = np.array([self.data.close[-i] for i in range(self.params.period - 1, -1, -1)])
-
-        # X values
-        x = np.arange(self.params.period)
-
-        # Linear regression: y = mx + b
-        intercept = np.polyfit(x, prices, 1)[1]
-
-        self.lines.intercept[0] = intercept
+    def _value(self, fit):
+        # Linear regression: y = mx + b (b at the first bar of the window)
+        return fit.intercept
 
 
-class LinearRegressionForecast(bt.Indicator):
+class LinearRegressionForecast(_RollingRegressionIndicator):
     """
     Project the linear regression line forward to predict next value.
 
@@ -121,51 +149,97 @@ class LinearRegressionForecast(bt.Indicator):
     lines = ('forecast',)
     params = (('period', 20),)
 
-    def __init__(self):
-        self.addminperiod(self.params.period)
-
-    def next(self):
-        # Get last N prices
-        prices = np.array([self.data.close[-i] for i in range(self.params.period - 1, -1, -1)])
-
-        # X values
-        x = np.arange(self.params.period)
-
-        # Fit
-        coeffs = np.polyfit(x, prices, 1)
-        slope, intercept = coeffs[0], coeffs[1]
-
+    def _value(self, fit):
         # Forecast next value (x = period)
-        forecast = slope * self.params.period + intercept
-
-        self.lines.forecast[0] = forecast
+        return fit.project(self.params.period)
 
 
-class MultiTimeframeSlope(bt.Indicator):
+class RegressionBank(bt.Indicator):
     """
-    Calculate slopes at multiple timeframes simultaneously.
+    Slope, intercept, R² and forecast at three periods from one shared pass.
 
-    Provides short, medium, and long-term slope in one indicator.
-    Useful for detecting alignment and acceleration.
+    All fits come from the same cumulative window sums over the close series
+    (see multi_period_regression), so adding periods or statistics costs no
+    extra pass over the data. Event mode (next) forms those sums for the
+    current window only, O(long period) per bar. Lines are suffixed by period slot
+    (_short/_medium/_long); acceleration = slope_short - slope_medium.
+
+    Values match LinearRegressionSlope/R2/Intercept/Forecast at the same
+    periods. Every line starts at the long period (the indicator's minperiod).
     """
-    lines = ('slope_short', 'slope_medium', 'slope_long', 'acceleration')
+    lines = (
+        'slope_short', 'slope_medium', 'slope_long',
+        'intercept_short', 'intercept_medium', 'intercept_long',
+        'r_squared_short', 'r_squared_medium', 'r_squared_long',
+        'forecast_short', 'forecast_medium', 'forecast_long',
+        'acceleration',
+    )
     params = (
         ('period_short', 10),
         ('period_medium', 20),
         ('period_long', 50),
     )
 
+    SLOTS = ('short', 'medium', 'long')
+
     def __init__(self):
-        self.slope_short_ind = LinearRegressionSlope(self.data, period=self.params.period_short)
-        self.slope_medium_ind = LinearRegressionSlope(self.data, period=self.params.period_medium)
-        self.slope_long_ind = LinearRegressionSlope(self.data, period=self.params.period_long)
+        self.addminperiod(max(self._periods()))
 
-        self.addminperiod(self.params.period_long)
+    def _periods(self):
+        return [getattr(self.params, f'period_{slot}') for slot in self.SLOTS]
 
-    def next(self):
-        self.lines.slope_short[0] = self.slope_short_ind[0]
-        self.lines.slope_medium[0] = self.slope_medium_ind[0]
-        self.lines.slope_long[0] = self.slope_long_ind[0]
+    def _outputs(self, fits):
+        """Compute every line's values from the fits of each period."""
+        outputs = {}
+        for slot, period in zip(self.SLOTS, self._periods()):
+            fit = fits[period]
+            outputs[f'slope_{slot}'] = fit.slope
+            outputs[f'intercept_{slot}'] = fit.intercept
+            outputs[f'r_squared_{slot}'] = fit.r_squared
+            outputs[f'forecast_{slot}'] = fit.project(period)
 
         # Acceleration = short-term slope exceeding medium-term slope
-        self.lines.acceleration[0] = self.slope_short_ind[0] - self.slope_medium_ind[0]
+        outputs['acceleration'] = outputs['slope_short'] - outputs['slope_medium']
+
+        return outputs
+
+    def next(self):
+        for name, value in self._outputs(self._current_fits()).items():
+            getattr(self.lines, name)[0] = float(value)
+
+    def once(self, start, end):
+        closes = np.asarray(self.data.close.array[:end], dtype=float)
+        fits = multi_period_regression(closes, self._periods())
+
+        for name, values in self._outputs(fits).items():
+            getattr(self.lines, name).array[start:end] = array.array('d', values[start:end])
+
+    def _current_fits(self):
+        """Fit the current bar's windows (multi_period_regression's sums for one bar)."""
+        periods = self._periods()
+        closes = np.array(self.data.close.get(size=max(periods)), dtype=float)
+
+        # k = bars back from the current bar, centred on its close
+        y = closes[::-1] - closes[-1]
+        k = np.arange(len(closes), dtype=float)
+        sum_y = np.cumsum(y)
+        sum_ky = np.cumsum(y * k)
+        sum_yy = np.cumsum(y * y)
+
+        fits = {}
+        for period in periods:
+            i = period - 1
+            sum_xy = (period - 1) * sum_y[i] - sum_ky[i]
+            fits[period] = fit_from_sums(sum_y[i], sum_xy, sum_yy[i], period, closes[-1])
+
+        return fits
+
+
+class MultiTimeframeSlope(RegressionBank):
+    """
+    Calculate slopes at multiple timeframes simultaneously.
+
+    Provides short, medium, and long-term slope in one indicator.
+    Useful for detecting alignment and acceleration. Also carries the
+    intercept, R² and forecast lines of RegressionBank.
+    """
@@ -0,0 +1,97 @@
+"""
+Rolling Percentile Rank
+Where the current value ranks within its trailing window (e.g. volatility regimes)
+"""
+
+import array
+import backtrader as bt
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Windows ranked per block in rolling_percentile_rank (bounds temporary memory)
+_BLOCK_ROWS = 4096
+
+
+class PercentileRank(bt.Indicator):
+    """
+    Rolling Percentile Rank
+
+    Fraction of the values in the trailing window (current bar included)
+    that are strictly below the current value, from 0.0 to 1.0. Windows are
+    partial until `period` bars exist. NaN values are ignored; with
+    positive_only, values <= 0 are ignored too (e.g. volatility of bars
+    without a valid ATR). Bars whose window has no valid values are NaN.
+
+    Lines:
+        - rank: Percentile rank of the current value
+
+    Parameters:
+        period: Trailing window size (default: 126, ~6 months of daily bars)
+        positive_only: Only rank values > 0 (default: False)
+    """
+    lines = ('rank',)
+
+    params = (
+        ('period', 126),
+        ('positive_only', False),
+    )
+
+    def __init__(self):
+        if self.params.period < 1:
+            raise ValueError("period must be >= 1")
+
+    def next(self):
+        size = min(self.params.period, len(self))
+        window = np.array(self.data.get(size=size), dtype=float)
+
+        ranks = rolling_percentile_rank(window, size, self.params.positive_only)
+        self.lines.rank[0] = float(ranks[-1])
+
+    def once(self, start, end):
+        ranks = rolling_percentile_rank(
+            self.data.array[:end],
+            self.params.period,
+            self.params.positive_only
+        )
+        self.lines.rank.array[start:end] = array.array('d', ranks[start:end])
+
+
+def rolling_percentile_rank(values, period: int, positive_only: bool = False) -> np.ndarray:
+    """
+    Rank every value against its trailing window in one vectorized pass.
+
+    Args:
+        values: 1-D array-like of values
+        period: Trailing window size, current value included (>= 1)
+        positive_only: Only rank values > 0
+
+    Returns:
+        Array of ranks (count of valid window values strictly below the
+        current value / count of valid window values), NaN where the window
+        has no valid values
+    """
+    if period < 1:
+        raise ValueError("period must be >= 1")
+
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    ranks = np.full(n, np.nan)
+    if n == 0:
+        return ranks
+
+    # Pad so early bars rank against the partial window available
+    padded = np.concatenate([np.full(period - 1, np.nan), values])
+    windows = sliding_window_view(padded, period)
+
+    for lo in range(0, n, _BLOCK_ROWS):
+        hi = min(lo + _BLOCK_ROWS, n)
+        block = windows[lo:hi]
+
+        valid = block > 0 if positive_only else ~np.isnan(block)
+        below = (block < values[lo:hi, np.newaxis]) & valid
+        count = valid.sum(axis=1)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ranks[lo:hi] = np.where(count > 0, below.sum(axis=1) / count, np.nan)
+
+    return ranks
@@ -0,0 +1,262 @@
+"""
+Regime Label Store
+Per-bar regime labels computed once per symbol and threshold set, served to strategies as a line
+"""
+
+import array
+import backtrader as bt
+import numpy as np
+from typing import Optional
+
+from agents.agent_1_data_candles.rolling_regression import windowed_linear_regression
+from agents.agent_2_strategy_core.indicator_cache import (
+    IndicatorCache,
+    data_fingerprint,
+    get_indicator_cache
+)
+from agents.agent_2_strategy_core.percentile_rank import rolling_percentile_rank
+from agents.agent_2_strategy_core.true_range import (
+    average_directional_index,
+    true_range,
+    wilder_atr
+)
+
+# Regime names indexed by int8 label code
+TREND_REGIMES = ('choppy', 'weak_trend', 'strong_trend')
+VOLATILITY_REGIMES = ('low', 'medium', 'high')
+TREND_STRENGTH_REGIMES = ('weak', 'moderate', 'strong')
+
+
+class RegimeLine(bt.Indicator):
+    """
+    Replays precomputed regime labels as a line.
+
+    Lines:
+        - regime: Label code of the bar (index into the family's names)
+
+    Parameters:
+        labels: int8 label array covering every bar of the data feed
+        warmup: Bars the source series needs (minperiod of the line)
+    """
+    lines = ('regime',)
+
+    params = (
+        ('labels', None),
+        ('warmup', 1),
+    )
+
+    plotinfo = dict(subplot=True)
+
+    def __init__(self):
+        if self.params.labels is None:
+            raise ValueError("labels is required")
+
+        self.addminperiod(self.params.warmup)
+
+    def next(self):
+        self.lines.regime[0] = float(self.params.labels[len(self) - 1])
+
+    def once(self, start, end):
+        self.lines.regime.array[start:end] = array.array(
+            'd', self.params.labels[start:end].astype(float)
+        )
+
+
+class RegimeStore:
+    """
+    Memory-bounded store of regime labels shared across Cerebro runs.
+
+    Source series (R², volatility percentile, ADX) are computed once per
+    symbol and source parameters; labels are computed once per threshold
+    set and kept as int8 arrays. Both live in the indicator cache, keyed by
+    the data fingerprint, so sweeping thresholds or unrelated strategy
+    parameters reuses them. Needs preloaded data (the Cerebro default); an
+    empty preloaded feed gets empty labels.
+    """
+
+    def __init__(self, cache: Optional[IndicatorCache] = None):
+        """
+        Initialize regime store.
+
+        Args:
+            cache: Indicator cache holding the arrays (default: process-wide cache)
+        """
+        self.cache = cache or get_indicator_cache()
+
+    def trend(self, data, period: int = 20, strong: float = 0.7, weak: float = 0.4) -> RegimeLine:
+        """
+        R² trend regime (see TREND_REGIMES), as AdaptiveLinRegStrategy.get_regime.
+
+        Args:
+            data: Preloaded data feed
+            period: Regression window for R²
+            strong: R² at or above which the trend is strong
+            weak: R² at or above which the trend is weak (below = choppy)
+
+        Returns:
+            RegimeLine of label codes
+        """
+        def source():
+            closes = np.asarray(data.close.array, dtype=float)
+            return windowed_linear_regression(closes, period).r_squared
+
+        labels = self._labels(
+            data, ('trend', period, strong, weak),
+            ('r_squared', period), source,
+            lambda r_squared: classify_trend(r_squared, strong, weak)
+        )
+        return RegimeLine(data, labels=labels, warmup=period)
+
+    def volatility(
+        self,
+        data,
+        atr_period: int = 20,
+        lookback: int = 126,
+        high: float = 0.80,
+        low: float = 0.20
+    ) -> RegimeLine:
+        """
+        Volatility percentile regime (see VOLATILITY_REGIMES).
+
+        Ranks ATR as a fraction of close against its trailing window; bars
+        without a valid rank count as medium.
+
+        Args:
+            data: Preloaded data feed
+            atr_period: ATR period
+            lookback: Trailing window for the percentile rank
+            high: Percentile above which volatility is high
+            low: Percentile below which volatility is low
+
+        Returns:
+            RegimeLine of label codes
+        """
+        def source():
+            tr = true_range(data.high.array, data.low.array, data.close.array)
+            normalized = wilder_atr(tr, atr_period) / np.asarray(data.close.array, dtype=float)
+            return rolling_percentile_rank(normalized, lookback, positive_only=True)
+
+        labels = self._labels(
+            data, ('volatility', atr_period, lookback, high, low),
+            ('volatility_percentile', atr_period, lookback), source,
+            lambda percentile: classify_volatility(percentile, high, low)
+        )
+        return RegimeLine(data, labels=labels, warmup=atr_period + 1)
+
+    def trend_strength(
+        self,
+        data,
+        period: int = 14,
+        strong: float = 30.0,
+        moderate: float = 20.0
+    ) -> RegimeLine:
+        """
+        ADX trend strength regime (see TREND_STRENGTH_REGIMES).
+
+        Bars before ADX is available count as moderate; the line keeps
+        ADX's minperiod (2 * period), so strategies start on the same bar
+        as with the ADX indicator.
+
+        Args:
+            data: Preloaded data feed
+            period: ADX period
+            strong: ADX above which the trend is strong
+            moderate: ADX above which the trend is moderate (else weak)
+
+        Returns:
+            RegimeLine of label codes
+        """
+        def source():
+            return average_directional_index(
+                data.high.array, data.low.array, data.close.array, period
+            )
+
+        labels = self._labels(
+            data, ('trend_strength', period, strong, moderate),
+            ('adx', period), source,
+            lambda adx: classify_trend_strength(adx, strong, moderate)
+        )
+        return RegimeLine(data, labels=labels, warmup=2 * period)
+
+    def _labels(self, data, labels_key, source_key, source, classify) -> np.ndarray:
+        """Get cached labels, computing the source series at most once."""
+        if data_fingerprint(data) is None:
+            # A preloaded feed without bars has nothing to label
+            if isinstance(data, bt.AbstractDataBase) and _preloaded(data):
+                return np.empty(0, dtype=np.int8)
+            raise ValueError("Regime labels need a preloaded data feed")
+
+        def compute():
+            return classify(self.cache.array(data, source_key, source))
+
+        return self.cache.array(data, labels_key, compute)
+
+
+def _preloaded(data) -> bool:
+    """Whether the feed's Cerebro preloads data (set by Cerebro.run before strategies start)."""
+    return bool(getattr(getattr(data, '_env', None), '_dopreload', False))
+
+
+def classify_trend(r_squared, strong: float = 0.7, weak: float = 0.4) -> np.ndarray:
+    """
+    Label bars by R²: 2 = strong trend, 1 = weak trend, 0 = choppy.
+
+    Args:
+        r_squared: Array of R² values
+        strong: R² at or above which the trend is strong
+        weak: R² at or above which the trend is weak
+
+    Returns:
+        int8 label array
+    """
+    r_squared = np.asarray(r_squared, dtype=float)
+    return np.where(r_squared >= strong, 2, np.where(r_squared >= weak, 1, 0)).astype(np.int8)
+
+
+def classify_volatility(percentile, high: float = 0.80, low: float = 0.20) -> np.ndarray:
+    """
+    Label bars by volatility percentile: 2 = high, 1 = medium, 0 = low.
+
+    Args:
+        percentile: Array of percentile ranks (NaN = no history, medium)
+        high: Percentile above which volatility is high
+        low: Percentile below which volatility is low
+
+    Returns:
+        int8 label array
+    """
+    percentile = np.nan_to_num(np.asarray(percentile, dtype=float), nan=0.5)
+    return np.where(percentile > high, 2, np.where(percentile < low, 0, 1)).astype(np.int8)
+
+
+def classify_trend_strength(adx, strong: float = 30.0, moderate: float = 20.0) -> np.ndarray:
+    """
+    Label bars by ADX: 2 = strong, 1 = moderate, 0 = weak.
+
+    Args:
+        adx: Array of ADX values (NaN = not available yet, moderate)
+        strong: ADX above which the trend is strong
+        moderate: ADX above which the trend is moderate
+
+    Returns:
+        int8 label array
+    """
+    adx = np.asarray(adx, dtype=float)
+    labels = np.where(adx > strong, 2, np.where(adx > moderate, 1, 0))
+    return np.where(np.isnan(adx), 1, labels).astype(np.int8)
+
+
+_default_store: Optional[RegimeStore] = None
+
+
+def get_regime_store() -> RegimeStore:
+    """
+    Get the process-wide regime store (created on first use).
+
+    Returns:
+        Shared RegimeStore instance
+    """
+    global _default_store
+    if _default_store is None:
+        _default_store = RegimeStore()
+    return _default_store
@@ -3,7 +3,13 @@ Standard Deviation Bands for Mean Reversion
 Calculates upper and lower bands based on mean ± (threshold × stddev)
 """
 
+import array
+import math
 import backtrader as bt
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+from typing import Iterable, NamedTuple, Tuple
 
 
 class StdDevBands(bt.Indicator):
@@ -92,3 +98,239 @@ def create_bands(mean_indicator, stddev_period: int = 20, threshold: float = 2.0
         stddev_period=stddev_period,
         threshold=threshold
     )
+
+
+class BandTensor(NamedTuple):
+    """
+    Bands for every (mean_lookback, stddev_lookback, threshold) of a grid.
+
+    Values equal the StdDevBands lines Cerebro produces for the same
+    parameters (same operations in the same order), NaN during warm-up.
+
+    Fields:
+        mean_type: Mean the middle band was computed with
+        mean_lookbacks: Mean lookback axis
+        stddev_lookbacks: Stddev lookback axis
+        thresholds: Entry threshold axis
+        middle: Means shaped (mean_lookbacks, bars)
+        stddev: Population stddevs shaped (stddev_lookbacks, bars)
+        lower: Lower bands shaped (mean_lookbacks, stddev_lookbacks, thresholds, bars)
+        upper: Upper bands, same shape as lower
+    """
+    mean_type: str
+    mean_lookbacks: Tuple[int, ...]
+    stddev_lookbacks: Tuple[int, ...]
+    thresholds: Tuple[float, ...]
+    middle: np.ndarray
+    stddev: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+
+    def bands(
+        self,
+        mean_lookback: int,
+        stddev_lookback: int,
+        threshold: float
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get one band variant.
+
+        Args:
+            mean_lookback: Mean lookback period
+            stddev_lookback: Stddev lookback period
+            threshold: Number of standard deviations
+
+        Returns:
+            Tuple of (lower, upper, middle) arrays over all bars
+        """
+        i = self._index(self.mean_lookbacks, mean_lookback, 'mean_lookback')
+        j = self._index(self.stddev_lookbacks, stddev_lookback, 'stddev_lookback')
+        k = self._index(self.thresholds, threshold, 'threshold')
+        return self.lower[i, j, k], self.upper[i, j, k], self.middle[i]
+
+    def check_mean_type(self, mean_type: str):
+        """
+        Raise ValueError unless the tensor was computed with mean_type.
+
+        Args:
+            mean_type: Mean type the caller expects
+        """
+        if self.mean_type != mean_type:
+            raise ValueError(
+                f"Band tensor was computed with mean_type {self.mean_type}, not {mean_type}"
+            )
+
+    @staticmethod
+    def _index(axis, value, name: str) -> int:
+        if value not in axis:
+            raise ValueError(f"{name} {value} not in precomputed grid {list(axis)}")
+        return axis.index(value)
+
+
+class PrecomputedBands(bt.Indicator):
+    """
+    StdDevBands served from a BandTensor slice instead of being recomputed.
+
+    The tensor must have been computed from the same bars as the data feed.
+    Lines and warm-up match StdDevBands with the equivalent mean indicator.
+
+    Lines:
+        - upper: Upper band
+        - lower: Lower band
+        - middle: Mean line
+    """
+    lines = ('upper', 'lower', 'middle',)
+
+    params = (
+        ('tensor', None),         # BandTensor (required)
+        ('mean_lookback', 20),
+        ('stddev_lookback', 20),
+        ('threshold', 2.0),
+    )
+
+    def __init__(self):
+        if self.params.tensor is None:
+            raise ValueError("tensor parameter is required")
+
+        lower, upper, middle = self.params.tensor.bands(
+            self.params.mean_lookback,
+            self.params.stddev_lookback,
+            self.params.threshold
+        )
+        self.columns = (upper, lower, middle)
+
+        self.addminperiod(max(self.params.mean_lookback, self.params.stddev_lookback))
+
+    def next(self):
+        i = len(self) - 1
+        for line, values in zip(self.lines, self.columns):
+            line[0] = values[i]
+
+    def once(self, start, end):
+        if len(self.columns[0]) != self.buflen():
+            raise ValueError(
+                f"Band tensor has {len(self.columns[0])} bars, data has {self.buflen()}"
+            )
+
+        for line, values in zip(self.lines, self.columns):
+            line.array[start:end] = array.array('d', values[start:end])
+
+
+def compute_band_tensor(
+    df: pd.DataFrame,
+    mean_lookbacks: Iterable[int],
+    stddev_lookbacks: Iterable[int],
+    thresholds: Iterable[float],
+    mean_type: str = 'SMA'
+) -> BandTensor:
+    """
+    Compute the bands of a whole parameter grid for one symbol.
+
+    Only one rolling mean per mean lookback and one stddev per stddev
+    lookback are computed; all (mean x stddev x threshold) band variants are
+    broadcast from them.
+
+    Args:
+        df: DataFrame with OHLCV columns (the bars fed to Cerebro)
+        mean_lookbacks: Mean lookback periods
+        stddev_lookbacks: Stddev lookback periods
+        thresholds: Numbers of standard deviations
+        mean_type: 'SMA', 'EMA' or 'VWAP'
+
+    Returns:
+        BandTensor for the grid
+    """
+    mean_lookbacks = tuple(int(p) for p in mean_lookbacks)
+    stddev_lookbacks = tuple(int(p) for p in stddev_lookbacks)
+    thresholds = tuple(float(t) for t in thresholds)
+
+    if min(mean_lookbacks + stddev_lookbacks, default=0) < 1:
+        raise ValueError("lookbacks must be >= 1")
+
+    mean_functions = {
+        'SMA': lambda period: _sma(close, period),
+        'EMA': lambda period: _ema(close, period),
+        'VWAP': lambda period: _vwap(df, period),
+    }
+    if mean_type not in mean_functions:
+        raise ValueError(
+            f"Unsupported mean type for band tensor: {mean_type}. "
+            f"Choose from {list(mean_functions.keys())}"
+        )
+
+    close = df['close'].to_numpy(dtype=float)
+
+    middle = np.array([mean_functions[mean_type](p) for p in mean_lookbacks])
+    middle = middle.reshape(len(mean_lookbacks), len(close))
+    stddev = np.array([_stddev(close, p) for p in stddev_lookbacks])
+    stddev = stddev.reshape(len(stddev_lookbacks), len(close))
+
+    # deviation = stddev * threshold; bands = middle -/+ deviation
+    deviation = stddev[np.newaxis, :, np.newaxis, :] * np.array(thresholds)[:, np.newaxis]
+    lower = middle[:, np.newaxis, np.newaxis, :] - deviation
+    upper = middle[:, np.newaxis, np.newaxis, :] + deviation
+
+    return BandTensor(
+        mean_type=mean_type,
+        mean_lookbacks=mean_lookbacks,
+        stddev_lookbacks=stddev_lookbacks,
+        thresholds=thresholds,
+        middle=middle,
+        stddev=stddev,
+        lower=lower,
+        upper=upper
+    )
+
+
+def _rolling_fsum(values, period: int) -> np.ndarray:
+    """Exactly rounded sum of every trailing window (bt SumN / Average)."""
+    values = list(values)
+    out = np.full(len(values), np.nan)
+    if len(values) >= period:
+        out[period - 1:] = [
+            math.fsum(values[i - period + 1:i + 1])
+            for i in range(period - 1, len(values))
+        ]
+    return out
+
+
+def _sma(close: np.ndarray, period: int) -> np.ndarray:
+    """Simple moving average as computed by bt SimpleMovingAverage."""
+    return _rolling_fsum(close, period) / period
+
+
+def _ema(close: np.ndarray, period: int) -> np.ndarray:
+    """Exponential moving average seeded with the SMA (bt ExponentialMovingAverage)."""
+    alpha = 2.0 / (1.0 + period)
+    alpha1 = 1.0 - alpha
+
+    ema = _sma(close, period)
+    if len(close) > period:
+        # ema[i] = ema[i-1] * alpha1 + close[i] * alpha as a first-order filter
+        seed = ema[period - 1]
+        ema[period:], _ = lfilter([alpha], [1.0, -alpha1], close[period:], zi=[alpha1 * seed])
+    return ema
+
+
+def _vwap(df: pd.DataFrame, period: int) -> np.ndarray:
+    """Rolling VWAP on typical price (mean_calculators.VWAP)."""
+    typical_price = (
+        df['high'].to_numpy(dtype=float)
+        + df['low'].to_numpy(dtype=float)
+        + df['close'].to_numpy(dtype=float)
+    ) / 3.0
+    volume = df['volume'].to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return _rolling_fsum(typical_price * volume, period) / _rolling_fsum(volume, period)
+
+
+def _stddev(close: np.ndarray, period: int) -> np.ndarray:
+    """Population stddev as computed by bt StandardDeviation (safepow)."""
+    closes = close.tolist()
+    meansq = _rolling_fsum([x ** 2 for x in closes], period) / period
+    mean = _sma(close, period)
+    # Python pow as in backtrader's line operations
+    return np.array([
+        abs(msq - m ** 2) ** 0.5
+        for msq, m in zip(meansq.tolist(), mean.tolist())
+    ])
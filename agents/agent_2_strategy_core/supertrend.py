@@ -3,7 +3,12 @@ Supertrend Indicator
 Combines ATR (Average True Range) with price to create trend-following signals
 """
 
+import array
 import backtrader as bt
+import numpy as np
+from typing import Tuple
+
+from agents.agent_2_strategy_core.true_range import WilderATR, true_range, wilder_atr
 
 
 class Supertrend(bt.Indicator):
@@ -16,6 +21,11 @@ class Supertrend(bt.Indicator):
     Parameters:
         period: ATR calculation period (default: 10)
         multiplier: ATR multiplier for band width (default: 3.0)
+
+    The band smoothing and direction are stateful. next() carries the state
+    bar by bar; in runonce mode once() runs the same recurrence over the whole
+    series in one loop (see supertrend_bands), so the indicator no longer
+    forces the Cerebro into next() mode.
     """
 
     lines = ('supertrend', 'direction', 'final_upper', 'final_lower')
@@ -25,13 +35,11 @@ class Supertrend(bt.Indicator):
         ('multiplier', 3.0),
     )
 
-    # CRITICAL: Force bar-by-bar processing for stateful algorithm
-    _nextforce = True  # Forces next() to be called instead of batch once() mode
     plotinfo = dict(subplot=False)
 
     def __init__(self):
         # Calculate ATR
-        self.atr = bt.indicators.AverageTrueRange(self.data, period=self.params.period)
+        self.atr = WilderATR(self.data, period=self.params.period)
 
         # Wait for ATR to be ready
         self.addminperiod(self.params.period)
@@ -120,3 +128,149 @@ class Supertrend(bt.Indicator):
             else:
                 self.direction[0] = 1
                 self.supertrend[0] = final_lower
+
+    def once(self, start, end):
+        """
+        Batch calculation for runonce mode.
+
+        The recurrence always restarts at the first valid bar, so the values
+        written for [start, end) match nextstart()/next() exactly.
+        """
+        first = self._minperiod - 1
+        if end <= first:
+            return
+
+        bands = supertrend_bands(
+            self.data.high.array[first:end],
+            self.data.low.array[first:end],
+            self.data.close.array[first:end],
+            self.atr.array[first:end],
+            self.params.multiplier
+        )
+
+        lo = max(start, first)
+        for line, values in zip(self.lines, bands):
+            line.array[lo:end] = array.array('d', values[lo - first:])
+
+
+def supertrend_bands(
+    high,
+    low,
+    close,
+    atr,
+    multiplier: float = 3.0
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Run the Supertrend recurrence over a whole series.
+
+    Bar 0 initializes the state (Supertrend.nextstart); every later bar
+    smooths the bands and flips direction exactly as Supertrend.next, with
+    the same floating point operations, so results are identical.
+
+    Args:
+        high: High prices, starting at the first bar with a valid ATR
+        low: Low prices
+        close: Close prices
+        atr: ATR values
+        multiplier: ATR multiplier for band width
+
+    Returns:
+        Tuple of (supertrend, direction, final_upper, final_lower) arrays
+    """
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    close = np.asarray(close, dtype=float)
+    atr = np.asarray(atr, dtype=float)
+
+    n = len(close)
+    supertrend = np.empty(n)
+    direction = np.empty(n)
+    final_upper = np.empty(n)
+    final_lower = np.empty(n)
+    if n == 0:
+        return supertrend, direction, final_upper, final_lower
+
+    # Basic bands have no state, so they are computed for all bars at once
+    hl_avg = (high + low) / 2.0
+    basic_upper = (hl_avg + (multiplier * atr)).tolist()
+    basic_lower = (hl_avg - (multiplier * atr)).tolist()
+    closes = close.tolist()
+
+    # Initialize state on the first bar
+    upper = basic_upper[0]
+    lower = basic_lower[0]
+    trend = 1.0 if closes[0] > lower else -1.0
+
+    out_trend = [trend]
+    out_upper = [upper]
+    out_lower = [lower]
+
+    for i in range(1, n):
+        prev_close = closes[i - 1]
+
+        # Smooth the bands using previous values
+        if basic_upper[i] < upper or prev_close > upper:
+            upper = basic_upper[i]
+        if basic_lower[i] > lower or prev_close < lower:
+            lower = basic_lower[i]
+
+        # Flip direction when close crosses the opposite band
+        if trend == -1.0:
+            if closes[i] > upper:
+                trend = 1.0
+        elif closes[i] < lower:
+            trend = -1.0
+
+        out_trend.append(trend)
+        out_upper.append(upper)
+        out_lower.append(lower)
+
+    direction[:] = out_trend
+    final_upper[:] = out_upper
+    final_lower[:] = out_lower
+    supertrend[:] = np.where(direction == 1.0, final_lower, final_upper)
+
+    return supertrend, direction, final_upper, final_lower
+
+
+def supertrend_direction(
+    high,
+    low,
+    close,
+    period: int = 10,
+    multiplier: float = 3.0,
+    tr=None
+) -> np.ndarray:
+    """
+    Supertrend direction for every bar of a series, as Supertrend computes it.
+
+    Args:
+        high: High prices
+        low: Low prices
+        close: Close prices
+        period: ATR calculation period
+        multiplier: ATR multiplier for band width
+        tr: Precomputed true range of the series (see true_range), so
+            several periods and multipliers share one pass
+
+    Returns:
+        int8 array of 1 (uptrend) / -1 (downtrend); 0 for the first
+        `period` bars, before the indicator has a value
+    """
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    close = np.asarray(close, dtype=float)
+    if tr is None:
+        tr = true_range(high, low, close)
+
+    direction = np.zeros(len(close), dtype=np.int8)
+    first = period
+    if len(close) <= first:
+        return direction
+
+    atr = wilder_atr(tr, period)
+    _, trend, _, _ = supertrend_bands(
+        high[first:], low[first:], close[first:], atr[first:], multiplier
+    )
+    direction[first:] = trend.astype(np.int8)
+    return direction
@@ -5,6 +5,7 @@ Trend-following strategy using Supertrend indicator
 
 import backtrader as bt
 from agents.agent_2_strategy_core.supertrend import Supertrend
+from agents.agent_2_strategy_core.true_range import WilderATR
 
 
 class SupertrendStrategy(bt.Strategy):
@@ -68,7 +69,7 @@ class SupertrendStrategy(bt.Strategy):
 
         # ATR for stop loss calculations
         if self.params.stop_loss_type == 'atr':
-            self.atr = bt.indicators.ATR(self.data, period=self.params.atr_period)
+            self.atr = WilderATR(self.data, period=self.params.atr_period)
 
         # Track trade state
         self.entry_price = None
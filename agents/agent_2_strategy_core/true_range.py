@@ -0,0 +1,199 @@
+"""
+True Range, Wilder ATR and ADX
+One true-range pass per series, smoothed into ATRs of any number of periods
+"""
+
+import array
+import math
+import backtrader as bt
+import numpy as np
+from scipy.signal import lfilter
+from typing import Dict, Iterable
+
+from agents.agent_2_strategy_core.indicator_cache import get_indicator_cache
+
+
+class WilderATR(bt.Indicator):
+    """
+    Average True Range (Wilder smoothing)
+
+    Drop-in replacement for bt.indicators.ATR with identical output. In
+    runonce mode the true range of a preloaded feed is computed once and
+    shared through the indicator cache, so ATRs of several periods on the
+    same symbol only repeat the smoothing.
+
+    Lines:
+        - atr: Average true range
+
+    Parameters:
+        period: Smoothing period (default: 14)
+    """
+    lines = ('atr',)
+
+    params = (
+        ('period', 14),
+    )
+
+    def __init__(self):
+        if self.params.period < 1:
+            raise ValueError("period must be >= 1")
+
+        # True range needs the previous close, then `period` values to seed
+        self.addminperiod(self.params.period + 1)
+
+    def nextstart(self):
+        size = self.params.period + 1
+        tr = true_range(
+            self.data.high.get(size=size),
+            self.data.low.get(size=size),
+            self.data.close.get(size=size)
+        )
+        self.lines.atr[0] = math.fsum(tr[1:]) / self.params.period
+
+    def next(self):
+        alpha = 1.0 / self.params.period
+        prev_close = self.data.close[-1]
+        tr = max(self.data.high[0], prev_close) - min(self.data.low[0], prev_close)
+        self.lines.atr[0] = self.lines.atr[-1] * (1.0 - alpha) + tr * alpha
+
+    def once(self, start, end):
+        data = self.data
+        tr = get_indicator_cache().array(
+            data, 'true_range',
+            lambda: true_range(data.high.array, data.low.array, data.close.array)
+        )
+        atr = wilder_atr(tr[:end], self.params.period)
+        self.lines.atr.array[start:end] = array.array('d', atr[start:end])
+
+
+def true_range(high, low, close) -> np.ndarray:
+    """
+    True range for every bar of a series.
+
+    Args:
+        high: High prices
+        low: Low prices
+        close: Close prices
+
+    Returns:
+        Array of max(high, prev_close) - min(low, prev_close); bar 0 has no
+        previous close and is NaN
+    """
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    close = np.asarray(close, dtype=float)
+
+    tr = np.full(len(close), np.nan)
+    if len(close) > 1:
+        prev_close = close[:-1]
+        # Same tie and NaN handling as the builtin max/min used by backtrader
+        true_high = np.where(prev_close > high[1:], prev_close, high[1:])
+        true_low = np.where(prev_close < low[1:], prev_close, low[1:])
+        tr[1:] = true_high - true_low
+    return tr
+
+
+def wilder_smoothing(values, period: int) -> np.ndarray:
+    """
+    Wilder's smoothed moving average of a series (bt SmoothedMovingAverage).
+
+    Seeded with the simple average of the first `period` values after any
+    leading NaN, then avg = prev * (1 - 1/period) + value / period.
+
+    Args:
+        values: Array of values (leading NaN marks bars without a value)
+        period: Smoothing period (>= 1)
+
+    Returns:
+        Array of smoothed values, NaN until the seed bar
+    """
+    if period < 1:
+        raise ValueError("period must be >= 1")
+
+    values = np.asarray(values, dtype=float)
+    smoothed = np.full(len(values), np.nan)
+
+    valid = ~np.isnan(values)
+    if not valid.any():
+        return smoothed
+    seed_at = int(np.argmax(valid)) + period - 1
+    if len(values) <= seed_at:
+        return smoothed
+
+    alpha = 1.0 / period
+    alpha1 = 1.0 - alpha
+
+    seed = math.fsum(values[seed_at - period + 1:seed_at + 1].tolist()) / period
+    smoothed[seed_at] = seed
+    if len(values) > seed_at + 1:
+        # avg[i] = avg[i-1] * alpha1 + values[i] * alpha as a first-order filter
+        smoothed[seed_at + 1:], _ = lfilter(
+            [alpha], [1.0, -alpha1], values[seed_at + 1:], zi=[alpha1 * seed]
+        )
+    return smoothed
+
+
+def wilder_atr(tr, period: int) -> np.ndarray:
+    """
+    Smooth a true-range series into Wilder's ATR.
+
+    Matches bt.indicators.ATR bit for bit.
+
+    Args:
+        tr: True range from true_range (bar 0 NaN)
+        period: Smoothing period (>= 1)
+
+    Returns:
+        Array of ATR values, NaN for the first `period` bars
+    """
+    return wilder_smoothing(tr, period)
+
+
+def average_directional_index(high, low, close, period: int = 14) -> np.ndarray:
+    """
+    Wilder's ADX for every bar, matching bt.indicators.ADX.
+
+    Args:
+        high: High prices
+        low: Low prices
+        close: Close prices
+        period: Smoothing period for ATR, directional movement and DX
+
+    Returns:
+        Array of ADX values, NaN for the first 2 * period - 1 bars
+    """
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+
+    plus_dm = np.full(len(high), np.nan)
+    minus_dm = np.full(len(high), np.nan)
+    if len(high) > 1:
+        upmove = high[1:] - high[:-1]
+        downmove = low[:-1] - low[1:]
+        plus_dm[1:] = np.where((upmove > downmove) & (upmove > 0.0), upmove, 0.0)
+        minus_dm[1:] = np.where((downmove > upmove) & (downmove > 0.0), downmove, 0.0)
+
+    atr = wilder_atr(true_range(high, low, close), period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        di_plus = 100.0 * wilder_smoothing(plus_dm, period) / atr
+        di_minus = 100.0 * wilder_smoothing(minus_dm, period) / atr
+        dx = abs(di_plus - di_minus) / (di_plus + di_minus)
+
+    return 100.0 * wilder_smoothing(dx, period)
+
+
+def multi_period_atr(high, low, close, periods: Iterable[int]) -> Dict[int, np.ndarray]:
+    """
+    Compute ATRs of several periods from one true-range pass.
+
+    Args:
+        high: High prices
+        low: Low prices
+        close: Close prices
+        periods: Smoothing periods
+
+    Returns:
+        Dictionary mapping period to ATR array
+    """
+    tr = true_range(high, low, close)
+    return {int(period): wilder_atr(tr, int(period)) for period in set(periods)}
@@ -17,22 +17,29 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspa
 from agents.agent_2_strategy_core.base_strategy import MeanReversionStrategy
 from agents.agent_4_analysis.metrics_calculator import MetricsCalculator
 from agents.agent_3_optimization.data_feed import create_data_feed
+from agents.agent_3_optimization.vectorized_engine import VectorizedMeanReversion
 
 logger = logging.getLogger(__name__)
 
+# Engines BacktestExecutor can run a backtest with
+ENGINES = ('backtrader', 'vectorized')
+
 
 class BacktestExecutor:
     """
     Executes single backtests with specified parameters.
 
-    Handles Backtrader setup, execution, and results extraction.
+    Handles Backtrader setup, execution, and results extraction. Backtests
+    can also run on the array-based VectorizedMeanReversion engine, which
+    produces the same metrics much faster.
     """
 
     def __init__(
         self,
         initial_capital: float = 100000,
         commission: float = 0.001,
-        slippage: float = 0.0
+        slippage: float = 0.0,
+        engine: str = 'backtrader'
     ):
         """
         Initialize backtest executor.
@@ -41,10 +48,17 @@ class BacktestExecutor:
             initial_capital: Starting capital
             commission: Commission rate (0.001 = 0.1%)
             slippage: Slippage percentage
+            engine: Default engine, 'backtrader' (Cerebro) or 'vectorized'
+                (array-based, same results; falls back to Cerebro for
+                configurations it does not support)
         """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine: {engine}. Choose from {list(ENGINES)}")
+
         self.initial_capital = initial_capital
         self.commission = commission
         self.slippage = slippage
+        self.engine = engine
         self.logger = logging.getLogger(__name__)
 
     def run_backtest(
@@ -53,7 +67,8 @@ class BacktestExecutor:
         symbol: str,
         strategy_params: Dict,
         candle_type: str,
-        aggregation_days: int
+        aggregation_days: int,
+        engine: Optional[str] = None
     ) -> Dict:
         """
         Run a single backtest.
@@ -64,86 +79,47 @@ class BacktestExecutor:
             strategy_params: Dictionary of strategy parameters
             candle_type: Type of candle used
             aggregation_days: Aggregation period
+            engine: Engine for this run (default: the executor's engine)
 
         Returns:
             Dictionary with backtest results and metrics
         """
         try:
-            # Create Cerebro instance
-            cerebro = bt.Cerebro()
-
-            # Set initial capital
-            cerebro.broker.setcash(self.initial_capital)
-
-            # Set commission
-            cerebro.broker.setcommission(commission=self.commission)
-
-            # Add data feed
-            data_feed = create_data_feed(candle_df, name=symbol)
-            cerebro.adddata(data_feed)
-
-            # Add strategy with parameters
-            cerebro.addstrategy(MeanReversionStrategy, **strategy_params)
-
-            # Add analyzers
-            cerebro.addanalyzer(bt.analyzers.TradeAnalyzer, _name='trades')
-            cerebro.addanalyzer(bt.analyzers.DrawDown, _name='drawdown')
-            cerebro.addanalyzer(bt.analyzers.Returns, _name='returns')
-            cerebro.addanalyzer(bt.analyzers.SharpeRatio, _name='sharpe',
-                              timeframe=bt.TimeFrame.Days,
-                              compression=1,
-                              fund=True,
-                              annualize=True,
-                              riskfreerate=0.02)
-
-            # Run backtest
-            self.logger.info(f"Running backtest for {symbol} ({candle_type}, {aggregation_days}d)")
+            engine = engine or self.engine
+            if engine not in ENGINES:
+                raise ValueError(f"Unknown engine: {engine}. Choose from {list(ENGINES)}")
 
-            start_value = cerebro.broker.getvalue()
-            results = cerebro.run()
-            end_value = cerebro.broker.getvalue()
+            self.logger.info(f"Running backtest for {symbol} ({candle_type}, {aggregation_days}d)")
 
-            # Extract strategy instance
-            strat = results[0]
+            outcome = None
+            if engine == 'vectorized':
+                outcome = self._run_vectorized(candle_df, symbol, strategy_params)
+            if outcome is None:
+                outcome = self._run_cerebro(candle_df, symbol, strategy_params)
 
-            # Get trade stats directly from strategy (it tracks wins/losses in notify_trade)
-            total_trades = strat.trade_count
-            winning_trades = strat.winning_trades
-            losing_trades = strat.losing_trades
+            start_value = outcome['start_value']
+            end_value = outcome['end_value']
+            total_trades = outcome['total_trades']
+            winning_trades = outcome['winning_trades']
+            losing_trades = outcome['losing_trades']
+            max_drawdown_pct = outcome['max_drawdown_pct']
 
             # Calculate win rate
             win_rate = (winning_trades / total_trades * 100.0) if total_trades > 0 else 0.0
 
-            # Get drawdown info
-            dd_analysis = strat.analyzers.drawdown.get_analysis()
-            max_drawdown_pct = 0.0
-            try:
-                if hasattr(dd_analysis, 'max') and hasattr(dd_analysis.max, 'drawdown'):
-                    max_drawdown_pct = dd_analysis.max.drawdown / 100.0  # Convert to decimal
-            except (AttributeError, TypeError):
-                pass
-
-            # Get returns analyzer
-            returns_analysis = strat.analyzers.returns.get_analysis()
             total_return = (end_value - start_value) / start_value
 
-            # Get Sharpe from analyzer
-            sharpe_analysis = strat.analyzers.sharpe.get_analysis()
             sharpe_ratio = 0.0
-            try:
-                if sharpe_analysis and 'sharperatio' in sharpe_analysis:
-                    sharpe_value = sharpe_analysis['sharperatio']
-                    # Handle None or NaN values
-                    if sharpe_value is not None and not pd.isna(sharpe_value):
-                        sharpe_ratio = sharpe_value
-            except (AttributeError, TypeError, KeyError):
-                pass
+            sharpe_value = outcome['sharpe_ratio']
+            # Handle None or NaN values
+            if sharpe_value is not None and not pd.isna(sharpe_value):
+                sharpe_ratio = sharpe_value
 
             # Fallback: Calculate Sharpe manually if analyzer returned None/NaN
             if sharpe_ratio == 0.0 or pd.isna(sharpe_ratio):
                 try:
                     # Get daily returns from Returns analyzer
-                    returns_data = returns_analysis.get('rnorm100', None)
+                    returns_data = outcome['returns_rnorm100']
                     if returns_data and len(returns_data) > 1:
                         # Convert to pandas Series for easy calculation
                         returns_series = pd.Series(list(returns_data.values()))
@@ -202,6 +178,105 @@ class BacktestExecutor:
                 'success': False
             }
 
+    def _run_cerebro(self, candle_df: pd.DataFrame, symbol: str, strategy_params: Dict) -> Dict:
+        """
+        Run MeanReversionStrategy in Cerebro and read its analyzers.
+
+        Returns:
+            Dictionary with start/end value, trade counts, max_drawdown_pct,
+            sharpe_ratio (analyzer value) and returns_rnorm100
+        """
+        # Create Cerebro instance
+        cerebro = bt.Cerebro()
+
+        # Set initial capital
+        cerebro.broker.setcash(self.initial_capital)
+
+        # Set commission
+        cerebro.broker.setcommission(commission=self.commission)
+
+        # Add data feed
+        data_feed = create_data_feed(candle_df, name=symbol)
+        cerebro.adddata(data_feed)
+
+        # Add strategy with parameters
+        cerebro.addstrategy(MeanReversionStrategy, **strategy_params)
+
+        # Add analyzers
+        cerebro.addanalyzer(bt.analyzers.TradeAnalyzer, _name='trades')
+        cerebro.addanalyzer(bt.analyzers.DrawDown, _name='drawdown')
+        cerebro.addanalyzer(bt.analyzers.Returns, _name='returns')
+        cerebro.addanalyzer(bt.analyzers.SharpeRatio, _name='sharpe',
+                          timeframe=bt.TimeFrame.Days,
+                          compression=1,
+                          fund=True,
+                          annualize=True,
+                          riskfreerate=0.02)
+
+        # Run backtest
+        start_value = cerebro.broker.getvalue()
+        results = cerebro.run()
+        end_value = cerebro.broker.getvalue()
+
+        # Extract strategy instance
+        strat = results[0]
+
+        # Get drawdown info
+        dd_analysis = strat.analyzers.drawdown.get_analysis()
+        max_drawdown_pct = 0.0
+        try:
+            if hasattr(dd_analysis, 'max') and hasattr(dd_analysis.max, 'drawdown'):
+                max_drawdown_pct = dd_analysis.max.drawdown / 100.0  # Convert to decimal
+        except (AttributeError, TypeError):
+            pass
+
+        # Get Sharpe from analyzer
+        sharpe_analysis = strat.analyzers.sharpe.get_analysis()
+        sharpe_ratio = None
+        try:
+            if sharpe_analysis and 'sharperatio' in sharpe_analysis:
+                sharpe_ratio = sharpe_analysis['sharperatio']
+        except (AttributeError, TypeError, KeyError):
+            pass
+
+        return {
+            'start_value': start_value,
+            'end_value': end_value,
+            # Get trade stats directly from strategy (it tracks wins/losses in notify_trade)
+            'total_trades': strat.trade_count,
+            'winning_trades': strat.winning_trades,
+            'losing_trades': strat.losing_trades,
+            'max_drawdown_pct': max_drawdown_pct,
+            'sharpe_ratio': sharpe_ratio,
+            'returns_rnorm100': strat.analyzers.returns.get_analysis().get('rnorm100', None),
+        }
+
+    def _run_vectorized(self, candle_df: pd.DataFrame, symbol: str, strategy_params: Dict) -> Optional[Dict]:
+        """
+        Run the array-based engine.
+
+        Returns:
+            Same dictionary as _run_cerebro, or None if the configuration
+            needs Cerebro
+        """
+        engine = VectorizedMeanReversion(self.initial_capital, self.commission)
+        try:
+            result = engine.run(candle_df, strategy_params)
+        except ValueError as e:
+            self.logger.debug(f"Vectorized engine unavailable for {symbol} ({e}), using Cerebro")
+            return None
+
+        return {
+            'start_value': result.start_value,
+            'end_value': result.end_value,
+            'total_trades': result.total_trades,
+            'winning_trades': result.winning_trades,
+            'losing_trades': result.losing_trades,
+            'max_drawdown_pct': result.max_drawdown / 100.0,  # Convert to decimal
+            'sharpe_ratio': result.sharpe_ratio,
+            'returns_rnorm100': result.rnorm100,
+        }
+
     def run_multiple_backtests(
         self,
         candles_dict: Dict[str, pd.DataFrame],
@@ -252,7 +327,11 @@ class BacktestExecutor:
             import json
 
             # Step 1: Create or get strategy_config
-            strategy_params = results.get('strategy_params', {})
+            # The band tensor is a cache of arrays, not a parameter
+            strategy_params = {
+                key: value for key, value in results.get('strategy_params', {}).items()
+                if key != 'band_tensor'
+            }
             config_name = f"{results['symbol']}_{results['candle_type']}_{results['aggregation_days']}d"
 
             # Insert strategy config (only using columns that exist in table)
@@ -0,0 +1,60 @@
+"""
+Broker Math - Agent 3 Component
+BackBroker fill prices, values and drawdowns shared by the array-based engines
+"""
+
+import numpy as np
+
+
+def executed_price(size: float, price: float) -> float:
+    """
+    Fill price as order.executed.price records it.
+
+    OrderData.addbit averages each fill into the (empty) executed bit as
+    (size * price) / size, which does not always round back to price.
+    The broker's position and cash use the unrounded price.
+
+    Args:
+        size: Filled size (negative for sells)
+        price: Fill price
+
+    Returns:
+        The order's executed price
+    """
+    return (size * price) / size
+
+
+def broker_values(initial_capital: float, closes: np.ndarray, steps) -> np.ndarray:
+    """
+    Broker value at every bar's close for a single long position.
+
+    Args:
+        initial_capital: Starting cash
+        closes: Close prices
+        steps: (fill bar, cash after fill, position size, position price)
+            tuples in bar order
+
+    Returns:
+        Array of BackBroker values
+    """
+    n = len(closes)
+    cash = np.full(n, float(initial_capital))
+    size = np.zeros(n)
+    price = np.zeros(n)
+    for bar, step_cash, step_size, step_price in steps:
+        cash[bar:] = step_cash
+        size[bar:] = step_size
+        price[bar:] = step_price
+
+    # BackBroker._get_value: cash + ((size*close - unrealized) / leverage + unrealized)
+    dvalue = size * closes
+    unrealized = size * (closes - price) * 1.0
+    position_value = np.where(dvalue > 0, (dvalue - unrealized) / 1.0 + unrealized, 0.0)
+    return cash + position_value
+
+
+def max_drawdown(values: np.ndarray) -> float:
+    """DrawDown analyzer max.drawdown (percent)."""
+    peak = np.maximum.accumulate(values)
+    drawdown = 100.0 * (peak - values) / peak
+    return max(0.0, float(drawdown.max()))
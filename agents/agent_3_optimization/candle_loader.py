@@ -16,16 +16,21 @@ class CandleLoader:
     Loads candle data from database for backtesting.
 
     Handles fetching specific candle types and symbols for strategy testing.
+    With a LazyCandleProvider, candles are computed on demand from stock_data
+    instead of being read from the candles table.
     """
 
-    def __init__(self, db_manager):
+    def __init__(self, db_manager, provider=None):
         """
         Initialize candle loader.
 
         Args:
             db_manager: DatabaseManager instance
+            provider: Optional LazyCandleProvider used in place of the
+                candles table
         """
         self.db_manager = db_manager
+        self.provider = provider
         self.logger = logging.getLogger(__name__)
 
     def load_candles(
@@ -34,7 +39,8 @@ class CandleLoader:
         candle_type: str,
         aggregation_days: int,
         start_date: Optional[str] = None,
-        end_date: Optional[str] = None
+        end_date: Optional[str] = None,
+        window: Optional[int] = None
     ) -> pd.DataFrame:
         """
         Load candles for a specific symbol and type.
@@ -45,10 +51,19 @@ class CandleLoader:
             aggregation_days: Aggregation period (1, 2, 3, 4, 5)
             start_date: Optional start date (YYYY-MM-DD)
             end_date: Optional end date (YYYY-MM-DD)
+            window: LR window (lazy provider only; any window can be requested)
 
         Returns:
             DataFrame with columns [date, open, high, low, close, volume]
         """
+        if self.provider is not None:
+            return self._load_lazy(
+                symbol, candle_type, aggregation_days, start_date, end_date, window
+            )
+
+        if window is not None:
+            raise ValueError("window requires a lazy candle provider")
+
         # Build query
         query = """
             SELECT date, open, high, low, close, volume
@@ -105,13 +120,63 @@ class CandleLoader:
 
         return df
 
+    def _load_lazy(
+        self,
+        symbol: str,
+        candle_type: str,
+        aggregation_days: int,
+        start_date: Optional[str],
+        end_date: Optional[str],
+        window: Optional[int]
+    ) -> pd.DataFrame:
+        """
+        Load candles through the lazy provider.
+
+        Args:
+            symbol: Stock symbol
+            candle_type: Type of candle
+            aggregation_days: Aggregation period
+            start_date: Optional start date (YYYY-MM-DD)
+            end_date: Optional end date (YYYY-MM-DD)
+            window: Optional LR window
+
+        Returns:
+            DataFrame with columns [date, open, high, low, close, volume]
+        """
+        df = self.provider.get_candles(
+            symbol,
+            candle_type,
+            aggregation_days,
+            window=window,
+            start_date=start_date,
+            end_date=end_date
+        )
+
+        if df.empty:
+            self.logger.warning(
+                f"No candles found for {symbol} "
+                f"(type={candle_type}, agg={aggregation_days})"
+            )
+            return pd.DataFrame()
+
+        # Match the table loader's types
+        df['volume'] = df['volume'].round().astype(int)
+
+        self.logger.info(
+            f"Computed {len(df)} candles for {symbol} "
+            f"({candle_type}, {aggregation_days}d)"
+        )
+
+        return df
+
     def load_multiple_symbols(
         self,
         symbols: List[str],
         candle_type: str,
         aggregation_days: int,
         start_date: Optional[str] = None,
-        end_date: Optional[str] = None
+        end_date: Optional[str] = None,
+        window: Optional[int] = None
     ) -> dict:
         """
         Load candles for multiple symbols.
@@ -122,6 +187,7 @@ class CandleLoader:
             aggregation_days: Aggregation period
             start_date: Optional start date
             end_date: Optional end date
+            window: Optional LR window (lazy provider only)
 
         Returns:
             Dictionary mapping symbol -> DataFrame
@@ -135,7 +201,8 @@ class CandleLoader:
                     candle_type=candle_type,
                     aggregation_days=aggregation_days,
                     start_date=start_date,
-                    end_date=end_date
+                    end_date=end_date,
+                    window=window
                 )
 
                 if not df.empty:
@@ -165,6 +232,12 @@ class CandleLoader:
         Returns:
             List of available symbols
         """
+        if self.provider is not None:
+            # Every candle type can be derived for any symbol with stock data
+            symbols = self.db_manager.get_available_symbols()
+            self.logger.info(f"Found {len(symbols)} symbols with stock data")
+            return symbols
+
         query = "SELECT DISTINCT symbol FROM candles"
         params = []
 
@@ -207,6 +280,12 @@ class CandleLoader:
         Returns:
             Tuple of (min_date, max_date)
         """
+        if self.provider is not None:
+            df = self.provider.get_candles(symbol, candle_type, aggregation_days)
+            if df.empty:
+                return None, None
+            return df.index.min(), df.index.max()
+
         query = """
             SELECT MIN(date), MAX(date)
             FROM candles
@@ -0,0 +1,346 @@
+"""
+Dual Supertrend Grid Engine - Agent 3 Component
+Array-based entry/exit Supertrend parameter searches matching the Cerebro path trade for trade
+"""
+
+import itertools
+import math
+import numpy as np
+import pandas as pd
+import logging
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from agents.agent_2_strategy_core.supertrend import supertrend_direction
+from agents.agent_2_strategy_core.true_range import true_range
+from agents.agent_3_optimization.broker_math import broker_values, max_drawdown
+
+logger = logging.getLogger(__name__)
+
+# SharpeRatio analyzer defaults used by the grid scripts (yearly returns)
+RISK_FREE_RATE = 0.02
+
+# SharpeRatio RATEFACTORS entry for TimeFrame.Years
+YEARLY_RATE_FACTOR = 1
+
+
+class SupertrendResult(NamedTuple):
+    """
+    Outcome of one dual-Supertrend backtest, in the units of the Cerebro analyzers.
+
+    Fields:
+        entry_period: Entry Supertrend ATR period
+        entry_multiplier: Entry Supertrend ATR multiplier
+        exit_period: Exit Supertrend ATR period
+        exit_multiplier: Exit Supertrend ATR multiplier
+        start_value: Portfolio value before the first bar
+        end_value: Portfolio value after the last bar
+        values: Portfolio value at the close of every bar
+        trades: Closed trades (entry_bar, exit_bar, size, entry_price,
+            exit_price, pnl, pnlcomm); bars are fill bars
+        winning_trades: TradeAnalyzer won.total (pnlcomm >= 0)
+        max_drawdown: DrawDown analyzer max.drawdown (percent)
+        sharpe_ratio: SharpeRatio analyzer value on yearly returns (None when undefined)
+        yearly_returns: TimeReturn (Years) returns keyed by year, as fractions
+    """
+    entry_period: int
+    entry_multiplier: float
+    exit_period: int
+    exit_multiplier: float
+    start_value: float
+    end_value: float
+    values: np.ndarray
+    trades: List[Dict]
+    winning_trades: int
+    max_drawdown: float
+    sharpe_ratio: Optional[float]
+    yearly_returns: Dict[int, float]
+
+    @property
+    def total_trades(self) -> int:
+        """Number of closed trades."""
+        return len(self.trades)
+
+    @property
+    def total_return(self) -> float:
+        """Total return in percent."""
+        return ((self.end_value - self.start_value) / self.start_value) * 100
+
+
+class DualSupertrendGrid:
+    """
+    Array-based replacement for running the dual Supertrend strategy in Cerebro.
+
+    The strategy buys int(cash * position_pct / close) shares while flat and
+    the entry Supertrend is up, and sells the whole position when the exit
+    Supertrend flips from up to down. One grid is built per symbol: true
+    range is computed once, each distinct (period, multiplier) direction
+    array once, and every entry/exit pair is then a pass over two int8
+    arrays that only visits the bars where the position changes.
+
+    Fills follow backtrader's default broker (next-bar-open market orders,
+    submit-time cash check, percentage commission). A buy the broker rejects
+    for cash leaves the strategy's order pending forever, so like the
+    strategy the engine stops trading from then on.
+    """
+
+    def __init__(
+        self,
+        candle_df: pd.DataFrame,
+        initial_capital: float = 100000,
+        commission: float = 0.0,
+        position_pct: float = 0.95
+    ):
+        """
+        Initialize grid for one symbol.
+
+        Args:
+            candle_df: DataFrame with candle data (OHLC columns; dates in a
+                'date' column or the index)
+            initial_capital: Starting capital
+            commission: Commission rate (0.001 = 0.1%)
+            position_pct: Fraction of cash committed per entry
+        """
+        required_cols = ['open', 'high', 'low', 'close']
+        if candle_df.empty or any(col not in candle_df.columns for col in required_cols):
+            raise ValueError("Candle DataFrame is empty or missing OHLC columns")
+
+        self.initial_capital = initial_capital
+        self.commission = commission
+        self.position_pct = position_pct
+
+        self.opens = candle_df['open'].to_numpy(dtype=float)
+        self.highs = candle_df['high'].to_numpy(dtype=float)
+        self.lows = candle_df['low'].to_numpy(dtype=float)
+        self.closes = candle_df['close'].to_numpy(dtype=float)
+
+        dates = candle_df['date'] if 'date' in candle_df.columns else candle_df.index
+        self.years = pd.DatetimeIndex(dates).year.to_numpy()
+
+        self._tr = true_range(self.highs, self.lows, self.closes)
+        self._directions: Dict[Tuple[int, float], np.ndarray] = {}
+
+    def direction(self, period: int, multiplier: float) -> np.ndarray:
+        """
+        Supertrend direction array, computed once per (period, multiplier).
+
+        Args:
+            period: ATR period
+            multiplier: ATR multiplier
+
+        Returns:
+            int8 array of 1 / -1, 0 before the indicator has a value
+        """
+        key = (int(period), float(multiplier))
+        direction = self._directions.get(key)
+        if direction is None:
+            direction = supertrend_direction(
+                self.highs, self.lows, self.closes,
+                key[0], key[1], tr=self._tr
+            )
+            self._directions[key] = direction
+        return direction
+
+    def run(
+        self,
+        entry_period: int,
+        entry_multiplier: float,
+        exit_period: int,
+        exit_multiplier: float
+    ) -> SupertrendResult:
+        """
+        Run one entry/exit configuration.
+
+        Args:
+            entry_period: Entry Supertrend ATR period
+            entry_multiplier: Entry Supertrend ATR multiplier
+            exit_period: Exit Supertrend ATR period
+            exit_multiplier: Exit Supertrend ATR multiplier
+
+        Returns:
+            SupertrendResult
+        """
+        opens = self.opens
+        closes = self.closes
+        n = len(closes)
+
+        entry_dir = self.direction(entry_period, entry_multiplier)
+        exit_dir = self.direction(exit_period, exit_multiplier)
+
+        # First bar on which the strategy's next() runs
+        first = max(int(entry_period), int(exit_period))
+
+        entry_bars = np.flatnonzero(entry_dir == 1)
+        entry_bars = entry_bars[entry_bars >= first]
+        # Exit Supertrend flips from up to down
+        exit_bars = np.flatnonzero((exit_dir[1:] == -1) & (exit_dir[:-1] == 1)) + 1
+
+        cash = float(self.initial_capital)
+        # (fill bar, cash after fill, position size, position price)
+        steps = []
+        trades = []
+
+        bar = first
+        while True:
+            # Next entry signal with a non-zero order size (cash is fixed while flat)
+            k = np.searchsorted(entry_bars, bar)
+            signal = None
+            while k < len(entry_bars):
+                size = int(cash * self.position_pct / closes[entry_bars[k]])
+                if size > 0:
+                    signal = int(entry_bars[k])
+                    break
+                k += 1
+            if signal is None or signal + 1 >= n:
+                break
+
+            fill = signal + 1
+            created = float(closes[signal])
+
+            # A rejected buy (on submission or at the fill price) is never
+            # cleared from the strategy's pending order, so trading stops
+            if (cash - size * created) - self._comm(size, created) < 0.0:
+                break
+            entry_price = float(opens[fill])
+            entry_comm = self._comm(size, entry_price)
+            if (cash - size * entry_price) - entry_comm < 0.0:
+                break
+
+            cash = (cash - size * entry_price) - entry_comm
+            steps.append((fill, cash, size, entry_price))
+
+            # Exit is checked from the fill bar on
+            k = np.searchsorted(exit_bars, fill)
+            if k >= len(exit_bars) or exit_bars[k] + 1 >= n:
+                break
+
+            exit_fill = int(exit_bars[k]) + 1
+            exit_price = float(opens[exit_fill])
+            pnl = size * (exit_price - entry_price) * 1.0
+            exit_comm = self._comm(size, exit_price)
+            cash = (cash + (size * entry_price + pnl)) - exit_comm
+            steps.append((exit_fill, cash, 0, 0.0))
+
+            trades.append({
+                'entry_bar': fill,
+                'exit_bar': exit_fill,
+                'size': size,
+                'entry_price': entry_price,
+                'exit_price': exit_price,
+                'pnl': pnl,
+                'pnlcomm': pnl - (entry_comm + exit_comm),
+            })
+
+            # Flat again from the exit fill bar on
+            bar = exit_fill
+
+        values = broker_values(self.initial_capital, closes, steps)
+        yearly_returns = self._yearly_returns(values)
+
+        return SupertrendResult(
+            entry_period=int(entry_period),
+            entry_multiplier=float(entry_multiplier),
+            exit_period=int(exit_period),
+            exit_multiplier=float(exit_multiplier),
+            start_value=float(self.initial_capital),
+            end_value=float(values[-1]),
+            values=values,
+            trades=trades,
+            winning_trades=sum(1 for trade in trades if trade['pnlcomm'] >= 0.0),
+            max_drawdown=max_drawdown(values),
+            sharpe_ratio=_yearly_sharpe_ratio(list(yearly_returns.values())),
+            yearly_returns=yearly_returns
+        )
+
+    def run_grid(
+        self,
+        entry_periods: Iterable[int],
+        entry_multipliers: Iterable[float],
+        exit_periods: Iterable[int],
+        exit_multipliers: Iterable[float]
+    ) -> List[SupertrendResult]:
+        """
+        Run every combination of entry and exit parameters.
+
+        Args:
+            entry_periods: Entry ATR periods
+            entry_multipliers: Entry ATR multipliers
+            exit_periods: Exit ATR periods
+            exit_multipliers: Exit ATR multipliers
+
+        Returns:
+            List of SupertrendResult in nested-loop order (entry period
+            outermost, exit multiplier innermost)
+        """
+        return [
+            self.run(*combo)
+            for combo in itertools.product(
+                entry_periods, entry_multipliers, exit_periods, exit_multipliers
+            )
+        ]
+
+    def _comm(self, size: int, price: float) -> float:
+        """Percentage commission (CommInfoBase COMM_PERC)."""
+        return abs(size) * self.commission * price
+
+    def _yearly_returns(self, values: np.ndarray) -> Dict[int, float]:
+        """TimeReturn (Years) analysis: value at each year's last bar over the previous one."""
+        last_bars = np.flatnonzero(np.diff(self.years) != 0).tolist() + [len(values) - 1]
+
+        returns = {}
+        value_start = float(self.initial_capital)
+        for bar in last_bars:
+            value = float(values[bar])
+            returns[int(self.years[bar])] = (value / value_start) - 1.0
+            value_start = value
+        return returns
+
+
+def _yearly_sharpe_ratio(returns: List[float]) -> Optional[float]:
+    """SharpeRatio analyzer (yearly timeframe, not annualized, riskfree 2%)."""
+    if not returns:
+        return None
+
+    rate = pow(1.0 + RISK_FREE_RATE, 1.0 / YEARLY_RATE_FACTOR) - 1.0
+    ret_free = [r - rate for r in returns]
+    ret_free_avg = math.fsum(ret_free) / len(ret_free)
+    retdev = math.sqrt(
+        math.fsum([pow(r - ret_free_avg, 2.0) for r in ret_free]) / len(ret_free)
+    )
+
+    try:
+        return ret_free_avg / retdev
+    except ZeroDivisionError:
+        return None
+
+
+def run_supertrend_grid(
+    candle_df: pd.DataFrame,
+    entry_periods: Iterable[int],
+    entry_multipliers: Iterable[float],
+    exit_periods: Iterable[int],
+    exit_multipliers: Iterable[float],
+    initial_capital: float = 100000,
+    commission: float = 0.0
+) -> List[SupertrendResult]:
+    """
+    Convenience function to run a dual Supertrend grid on one symbol.
+
+    Args:
+        candle_df: DataFrame with candle data
+        entry_periods: Entry ATR periods
+        entry_multipliers: Entry ATR multipliers
+        exit_periods: Exit ATR periods
+        exit_multipliers: Exit ATR multipliers
+        initial_capital: Starting capital
+        commission: Commission rate (0.001 = 0.1%)
+
+    Returns:
+        List of SupertrendResult
+    """
+    grid = DualSupertrendGrid(candle_df, initial_capital, commission)
+    return grid.run_grid(entry_periods, entry_multipliers, exit_periods, exit_multipliers)
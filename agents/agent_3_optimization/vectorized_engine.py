@@ -0,0 +1,357 @@
+"""
+Vectorized Backtest Engine - Agent 3 Component
+Array-based MeanReversionStrategy backtests matching the Cerebro path trade for trade
+"""
+
+import math
+import numpy as np
+import pandas as pd
+import logging
+from typing import Dict, List, NamedTuple, Optional
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from agents.agent_2_strategy_core.base_strategy import MeanReversionStrategy
+from agents.agent_2_strategy_core.stddev_bands import compute_band_tensor
+from agents.agent_2_strategy_core.true_range import true_range, wilder_atr
+from agents.agent_3_optimization.broker_math import broker_values, executed_price, max_drawdown
+
+logger = logging.getLogger(__name__)
+
+# SharpeRatio / Returns analyzer settings used by BacktestExecutor
+TRADING_DAYS = 252
+RISK_FREE_RATE = 0.02
+
+# Starting value of the broker's fund shares (bt fundstartval)
+FUND_START_VALUE = 100.0
+
+
+class EngineResult(NamedTuple):
+    """
+    Outcome of one vectorized backtest, in the units of the Cerebro analyzers.
+
+    Fields:
+        start_value: Portfolio value before the first bar
+        end_value: Portfolio value after the last bar
+        values: Portfolio value at the close of every bar
+        trades: Closed trades (entry_bar, exit_bar, size, entry_price,
+            exit_price, pnl, pnlcomm); bars are fill bars, prices are
+            order.executed.price
+        winning_trades: Closed trades with pnl > 0
+        losing_trades: Closed trades with pnl <= 0
+        max_drawdown: DrawDown analyzer max.drawdown (percent)
+        sharpe_ratio: SharpeRatio analyzer value (None when undefined)
+        rnorm100: Returns analyzer rnorm100
+    """
+    start_value: float
+    end_value: float
+    values: np.ndarray
+    trades: List[Dict]
+    winning_trades: int
+    losing_trades: int
+    max_drawdown: float
+    sharpe_ratio: Optional[float]
+    rnorm100: float
+
+    @property
+    def total_trades(self) -> int:
+        """Number of closed trades."""
+        return len(self.trades)
+
+
+class VectorizedMeanReversion:
+    """
+    Array-based replacement for running MeanReversionStrategy in Cerebro.
+
+    Signals are evaluated for all bars at once; only the bars where the
+    position changes are visited in Python. Fills follow backtrader's
+    default broker: market orders fill at the next bar's open, buys are
+    checked against cash at the creating bar's close when submitted, and
+    percentage commission is charged on both sides. Broker value, drawdown,
+    Sharpe and returns use the same floating point operations as the
+    broker and analyzers, so results are identical.
+
+    Configurations the engine cannot reproduce (RSI or volume filters,
+    LinReg means, buys rejected for cash at fill time) raise ValueError;
+    run those through Cerebro.
+    """
+
+    def __init__(self, initial_capital: float = 100000, commission: float = 0.001):
+        """
+        Initialize engine.
+
+        Args:
+            initial_capital: Starting capital
+            commission: Commission rate (0.001 = 0.1%)
+        """
+        self.initial_capital = initial_capital
+        self.commission = commission
+
+    def run(self, candle_df: pd.DataFrame, strategy_params: Dict) -> EngineResult:
+        """
+        Run one backtest.
+
+        Args:
+            candle_df: DataFrame with candle data (date index, OHLCV columns)
+            strategy_params: MeanReversionStrategy parameters
+
+        Returns:
+            EngineResult
+        """
+        p = self._resolve_params(candle_df, strategy_params)
+
+        opens = candle_df['open'].to_numpy(dtype=float)
+        closes = candle_df['close'].to_numpy(dtype=float)
+        n = len(closes)
+
+        lower, upper, middle = self._bands(candle_df, p)
+
+        # First bar on which the strategy's next() runs
+        minperiod = max(p['mean_lookback'], p['stddev_lookback'])
+        atr = None
+        if p['use_volatility_filter']:
+            atr = wilder_atr(
+                true_range(candle_df['high'], candle_df['low'], closes), 14
+            )
+            minperiod = max(minperiod, 15)
+        if p['use_trend_filter']:
+            minperiod = max(minperiod, p['trend_ma_period'])
+        first = minperiod - 1
+
+        entry_signal = np.zeros(n, dtype=bool)
+        entry_signal[first:] = closes[first:] < lower[first:]
+        entry_bars = np.flatnonzero(entry_signal)
+
+        exit_bars = None
+        if p['exit_type'] == 'mean':
+            exit_bars = np.flatnonzero(closes >= middle)
+        elif p['exit_type'] == 'opposite_band':
+            exit_bars = np.flatnonzero(closes >= upper)
+
+        cash = float(self.initial_capital)
+        # (fill bar, cash after fill, position size, position price)
+        steps = []
+        trades = []
+
+        bar = first
+        while True:
+            # Next entry signal with a non-zero order size
+            k = np.searchsorted(entry_bars, bar)
+            signal = None
+            while k < len(entry_bars):
+                size = self._order_size(p, closes[entry_bars[k]], atr, entry_bars[k])
+                if size:
+                    signal = int(entry_bars[k])
+                    break
+                k += 1
+            if signal is None or signal + 1 >= n:
+                break
+
+            fill = signal + 1
+            created = float(closes[signal])
+
+            # Broker rejects the buy on submission (Margin) if the cash
+            # would go negative at the creating bar's close
+            if (cash - size * created) - self._comm(size, created) < 0.0:
+                bar = fill
+                continue
+
+            entry_price = float(opens[fill])
+            entry_comm = self._comm(size, entry_price)
+            cash = (cash - size * entry_price) - entry_comm
+            if cash < 0.0:
+                raise ValueError("Buy not affordable at fill price; run through Cerebro")
+            steps.append((fill, cash, size, entry_price))
+
+            # The strategy's entry_price is order.executed.price, which can
+            # differ from the fill price in the last bit
+            executed_entry = executed_price(size, entry_price)
+            exit_signal = self._exit_bar(p, closes, exit_bars, signal, fill, executed_entry)
+            if exit_signal is None or exit_signal + 1 >= n:
+                break
+
+            exit_fill = exit_signal + 1
+            exit_price = float(opens[exit_fill])
+            pnl = size * (exit_price - entry_price) * 1.0
+            exit_comm = self._comm(size, exit_price)
+            cash = (cash + (size * entry_price + pnl)) - exit_comm
+            steps.append((exit_fill, cash, 0, 0.0))
+
+            trades.append({
+                'entry_bar': fill,
+                'exit_bar': exit_fill,
+                'size': size,
+                'entry_price': executed_entry,
+                'exit_price': executed_price(-size, exit_price),
+                'pnl': pnl,
+                'pnlcomm': pnl - (entry_comm + exit_comm),
+            })
+
+            # Flat again from the exit fill bar on
+            bar = exit_fill
+
+        values = self._values(closes, steps)
+        winning = sum(1 for trade in trades if trade['pnl'] > 0)
+
+        return EngineResult(
+            start_value=float(self.initial_capital),
+            end_value=float(values[-1]),
+            values=values,
+            trades=trades,
+            winning_trades=winning,
+            losing_trades=len(trades) - winning,
+            max_drawdown=max_drawdown(values),
+            sharpe_ratio=_sharpe_ratio(values, self.initial_capital),
+            rnorm100=_rnorm100(values, self.initial_capital)
+        )
+
+    @staticmethod
+    def _resolve_params(candle_df: pd.DataFrame, strategy_params: Dict) -> Dict:
+        """Fill in strategy defaults and reject what the engine cannot reproduce."""
+        defaults = dict(MeanReversionStrategy.params._getpairs())
+        unknown = set(strategy_params) - set(defaults)
+        if unknown:
+            raise ValueError(f"Unknown strategy parameters: {sorted(unknown)}")
+
+        p = dict(defaults, **strategy_params)
+
+        if p['use_rsi_filter'] or p['use_volume_filter']:
+            raise ValueError("RSI and volume filters are not supported by the vectorized engine")
+
+        required_cols = ['open', 'high', 'low', 'close', 'volume']
+        if candle_df.empty or any(col not in candle_df.columns for col in required_cols):
+            raise ValueError("Candle DataFrame is empty or missing OHLCV columns")
+
+        # Daily Sharpe/returns are keyed by date; one bar per date is assumed
+        if pd.DatetimeIndex(candle_df.index).normalize().has_duplicates:
+            raise ValueError("Candle DataFrame has several bars per date")
+
+        return p
+
+    @staticmethod
+    def _bands(candle_df: pd.DataFrame, p: Dict):
+        """Lower, upper and middle band arrays (from band_tensor if given)."""
+        tensor = p['band_tensor']
+        if tensor is None:
+            tensor = compute_band_tensor(
+                candle_df,
+                [p['mean_lookback']],
+                [p['stddev_lookback']],
+                [p['entry_threshold']],
+                mean_type=p['mean_type']
+            )
+        else:
+            tensor.check_mean_type(p['mean_type'])
+            if tensor.lower.shape[-1] != len(candle_df):
+                raise ValueError(
+                    f"Band tensor has {tensor.lower.shape[-1]} bars, data has {len(candle_df)}"
+                )
+
+        return tensor.bands(p['mean_lookback'], p['stddev_lookback'], p['entry_threshold'])
+
+    @staticmethod
+    def _order_size(p: Dict, price: float, atr, bar: int) -> int:
+        """Order size MeanReversionStrategy._calculate_position_size returns."""
+        price = float(price)
+        sizing = p['position_sizing']
+
+        if sizing == 'fixed':
+            if price > 0:
+                return int(p['position_size'] / price)
+            return 0
+
+        elif sizing == 'volatility_adjusted':
+            if atr is not None:
+                atr_pct = (float(atr[bar]) / price) * 100
+                adjusted_size = p['position_size'] / (1 + atr_pct/10)
+                return int(adjusted_size / price)
+            return int(p['position_size'] / price)
+
+        elif sizing == 'kelly':
+            return int(p['position_size'] / price)
+
+        return 0
+
+    @staticmethod
+    def _exit_bar(p: Dict, closes, exit_bars, signal: int, fill: int, entry_price: float):
+        """First bar from the entry fill on whose close triggers the exit."""
+        exit_type = p['exit_type']
+
+        if exit_bars is not None:
+            k = np.searchsorted(exit_bars, fill)
+            return int(exit_bars[k]) if k < len(exit_bars) else None
+
+        elif exit_type == 'profit_target':
+            if not (entry_price and p['exit_threshold']):
+                return None
+            profit_pct = ((closes[fill:] - entry_price) / entry_price) * 100
+            hits = np.flatnonzero(profit_pct >= p['exit_threshold'])
+            return fill + int(hits[0]) if len(hits) else None
+
+        elif exit_type == 'time_based':
+            if not p['exit_time_days']:
+                return None
+            # bars_in_trade counts bars since the signal bar
+            return signal + max(int(math.ceil(p['exit_time_days'])), 1)
+
+        return None
+
+    def _comm(self, size: int, price: float) -> float:
+        """Percentage commission (CommInfoBase COMM_PERC)."""
+        return abs(size) * self.commission * price
+
+    def _values(self, closes: np.ndarray, steps) -> np.ndarray:
+        """Broker value at every bar's close from the fills."""
+        return broker_values(self.initial_capital, closes, steps)
+
+
+def _sharpe_ratio(values: np.ndarray, initial_capital: float) -> Optional[float]:
+    """SharpeRatio analyzer (daily, fund mode, annualized, riskfree 2%)."""
+    fund_shares = initial_capital / FUND_START_VALUE
+    fund_values = [FUND_START_VALUE] + (values / fund_shares).tolist()
+    returns = [fund_values[i] / fund_values[i - 1] - 1.0 for i in range(1, len(fund_values))]
+
+    rate = pow(1.0 + RISK_FREE_RATE, 1.0 / TRADING_DAYS) - 1.0
+    ret_free = [r - rate for r in returns]
+    ret_free_avg = math.fsum(ret_free) / len(ret_free)
+    retdev = math.sqrt(
+        math.fsum([pow(r - ret_free_avg, 2.0) for r in ret_free]) / len(ret_free)
+    )
+
+    try:
+        return math.sqrt(TRADING_DAYS) * (ret_free_avg / retdev)
+    except ZeroDivisionError:
+        return None
+
+
+def _rnorm100(values: np.ndarray, initial_capital: float) -> float:
+    """Returns analyzer rnorm100 (annualized normalized return, percent)."""
+    value_ratio = float(values[-1]) / initial_capital
+    rtot = math.log(value_ratio) if value_ratio >= 0.0 else float('-inf')
+    ravg = rtot / len(values)
+    rnorm = math.expm1(ravg * TRADING_DAYS) if ravg > float('-inf') else ravg
+    return rnorm * 100.0
+
+
+def run_vectorized_backtest(
+    candle_df: pd.DataFrame,
+    strategy_params: Dict,
+    initial_capital: float = 100000,
+    commission: float = 0.001
+) -> EngineResult:
+    """
+    Convenience function to run one vectorized backtest.
+
+    Args:
+        candle_df: DataFrame with candle data (date index, OHLCV columns)
+        strategy_params: MeanReversionStrategy parameters
+        initial_capital: Starting capital
+        commission: Commission rate (0.001 = 0.1%)
+
+    Returns:
+        EngineResult
+    """
+    return VectorizedMeanReversion(initial_capital, commission).run(candle_df, strategy_params)
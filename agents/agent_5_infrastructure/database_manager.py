@@ -3,6 +3,7 @@ Database Manager for Mean Reversion Framework
 Supports connection to AWS RDS PostgreSQL via MCP (Model Context Protocol)
 """
 
+import io
 import os
 import json
 from typing import List, Dict, Optional, Any, Tuple
@@ -26,6 +27,37 @@ except ImportError:
     logging.warning("psycopg2 not installed - database features will be limited")
 
 
+class Transaction:
+    """
+    Single-cursor stand-in for DatabaseManager inside DatabaseManager.transaction().
+    """
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def execute_query(
+        self,
+        query: str,
+        params: Optional[Tuple] = None,
+        fetch: bool = True
+    ) -> Optional[List[Tuple]]:
+        """
+        Execute a SQL query in the transaction.
+
+        Args:
+            query: SQL query string
+            params: Query parameters
+            fetch: Whether to fetch results
+
+        Returns:
+            Query results if fetch=True, None otherwise
+        """
+        self.cursor.execute(query, params)
+        if fetch:
+            return self.cursor.fetchall()
+        return None
+
+
 class DatabaseManager:
     """
     Database manager for the mean reversion framework.
@@ -96,6 +128,25 @@ class DatabaseManager:
             self.logger.error(f"Failed to create connection pool: {e}")
             raise
 
+    def connection_kwargs(self) -> Dict[str, Any]:
+        """
+        Get the settings needed to open an equivalent connection elsewhere.
+
+        Used by worker processes, which must open their own pool rather than
+        share sockets inherited from the parent.
+
+        Returns:
+            Keyword arguments for DatabaseManager()
+        """
+        return {
+            'host': self.host,
+            'port': self.port,
+            'database': self.database,
+            'user': self.user,
+            'password': self.password,
+            'use_mcp': self.use_mcp
+        }
+
     @contextmanager
     def get_connection(self):
         """Context manager for database connections"""
@@ -126,6 +177,18 @@ class DatabaseManager:
             finally:
                 cursor.close()
 
+    @contextmanager
+    def transaction(self):
+        """
+        Context manager running several queries in one transaction.
+
+        Yields a Transaction whose execute_query() matches this class's, so
+        code written against a DatabaseManager (e.g. result writers) can run
+        inside it unchanged. Commits on exit, rolls back on error.
+        """
+        with self.get_cursor() as cursor:
+            yield Transaction(cursor)
+
     def execute_query(
         self,
         query: str,
@@ -164,6 +227,63 @@ class DatabaseManager:
             execute_values(cursor, query, data)
             return cursor.rowcount
 
+    def copy_upsert(
+        self,
+        df: pd.DataFrame,
+        table: str,
+        columns: List[str],
+        conflict_columns: List[str]
+    ) -> int:
+        """
+        Bulk upsert a DataFrame via COPY into a staging table.
+
+        Rows are streamed as CSV into a temporary table shaped like the target
+        (dropped at commit), then merged with a single INSERT ... ON CONFLICT
+        that updates every non-key column. Everything runs in one transaction.
+
+        Values must already match the target column types (e.g. integers
+        for BIGINT columns); NaN/None are written as NULL.
+
+        Args:
+            df: DataFrame containing at least the given columns
+            table: Target table name
+            columns: Columns to write
+            conflict_columns: Unique key columns for ON CONFLICT
+
+        Returns:
+            Number of rows inserted or updated
+        """
+        if df.empty:
+            return 0
+
+        buffer = io.StringIO()
+        df[columns].to_csv(buffer, index=False, header=False)
+        buffer.seek(0)
+
+        staging = f"{table}_staging"
+        column_list = ', '.join(columns)
+        updates = ',\n                '.join(
+            f"{column} = EXCLUDED.{column}"
+            for column in columns if column not in conflict_columns
+        )
+
+        with self.get_cursor() as cursor:
+            cursor.execute(f"""
+                CREATE TEMP TABLE {staging} ON COMMIT DROP AS
+                SELECT {column_list} FROM {table} WITH NO DATA
+            """)
+            cursor.copy_expert(
+                f"COPY {staging} ({column_list}) FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+            cursor.execute(f"""
+                INSERT INTO {table} ({column_list})
+                SELECT {column_list} FROM {staging}
+                ON CONFLICT ({', '.join(conflict_columns)}) DO UPDATE SET
+                {updates}
+            """)
+            return cursor.rowcount
+
     # ========================================================================
     # STOCK DATA OPERATIONS
     # ========================================================================
@@ -234,30 +354,13 @@ class DatabaseManager:
 
         df['symbol'] = symbol
 
-        # Convert to list of tuples
         columns = ['symbol', 'date', 'open', 'high', 'low', 'close', 'volume']
         if 'adjusted_close' in df.columns:
             columns.append('adjusted_close')
 
-        data = [tuple(row) for row in df[columns].values]
+        df['volume'] = _to_bigint(df['volume'])
 
-        # Build insert query
-        placeholders = ','.join(['%s'] * len(columns))
-        query = f"""
-            INSERT INTO stock_data ({','.join(columns)})
-            VALUES %s
-            ON CONFLICT (symbol, date) DO UPDATE SET
-                open = EXCLUDED.open,
-                high = EXCLUDED.high,
-                low = EXCLUDED.low,
-                close = EXCLUDED.close,
-                volume = EXCLUDED.volume
-        """
-
-        if 'adjusted_close' in columns:
-            query += ", adjusted_close = EXCLUDED.adjusted_close"
-
-        return self.execute_many(query, data)
+        return self.copy_upsert(df, 'stock_data', columns, ['symbol', 'date'])
 
     def get_available_symbols(self) -> List[str]:
         """Get list of all symbols in database"""
@@ -350,21 +453,15 @@ class DatabaseManager:
         columns = ['symbol', 'date', 'candle_type', 'aggregation_days',
                    'open', 'high', 'low', 'close', 'volume']
 
-        data = [tuple(row) for row in df[columns].values]
+        # Aggregated volumes are float sums
+        df['volume'] = _to_bigint(df['volume'])
 
-        query = """
-            INSERT INTO candles (symbol, date, candle_type, aggregation_days,
-                                 open, high, low, close, volume)
-            VALUES %s
-            ON CONFLICT (symbol, date, candle_type, aggregation_days) DO UPDATE SET
-                open = EXCLUDED.open,
-                high = EXCLUDED.high,
-                low = EXCLUDED.low,
-                close = EXCLUDED.close,
-                volume = EXCLUDED.volume
-        """
-
-        return self.execute_many(query, data)
+        return self.copy_upsert(
+            df,
+            'candles',
+            columns,
+            ['symbol', 'date', 'candle_type', 'aggregation_days']
+        )
 
     # ========================================================================
     # STRATEGY CONFIGURATION OPERATIONS
@@ -514,6 +611,11 @@ class DatabaseManager:
             self.logger.info("Database connections closed")
 
 
+def _to_bigint(values: pd.Series) -> pd.Series:
+    """Round a numeric Series to nullable integers for BIGINT columns."""
+    return pd.to_numeric(values, errors='coerce').round().astype('Int64')
+
+
 # Convenience function to get database instance
 def get_db() -> DatabaseManager:
     """Get database manager instance with environment configuration"""
@@ -0,0 +1,179 @@
+"""
+Memory-Bounded LRU Cache
+In-process cache for DataFrames and arrays with a byte budget instead of an entry count
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_nbytes(value: Any) -> int:
+    """
+    Estimate the memory held by a cached value.
+
+    Args:
+        value: DataFrame, Series, ndarray, or any object exposing nbytes
+            (tuples/lists/dicts are summed over their items)
+
+    Returns:
+        Approximate size in bytes
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(value, pd.DataFrame) else usage)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if hasattr(value, 'nbytes'):
+        return int(value.nbytes)
+    if isinstance(value, (tuple, list)):
+        return sum(estimate_nbytes(item) for item in value)
+    if isinstance(value, dict):
+        return sum(estimate_nbytes(item) for item in value.values())
+    return sys.getsizeof(value)
+
+
+class MemoryBoundedLRU:
+    """
+    Least-recently-used cache bounded by total memory.
+
+    Entries are evicted oldest-first once the summed size of cached values
+    exceeds max_bytes. A single value larger than the budget is returned to
+    the caller but not cached. Access is thread-safe.
+    """
+
+    def __init__(self, max_bytes: int = 512 * 1024 * 1024):
+        """
+        Initialize cache.
+
+        Args:
+            max_bytes: Memory budget for cached values (default: 512 MB)
+        """
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be > 0")
+
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a cached value and mark it most recently used.
+
+        Args:
+            key: Cache key
+            default: Returned when the key is not cached
+
+        Returns:
+            Cached value or default
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any) -> Any:
+        """
+        Cache a value, evicting least recently used entries to fit the budget.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+
+        Returns:
+            The value (for chaining)
+        """
+        size = estimate_nbytes(value)
+
+        with self._lock:
+            self._discard(key)
+
+            if size > self.max_bytes:
+                logger.debug(f"Not caching {key}: {size} bytes exceeds budget")
+                return value
+
+            self._entries[key] = (value, size)
+            self.nbytes += size
+
+            while self.nbytes > self.max_bytes:
+                evicted, (_, evicted_size) = self._entries.popitem(last=False)
+                self.nbytes -= evicted_size
+                logger.debug(f"Evicted {evicted} ({evicted_size} bytes)")
+
+        return value
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Get a cached value, computing and caching it on a miss.
+
+        Args:
+            key: Cache key
+            compute: Zero-argument function producing the value
+
+        Returns:
+            Cached or freshly computed value
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        return self.put(key, compute())
+
+    def invalidate(self, predicate: Optional[Callable[[Hashable], bool]] = None):
+        """
+        Remove entries from the cache.
+
+        Args:
+            predicate: Remove only keys for which predicate(key) is True
+                (None = clear everything)
+        """
+        with self._lock:
+            for key in list(self._entries):
+                if predicate is None or predicate(key):
+                    self._discard(key)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with entries, nbytes, max_bytes, hits and misses
+        """
+        return {
+            'entries': len(self._entries),
+            'nbytes': self.nbytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+    def _discard(self, key: Hashable):
+        """Remove one entry if present (caller holds the lock)."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.nbytes -= entry[1]
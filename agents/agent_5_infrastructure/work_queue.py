@@ -0,0 +1,464 @@
+"""
+Work Queue
+PostgreSQL-backed queue of (phase, symbol, parameter chunk) items for running a phase across nodes
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+import logging
+
+from agents.agent_5_infrastructure.database_manager import DatabaseManager
+from agents.agent_5_infrastructure.worker_pool import resolve_n_jobs
+
+logger = logging.getLogger(__name__)
+
+
+class WorkItem(NamedTuple):
+    """
+    One claimed row of the work_queue table.
+
+    Fields:
+        id: Row id
+        symbol: Stock symbol
+        chunk_index: Position of the chunk in the symbol's parameter grid
+        params: Parameter combinations of the chunk
+        attempts: Claims so far, including this one
+    """
+    id: int
+    symbol: str
+    chunk_index: int
+    params: List[Dict[str, Any]]
+    attempts: int
+
+
+class WorkQueue:
+    """
+    Work items of one phase run, shared by workers on any number of nodes.
+
+    Items are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so concurrent
+    workers never block on or double-claim a row. A claim is a lease: the
+    worker's heartbeat keeps extending it, and once it expires (the worker
+    died or stalled) the item can be claimed again, up to max_attempts
+    claims. All times come from the database clock, so node clocks do not
+    need to agree.
+    """
+
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        run_name: str,
+        phase: int,
+        lease_seconds: int = 600,
+        max_attempts: int = 3
+    ):
+        """
+        Initialize queue for one phase run.
+
+        Args:
+            db_manager: DatabaseManager instance
+            run_name: Name grouping the items of the run (e.g. the config name)
+            phase: Phase number
+            lease_seconds: How long a claim lasts without a heartbeat
+            max_attempts: Claims per item before it is marked failed
+        """
+        self.db_manager = db_manager
+        self.run_name = run_name
+        self.phase = phase
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+    def enqueue(
+        self,
+        symbols: List[str],
+        param_combinations: List[Dict[str, Any]],
+        chunk_size: Optional[int] = None
+    ) -> int:
+        """
+        Add one item per (symbol, parameter chunk).
+
+        Items already in the queue (same run, phase, symbol and chunk) are
+        left untouched, so enqueueing an interrupted run again only adds
+        what is missing.
+
+        Args:
+            symbols: Symbols to test
+            param_combinations: Parameter grid, split into chunks per symbol
+            chunk_size: Combinations per item (None = whole grid per item)
+
+        Returns:
+            Number of items offered to the queue
+        """
+        chunk_size = chunk_size or max(len(param_combinations), 1)
+        chunks = [
+            param_combinations[i:i + chunk_size]
+            for i in range(0, len(param_combinations), chunk_size)
+        ]
+
+        rows = [
+            (self.run_name, self.phase, symbol, chunk_index, json.dumps(chunk))
+            for symbol in symbols
+            for chunk_index, chunk in enumerate(chunks)
+        ]
+        if not rows:
+            return 0
+
+        self.db_manager.execute_many(
+            """
+            INSERT INTO work_queue (run_name, phase, symbol, chunk_index, params)
+            VALUES %s
+            ON CONFLICT (run_name, phase, symbol, chunk_index) DO NOTHING
+            """,
+            rows
+        )
+        return len(rows)
+
+    def claim(self, worker_id: str) -> Optional[WorkItem]:
+        """
+        Claim the next pending item, or a running one whose lease expired.
+
+        Args:
+            worker_id: Identifier of the claiming worker
+
+        Returns:
+            WorkItem, or None when nothing can be claimed right now
+        """
+        # Expired items out of attempts are given up rather than retried
+        self.db_manager.execute_query(
+            """
+            UPDATE work_queue
+            SET status = 'failed', worker_id = NULL, lease_expires_at = NULL,
+                error_log = 'Lease expired after ' || attempts || ' attempts'
+            WHERE run_name = %s AND phase = %s
+              AND status = 'running' AND lease_expires_at < NOW()
+              AND attempts >= %s
+            """,
+            (self.run_name, self.phase, self.max_attempts),
+            fetch=False
+        )
+
+        rows = self.db_manager.execute_query(
+            """
+            UPDATE work_queue
+            SET status = 'running', worker_id = %s, attempts = attempts + 1,
+                started_at = NOW(), heartbeat_at = NOW(),
+                lease_expires_at = NOW() + %s * INTERVAL '1 second'
+            WHERE id = (
+                SELECT id FROM work_queue
+                WHERE run_name = %s AND phase = %s
+                  AND (status = 'pending'
+                       OR (status = 'running' AND lease_expires_at < NOW()))
+                  AND attempts < %s
+                ORDER BY id
+                LIMIT 1
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING id, symbol, chunk_index, params, attempts
+            """,
+            (worker_id, self.lease_seconds, self.run_name, self.phase, self.max_attempts)
+        )
+        if not rows:
+            return None
+        return WorkItem(*rows[0])
+
+    def heartbeat(self, item_id: int, worker_id: str) -> bool:
+        """
+        Extend the lease on a claimed item.
+
+        Args:
+            item_id: Claimed item id
+            worker_id: Identifier of the claiming worker
+
+        Returns:
+            False when the item is no longer held by this worker
+        """
+        rows = self.db_manager.execute_query(
+            """
+            UPDATE work_queue
+            SET heartbeat_at = NOW(), lease_expires_at = NOW() + %s * INTERVAL '1 second'
+            WHERE id = %s AND worker_id = %s AND status = 'running'
+            RETURNING id
+            """,
+            (self.lease_seconds, item_id, worker_id)
+        )
+        return bool(rows)
+
+    def complete(
+        self,
+        item: WorkItem,
+        worker_id: str,
+        write: Optional[Callable[[Any], Any]] = None
+    ) -> bool:
+        """
+        Write an item's results and mark it completed in one transaction.
+
+        The row is locked first; if another worker has reclaimed the item
+        in the meantime, nothing is written, so every item's results are
+        saved exactly once.
+
+        Args:
+            item: Claimed item
+            worker_id: Identifier of the claiming worker
+            write: Optional callable taking the transaction (which has the
+                execute_query() of a DatabaseManager) and saving the results
+
+        Returns:
+            False when the item was no longer held by this worker
+        """
+        with self.db_manager.transaction() as tx:
+            held = tx.execute_query(
+                """
+                SELECT id FROM work_queue
+                WHERE id = %s AND worker_id = %s AND status = 'running'
+                FOR UPDATE
+                """,
+                (item.id, worker_id)
+            )
+            if not held:
+                return False
+
+            if write is not None:
+                write(tx)
+
+            tx.execute_query(
+                """
+                UPDATE work_queue
+                SET status = 'completed', completed_at = NOW(),
+                    lease_expires_at = NULL, error_log = NULL
+                WHERE id = %s
+                """,
+                (item.id,),
+                fetch=False
+            )
+        return True
+
+    def fail(self, item: WorkItem, worker_id: str, error: str):
+        """
+        Release a failed item for another attempt, or mark it failed.
+
+        Args:
+            item: Claimed item
+            worker_id: Identifier of the claiming worker
+            error: Error message to record
+        """
+        self.db_manager.execute_query(
+            """
+            UPDATE work_queue
+            SET status = CASE WHEN attempts >= %s THEN 'failed' ELSE 'pending' END,
+                worker_id = NULL, lease_expires_at = NULL, error_log = %s
+            WHERE id = %s AND worker_id = %s AND status = 'running'
+            """,
+            (self.max_attempts, error, item.id, worker_id),
+            fetch=False
+        )
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Count the run's items by status.
+
+        Returns:
+            Dictionary mapping status -> number of items
+        """
+        rows = self.db_manager.execute_query(
+            """
+            SELECT status, COUNT(*)
+            FROM work_queue
+            WHERE run_name = %s AND phase = %s
+            GROUP BY status
+            """,
+            (self.run_name, self.phase)
+        )
+        return {status: count for status, count in rows}
+
+    def remaining(self) -> int:
+        """Number of items still pending or running."""
+        counts = self.counts()
+        return counts.get('pending', 0) + counts.get('running', 0)
+
+
+def default_worker_id() -> str:
+    """Worker identifier '<hostname>:<pid>'."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+@contextmanager
+def _heartbeat(queue: WorkQueue, item: WorkItem, worker_id: str, interval: float):
+    """Extend an item's lease from a background thread while the body runs."""
+    stop = threading.Event()
+
+    def beat():
+        while not stop.wait(interval):
+            try:
+                if not queue.heartbeat(item.id, worker_id):
+                    logger.warning(f"Lost lease on {item.symbol} chunk {item.chunk_index}")
+                    return
+            except Exception as e:
+                logger.warning(f"Heartbeat failed for {item.symbol} chunk {item.chunk_index}: {e}")
+
+    thread = threading.Thread(target=beat, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run_worker(
+    queue: WorkQueue,
+    handler: Callable[[DatabaseManager, WorkItem], Any],
+    writer: Callable[[Any, Any], Any],
+    worker_id: Optional[str] = None,
+    poll_interval: float = 30.0
+) -> Dict[str, int]:
+    """
+    Claim and process items until the run has none left.
+
+    handler(db, item) runs the item's backtests and returns its results;
+    writer(tx, results) saves them inside the transaction that marks the
+    item completed. When nothing is claimable but items are still running
+    elsewhere, the worker polls, so it picks up items whose lease expires.
+
+    The heartbeat runs on its own single-connection pool, since the
+    queue's pool is in use by the handler and is not thread-safe.
+
+    Args:
+        queue: Work queue of the run
+        handler: Job taking (db_manager, item)
+        writer: Result writer taking (transaction, results)
+        worker_id: Worker identifier (default '<hostname>:<pid>')
+        poll_interval: Seconds between claims while other workers hold
+            the remaining items
+
+    Returns:
+        Dictionary with counts of 'completed', 'failed' and 'lost' items
+    """
+    worker_id = worker_id or default_worker_id()
+    stats = {'completed': 0, 'failed': 0, 'lost': 0}
+
+    heartbeat_db = DatabaseManager(
+        min_connections=1, max_connections=1, **queue.db_manager.connection_kwargs()
+    )
+    heartbeat_queue = WorkQueue(
+        heartbeat_db, queue.run_name, queue.phase, queue.lease_seconds, queue.max_attempts
+    )
+
+    try:
+        while True:
+            item = queue.claim(worker_id)
+            if item is None:
+                if queue.remaining() == 0:
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            logger.info(
+                f"[{worker_id}] Claimed {item.symbol} chunk {item.chunk_index} "
+                f"({len(item.params)} combinations, attempt {item.attempts})"
+            )
+
+            try:
+                with _heartbeat(heartbeat_queue, item, worker_id, queue.lease_seconds / 3):
+                    results = handler(queue.db_manager, item)
+
+                if queue.complete(item, worker_id, lambda tx: writer(tx, results)):
+                    stats['completed'] += 1
+                else:
+                    logger.warning(
+                        f"[{worker_id}] {item.symbol} chunk {item.chunk_index} "
+                        f"was reclaimed by another worker; results dropped"
+                    )
+                    stats['lost'] += 1
+
+            except Exception as e:
+                logger.error(f"[{worker_id}] Error processing {item.symbol} chunk {item.chunk_index}: {e}")
+                queue.fail(item, worker_id, str(e))
+                stats['failed'] += 1
+    finally:
+        heartbeat_db.close()
+
+    return stats
+
+
+def _consume(
+    db_kwargs: Dict[str, Any],
+    run_name: str,
+    phase: int,
+    handler: Callable,
+    writer: Callable,
+    lease_seconds: int,
+    max_attempts: int,
+    poll_interval: float
+) -> Dict[str, int]:
+    """Run one worker in a pool process against its own connection pool."""
+    db = DatabaseManager(min_connections=1, max_connections=2, **db_kwargs)
+    try:
+        queue = WorkQueue(db, run_name, phase, lease_seconds, max_attempts)
+        return run_worker(queue, handler, writer, poll_interval=poll_interval)
+    finally:
+        db.close()
+
+
+def run_queue_workers(
+    db_manager: DatabaseManager,
+    run_name: str,
+    phase: int,
+    handler: Callable[[DatabaseManager, WorkItem], Any],
+    writer: Callable[[Any, Any], Any],
+    n_jobs: Optional[int] = 1,
+    lease_seconds: int = 600,
+    max_attempts: int = 3,
+    poll_interval: float = 30.0
+) -> Dict[str, int]:
+    """
+    Run n_jobs queue workers on this node until the run has no items left.
+
+    Start this on as many nodes as needed, after the run has been enqueued.
+    With a single job the worker runs in this process against db_manager;
+    otherwise each worker process opens its own connection pool. handler
+    and writer must be picklable (module-level functions or
+    functools.partial of them).
+
+    Args:
+        db_manager: Database manager (connection settings source)
+        run_name: Name of the enqueued run
+        phase: Phase number
+        handler: Job taking (db_manager, item) and returning its results
+        writer: Result writer taking (transaction, results)
+        n_jobs: Number of worker processes (-1 = all cores)
+        lease_seconds: How long a claim lasts without a heartbeat
+        max_attempts: Claims per item before it is marked failed
+        poll_interval: Seconds between claims while other workers hold
+            the remaining items
+
+    Returns:
+        Dictionary with counts of 'completed', 'failed' and 'lost' items
+        across this node's workers
+    """
+    n_jobs = resolve_n_jobs(n_jobs)
+
+    if n_jobs == 1:
+        queue = WorkQueue(db_manager, run_name, phase, lease_seconds, max_attempts)
+        return run_worker(queue, handler, writer, poll_interval=poll_interval)
+
+    logger.info(f"Starting {n_jobs} queue workers for {run_name} (phase {phase})")
+
+    stats = {'completed': 0, 'failed': 0, 'lost': 0}
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        futures = [
+            executor.submit(
+                _consume, db_manager.connection_kwargs(), run_name, phase,
+                handler, writer, lease_seconds, max_attempts, poll_interval
+            )
+            for _ in range(n_jobs)
+        ]
+        for future in futures:
+            for key, count in future.result().items():
+                stats[key] += count
+
+    return stats
@@ -0,0 +1,193 @@
+"""
+Worker Pool
+Process pools for per-symbol jobs: database-backed workers and batched backtests on preloaded candles
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import logging
+from tqdm import tqdm
+
+from agents.agent_5_infrastructure.database_manager import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+# Database manager owned by the current worker process
+_worker_db: Optional[DatabaseManager] = None
+
+
+def _init_worker(db_kwargs: Dict[str, Any]):
+    """Open a connection pool in the worker process (runs after fork)."""
+    global _worker_db
+    _worker_db = DatabaseManager(min_connections=1, max_connections=2, **db_kwargs)
+
+
+def _run_task(func: Callable, item: Any) -> Tuple[Any, Any, Optional[str]]:
+    """Run one job against the worker's database, capturing any error."""
+    try:
+        return item, func(_worker_db, item), None
+    except Exception as e:
+        return item, None, str(e)
+
+
+def _run_batch(func: Callable, batch: Dict[str, Any]) -> List[Tuple[str, Any, Optional[str]]]:
+    """Run one job per symbol of a batch, capturing errors per symbol."""
+    outcomes = []
+    for symbol, candle_df in batch.items():
+        try:
+            outcomes.append((symbol, func(symbol, candle_df), None))
+        except Exception as e:
+            outcomes.append((symbol, None, str(e)))
+    return outcomes
+
+
+def resolve_n_jobs(n_jobs: Optional[int]) -> int:
+    """
+    Resolve a worker count (None or 1 = serial, -1 = all cores).
+
+    Args:
+        n_jobs: Requested number of worker processes
+
+    Returns:
+        Number of worker processes to use (>= 1)
+    """
+    if n_jobs is None or n_jobs == 0:
+        return 1
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return n_jobs
+
+
+def map_with_db_workers(
+    func: Callable[[DatabaseManager, Any], Any],
+    items: Iterable[Any],
+    db_manager: DatabaseManager,
+    n_jobs: Optional[int] = 1,
+    desc: Optional[str] = None
+) -> Iterator[Tuple[Any, Any, Optional[str]]]:
+    """
+    Run func(db, item) for every item, sharded across worker processes.
+
+    Each worker opens its own connection pool with the same settings as
+    db_manager; connections are never shared across processes. With a single
+    job, items run in this process against db_manager. Exceptions are caught
+    per item and reported back to the caller instead of being raised, so the
+    caller can log them exactly as in the serial loop.
+
+    func must be picklable (a module-level function or functools.partial of
+    one) and should return small results (counts, not DataFrames).
+
+    Args:
+        func: Job taking (db_manager, item)
+        items: Items to process (e.g. symbols)
+        db_manager: Parent database manager (connection settings source)
+        n_jobs: Number of worker processes (-1 = all cores)
+        desc: Progress bar description
+
+    Yields:
+        Tuples of (item, result, error) in completion order, where error is
+        None on success and the exception message on failure
+    """
+    items = list(items)
+    n_jobs = min(resolve_n_jobs(n_jobs), max(len(items), 1))
+
+    if n_jobs == 1:
+        for item in tqdm(items, desc=desc):
+            try:
+                yield item, func(db_manager, item), None
+            except Exception as e:
+                yield item, None, str(e)
+        return
+
+    logger.info(f"Processing {len(items)} items with {n_jobs} worker processes")
+
+    with ProcessPoolExecutor(
+        max_workers=n_jobs,
+        initializer=_init_worker,
+        initargs=(db_manager.connection_kwargs(),)
+    ) as executor:
+        futures = [executor.submit(_run_task, func, item) for item in items]
+
+        for future in tqdm(as_completed(futures), total=len(futures), desc=desc):
+            yield future.result()
+
+
+def execution_settings(execution: Dict[str, Any], n_jobs: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Read worker settings from a phase config's execution section.
+
+    Args:
+        execution: The config's execution dictionary (parallel, n_jobs, batch_size)
+        n_jobs: Override for the configured worker count (e.g. from the command line)
+
+    Returns:
+        Tuple of (n_jobs, batch_size); n_jobs is 1 when parallel is off
+    """
+    if n_jobs is None:
+        n_jobs = execution.get('n_jobs', -1) if execution.get('parallel', False) else 1
+    return resolve_n_jobs(n_jobs), max(1, int(execution.get('batch_size') or 1))
+
+
+def map_symbol_batches(
+    func: Callable[[str, Any], Any],
+    candles: Dict[str, Any],
+    n_jobs: Optional[int] = 1,
+    batch_size: int = 1,
+    desc: Optional[str] = None
+) -> Iterator[Tuple[str, Any, Optional[str]]]:
+    """
+    Run func(symbol, candle_df) for every symbol, in batches across worker processes.
+
+    Symbols are sharded into batches of batch_size; each batch's candles are
+    pickled to a worker once, and the worker runs every job of the batch
+    (e.g. a symbol's whole parameter grid). Results stream back to the
+    caller as batches complete, so a single process can do all database
+    writes. Batches shrink below batch_size when there are too few symbols
+    to give every worker one. With a single job, symbols run in this
+    process. Exceptions are caught per symbol and reported back instead of
+    raised.
+
+    func must be picklable (a module-level function or functools.partial of
+    one) and should return small results (metrics, not DataFrames).
+
+    Args:
+        func: Job taking (symbol, candle_df)
+        candles: Dictionary mapping symbol -> candle DataFrame
+        n_jobs: Number of worker processes (-1 = all cores)
+        batch_size: Maximum symbols per batch sent to a worker
+        desc: Progress bar description
+
+    Yields:
+        Tuples of (symbol, result, error) in completion order, where error
+        is None on success and the exception message on failure
+    """
+    symbols = list(candles)
+    n_jobs = min(resolve_n_jobs(n_jobs), max(len(symbols), 1))
+
+    if n_jobs == 1:
+        for symbol in tqdm(symbols, desc=desc):
+            yield _run_batch(func, {symbol: candles[symbol]})[0]
+        return
+
+    # Smaller batches when there are too few symbols to keep every worker busy
+    batch_size = max(1, min(batch_size, math.ceil(len(symbols) / n_jobs)))
+    batches = [
+        {symbol: candles[symbol] for symbol in symbols[i:i + batch_size]}
+        for i in range(0, len(symbols), batch_size)
+    ]
+
+    logger.info(
+        f"Processing {len(symbols)} symbols in {len(batches)} batches "
+        f"with {n_jobs} worker processes"
+    )
+
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        futures = [executor.submit(_run_batch, func, batch) for batch in batches]
+
+        with tqdm(total=len(symbols), desc=desc) as progress:
+            for future in as_completed(futures):
+                outcomes = future.result()
+                progress.update(len(outcomes))
+                yield from outcomes
@@ -39,7 +39,7 @@ CREATE TABLE IF NOT EXISTS candles (
     id SERIAL PRIMARY KEY,
     symbol VARCHAR(10) NOT NULL,
     date DATE NOT NULL,
-    candle_type VARCHAR(20) NOT NULL,  -- 'regular', 'heiken_ashi', 'linear_regression'
+    candle_type VARCHAR(32) NOT NULL,  -- 'regular', 'heiken_ashi', 'linear_regression' (+ '_epoch')
     aggregation_days INT NOT NULL,     -- 1, 2, 3, 4, 5
     open DECIMAL(10,2),
     high DECIMAL(10,2),
@@ -51,7 +51,7 @@ CREATE TABLE IF NOT EXISTS candles (
 );
 
 COMMENT ON TABLE candles IS 'Generated candles with various types and aggregation periods';
-COMMENT ON COLUMN candles.candle_type IS 'Type: regular, heiken_ashi, or linear_regression';
+COMMENT ON COLUMN candles.candle_type IS 'Type: regular, heiken_ashi, or linear_regression (suffix _epoch = non-overlapping epoch-aligned bars)';
 COMMENT ON COLUMN candles.aggregation_days IS 'Aggregation period: 1-5 days';
 
 -- ============================================================================
@@ -268,6 +268,36 @@ CREATE TABLE IF NOT EXISTS monte_carlo_results (
 
 COMMENT ON TABLE monte_carlo_results IS 'Monte Carlo simulation results for strategy robustness';
 
+-- ============================================================================
+-- TABLE: work_queue
+-- Phase work items (phase, symbol, parameter chunk) for distributed workers
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS work_queue (
+    id BIGSERIAL PRIMARY KEY,
+    run_name VARCHAR(100) NOT NULL,     -- Groups the items of one phase run
+    phase INT NOT NULL,
+    symbol VARCHAR(10) NOT NULL,
+    chunk_index INT NOT NULL,           -- Position of the chunk in the symbol's grid
+    params JSONB NOT NULL,              -- Parameter combinations of this chunk
+
+    -- Claim state
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',  -- 'pending', 'running', 'completed', 'failed'
+    worker_id VARCHAR(100),             -- '<hostname>:<pid>' of the claiming worker
+    attempts INT NOT NULL DEFAULT 0,
+    lease_expires_at TIMESTAMP,
+    heartbeat_at TIMESTAMP,
+    started_at TIMESTAMP,
+    completed_at TIMESTAMP,
+    error_log TEXT,
+
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    UNIQUE(run_name, phase, symbol, chunk_index)
+);
+
+COMMENT ON TABLE work_queue IS 'Phase work items claimed by distributed workers under a lease';
+COMMENT ON COLUMN work_queue.lease_expires_at IS 'Running items past this time are reclaimed by other workers';
+
 -- ============================================================================
 -- INDEXES
 -- Optimized for query performance
@@ -312,6 +342,9 @@ CREATE INDEX idx_agent_logs_phase ON agent_logs(phase);
 -- Monte Carlo indexes
 CREATE INDEX idx_monte_carlo_config ON monte_carlo_results(config_id);
 
+-- Work queue indexes
+CREATE INDEX idx_work_queue_claim ON work_queue(run_name, phase, status, id);
+
 -- ============================================================================
 -- VIEWS
 -- Convenient views for common queries
@@ -0,0 +1,11 @@
+-- ============================================================================
+-- Migration 001: widen candles.candle_type for epoch-aligned candle keys
+-- ============================================================================
+-- Epoch-aligned (non-overlapping) aggregations are stored as
+-- '<candle_type>_epoch', e.g. 'linear_regression_epoch' (23 chars).
+-- ============================================================================
+
+ALTER TABLE candles ALTER COLUMN candle_type TYPE VARCHAR(32);
+
+COMMENT ON COLUMN candles.candle_type IS
+    'Type: regular, heiken_ashi, or linear_regression (suffix _epoch = non-overlapping epoch-aligned bars)';
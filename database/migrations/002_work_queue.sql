@@ -0,0 +1,36 @@
+-- ============================================================================
+-- Migration 002: work_queue for distributed phase execution
+-- ============================================================================
+-- Phase runners started with --enqueue split a run into (phase, symbol,
+-- parameter chunk) items; runners started with --worker on any node claim
+-- items with SELECT ... FOR UPDATE SKIP LOCKED and hold them under a lease
+-- that a heartbeat extends. Items whose lease expires are claimed again.
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS work_queue (
+    id BIGSERIAL PRIMARY KEY,
+    run_name VARCHAR(100) NOT NULL,     -- Groups the items of one phase run
+    phase INT NOT NULL,
+    symbol VARCHAR(10) NOT NULL,
+    chunk_index INT NOT NULL,           -- Position of the chunk in the symbol's grid
+    params JSONB NOT NULL,              -- Parameter combinations of this chunk
+
+    -- Claim state
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',  -- 'pending', 'running', 'completed', 'failed'
+    worker_id VARCHAR(100),             -- '<hostname>:<pid>' of the claiming worker
+    attempts INT NOT NULL DEFAULT 0,
+    lease_expires_at TIMESTAMP,
+    heartbeat_at TIMESTAMP,
+    started_at TIMESTAMP,
+    completed_at TIMESTAMP,
+    error_log TEXT,
+
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    UNIQUE(run_name, phase, symbol, chunk_index)
+);
+
+COMMENT ON TABLE work_queue IS 'Phase work items claimed by distributed workers under a lease';
+COMMENT ON COLUMN work_queue.lease_expires_at IS 'Running items past this time are reclaimed by other workers';
+
+CREATE INDEX IF NOT EXISTS idx_work_queue_claim ON work_queue(run_name, phase, status, id);
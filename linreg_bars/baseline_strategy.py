@@ -70,23 +70,106 @@ DATA REQUIREMENTS:
 USAGE:
 ------
     python baseline_strategy.py
+    python baseline_strategy.py --vectorized   # array engine, same trades
 
 AUTHOR: Claude Code Experiments
 DATE: November 2025
 VERSION: 2.0 (Optimized) - COPIED FOR SLOPE THRESHOLD EXPERIMENTS
 """
 
+import array
 import backtrader as bt
 import pandas as pd
 import numpy as np
 from datetime import datetime
 import os
+import sys
 import glob
+from typing import Dict, List, NamedTuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.agent_1_data_candles.heiken_ashi import heiken_ashi_open
+from agents.agent_1_data_candles.rolling_regression import (
+    fit_from_sums,
+    windowed_linear_regression
+)
+from agents.agent_3_optimization.broker_math import broker_values, executed_price
 
 # ============================================================================
 # INDICATORS
 # ============================================================================
 
+def heikin_ashi_arrays(open_, high, low, close):
+    """
+    Heikin Ashi OHLC for a whole series in one pass.
+
+    Same values as the HeikinAshi indicator: the first HA open is the
+    bar's (open + close) / 2, then HA_Open = (prev HA_Open + prev HA_Close) / 2.
+
+    Args:
+        open_, high, low, close: 1-D price arrays
+
+    Returns:
+        Tuple of (ha_open, ha_high, ha_low, ha_close) arrays
+    """
+    open_, high, low, close = (
+        np.asarray(values, dtype=float) for values in (open_, high, low, close)
+    )
+
+    ha_close = (open_ + high + low + close) / 4.0
+    if len(ha_close) == 0:
+        return ha_close, ha_close, ha_close, ha_close
+
+    ha_open = heiken_ashi_open(ha_close, (open_[0] + close[0]) / 2.0)
+    ha_high = np.maximum(np.maximum(high, ha_open), ha_close)
+    ha_low = np.minimum(np.minimum(low, ha_open), ha_close)
+
+    return ha_open, ha_high, ha_low, ha_close
+
+
+def linear_regression_candles(ha_open, ha_high, ha_low, ha_close, period=13, lookahead=-1,
+                              fits=None):
+    """
+    LR OHLC for every bar of a Heikin Ashi series in one vectorized pass.
+
+    Same values as the LinearRegressionCandles indicator (up to float
+    rounding vs np.polyfit), including its warm-up: the first
+    period + |lookahead| - 1 bars are NaN.
+
+    Args:
+        ha_open, ha_high, ha_low, ha_close: 1-D HA price arrays
+        period: LR lookback period
+        lookahead: Projection point relative to the current bar
+        fits: Precomputed windowed_linear_regression fits of the four HA
+            series for `period`, so several lookaheads share one fit
+
+    Returns:
+        Tuple of (lr_open, lr_high, lr_low, lr_close) arrays
+    """
+    warmup = period + abs(lookahead) - 1
+
+    if fits is None:
+        fits = [
+            windowed_linear_regression(values, period)
+            for values in (ha_open, ha_high, ha_low, ha_close)
+        ]
+
+    candles = []
+    for fit in fits:
+        projected = fit.project(period - 1 + lookahead)
+        projected[:warmup] = np.nan
+        candles.append(projected)
+
+    return tuple(candles)
+
+
+def _write_lines(lines, columns, start, end):
+    """Copy precomputed columns into indicator lines for bars [start, end)."""
+    for line, values in zip(lines, columns):
+        line.array[start:end] = array.array('d', values[start:end])
+
+
 class HeikinAshi(bt.Indicator):
     """Heikin Ashi Candlesticks"""
     lines = ('ha_open', 'ha_high', 'ha_low', 'ha_close')
@@ -108,6 +191,14 @@ class HeikinAshi(bt.Indicator):
                                    self.lines.ha_open[0],
                                    self.lines.ha_close[0])
 
+    def once(self, start, end):
+        # Whole series at once (runonce mode) instead of bar by bar
+        prices = [
+            line.array[:end]
+            for line in (self.data.open, self.data.high, self.data.low, self.data.close)
+        ]
+        _write_lines(self.lines, heikin_ashi_arrays(*prices), start, end)
+
 
 class LinearRegressionCandles(bt.Indicator):
     """
@@ -119,6 +210,9 @@ class LinearRegressionCandles(bt.Indicator):
        0 = current bar
       -1 = symmetric/backcast
       -3 = very smooth/backcast
+
+    In runonce mode (the Cerebro default) all four LR series are computed
+    over the full HA series in one pass (see linear_regression_candles).
     """
     lines = ('lr_open', 'lr_high', 'lr_low', 'lr_close')
     params = (('period', 13), ('lookahead', -1))
@@ -131,27 +225,26 @@ class LinearRegressionCandles(bt.Indicator):
         lookback = self.params.period
         lookahead = self.params.lookahead
 
-        # Collect HA candle data
-        ha_opens = [self.ha.ha_open[-i] for i in range(lookback-1, -1, -1)]
-        ha_highs = [self.ha.ha_high[-i] for i in range(lookback-1, -1, -1)]
-        ha_lows = [self.ha.ha_low[-i] for i in range(lookback-1, -1, -1)]
-        ha_closes = [self.ha.ha_close[-i] for i in range(lookback-1, -1, -1)]
+        # Last `lookback` HA candles per line, centred on the current bar
+        windows = np.array([line.get(size=lookback) for line in self.ha.lines])
+        offset = windows[:, -1]
+        y = windows - offset[:, np.newaxis]
+        x = np.arange(lookback, dtype=float)
 
-        # Linear regression
-        x = np.arange(lookback)
-
-        open_lr = np.polyfit(x, ha_opens, 1)
-        high_lr = np.polyfit(x, ha_highs, 1)
-        low_lr = np.polyfit(x, ha_lows, 1)
-        close_lr = np.polyfit(x, ha_closes, 1)
+        # Linear regression of all four lines at once
+        fit = fit_from_sums(y.sum(axis=1), y @ x, (y * y).sum(axis=1), lookback, offset)
 
         # Project to target bar
         target_x = lookback - 1 + lookahead
+        for line, value in zip(self.lines, fit.project(target_x)):
+            line[0] = float(value)
 
-        self.lines.lr_open[0] = open_lr[0] * target_x + open_lr[1]
-        self.lines.lr_high[0] = high_lr[0] * target_x + high_lr[1]
-        self.lines.lr_low[0] = low_lr[0] * target_x + low_lr[1]
-        self.lines.lr_close[0] = close_lr[0] * target_x + close_lr[1]
+    def once(self, start, end):
+        ha = [line.array[:end] for line in self.ha.lines]
+        candles = linear_regression_candles(
+            *ha, period=self.params.period, lookahead=self.params.lookahead
+        )
+        _write_lines(self.lines, candles, start, end)
 
 
 # ============================================================================
@@ -315,6 +408,299 @@ class OptimizedDualLRStrategy(bt.Strategy):
                 })
 
 
+# ============================================================================
+# ARRAY ENGINE
+# ============================================================================
+
+class DualLRResult(NamedTuple):
+    """
+    Outcome of one OptimizedDualLRStrategy configuration on one symbol.
+
+    Fields:
+        entry_lr_period: Entry LR period
+        entry_lr_lookahead: Entry LR lookahead
+        exit_lr_period: Exit LR period
+        exit_lr_lookahead: Exit LR lookahead
+        start_value: Broker value before the first bar
+        end_value: Broker value after the last bar
+        values: Broker value at the close of every bar
+        trades_list: Per-entry records, as OptimizedDualLRStrategy.trades_list
+    """
+    entry_lr_period: int
+    entry_lr_lookahead: int
+    exit_lr_period: int
+    exit_lr_lookahead: int
+    start_value: float
+    end_value: float
+    values: np.ndarray
+    trades_list: List[Dict]
+
+
+class DualLRArrayEngine:
+    """
+    Array-based replacement for running OptimizedDualLRStrategy in Cerebro.
+
+    Heikin Ashi candles are computed once per symbol and the regression fits
+    once per LR period, so a batch of (entry period, entry lookahead, exit
+    period, exit lookahead) configs only re-projects the LR candles and
+    re-runs the signal pass. Signals are evaluated for all bars at once;
+    only the bars where the position changes are visited in Python.
+
+    Reproduces the strategy under backtrader's default broker: next-bar-open
+    fills, the submit-time cash check, percentage commission and position
+    price averaging on the pyramid add. Like the strategy, exits are only
+    checked once the pyramid has been added, and a rejected buy (whose
+    order is never cleared) stops trading. trades_list matches the
+    strategy's, including exit prices taken at the close of the exit fill
+    bar and OPEN records for the position held at the end.
+    """
+
+    def __init__(self, df, symbol, starting_cash=1_000_000, commission=0.001,
+                 initial_capital=7000, pyramid_capital=5000):
+        """
+        Initialize engine for one symbol.
+
+        Args:
+            df: Bars with date, open, high, low, close columns (e.g. from
+                resample_daily_to_4days)
+            symbol: Symbol recorded in trades_list
+            starting_cash: Broker starting cash
+            commission: Commission rate (0.001 = 0.1%)
+            initial_capital: Dollars committed on the first entry
+            pyramid_capital: Dollars committed on the pyramid add
+        """
+        self.symbol = symbol
+        self.starting_cash = starting_cash
+        self.commission = commission
+        self.initial_capital = initial_capital
+        self.pyramid_capital = pyramid_capital
+
+        self.opens = df['open'].to_numpy(dtype=float)
+        self.closes = df['close'].to_numpy(dtype=float)
+        self.dates = list(pd.DatetimeIndex(df['date']).date)
+
+        self.ha = heikin_ashi_arrays(
+            self.opens,
+            df['high'].to_numpy(dtype=float),
+            df['low'].to_numpy(dtype=float),
+            self.closes
+        )
+        self._fits = {}
+        self._candles = {}
+
+    def lr_candles(self, period, lookahead):
+        """LR OHLC arrays for (period, lookahead), with fits shared across lookaheads."""
+        key = (period, lookahead)
+        if key not in self._candles:
+            if period not in self._fits:
+                self._fits[period] = [
+                    windowed_linear_regression(values, period) for values in self.ha
+                ]
+            self._candles[key] = linear_regression_candles(
+                *self.ha, period=period, lookahead=lookahead, fits=self._fits[period]
+            )
+        return self._candles[key]
+
+    def run(self, entry_lr_period=13, entry_lr_lookahead=0,
+            exit_lr_period=21, exit_lr_lookahead=-3):
+        """
+        Run one configuration.
+
+        Args:
+            entry_lr_period: Entry LR period
+            entry_lr_lookahead: Entry LR lookahead
+            exit_lr_period: Exit LR period
+            exit_lr_lookahead: Exit LR lookahead
+
+        Returns:
+            DualLRResult
+        """
+        opens = self.opens
+        closes = self.closes
+        n = len(closes)
+
+        entry_open, entry_high, _, entry_close = self.lr_candles(entry_lr_period, entry_lr_lookahead)
+        exit_open, _, exit_low, exit_close = self.lr_candles(exit_lr_period, exit_lr_lookahead)
+
+        # First bar on which the strategy's next() runs (both LR warm-ups done)
+        first = max(
+            entry_lr_period + abs(entry_lr_lookahead),
+            exit_lr_period + abs(exit_lr_lookahead)
+        ) - 1
+
+        entry_signal = np.zeros(n, dtype=bool)
+        entry_signal[first:] = (
+            (entry_close[first:] > entry_open[first:]) & (closes[first:] > entry_high[first:])
+        )
+        exit_signal = np.zeros(n, dtype=bool)
+        exit_signal[first:] = (
+            (exit_close[first:] < exit_open[first:]) | (closes[first:] < exit_low[first:])
+        )
+
+        # Signals whose int(capital / close) order size is non-zero
+        with np.errstate(divide='ignore', invalid='ignore'):
+            entry_bars = np.flatnonzero(entry_signal & (self.initial_capital / closes >= 1.0))
+            pyramid_bars = np.flatnonzero(entry_signal & (self.pyramid_capital / closes >= 1.0))
+        exit_bars = np.flatnonzero(exit_signal)
+
+        cash = float(self.starting_cash)
+        size = 0
+        price = 0.0
+        # (fill bar, cash after fill, position size, position price)
+        steps = []
+        active_entries = []
+        trades_list = []
+
+        bar = first
+        while True:
+            signal = _next_bar(entry_bars, bar)
+            if signal is None or signal + 1 >= n:
+                break
+            add = int(self.initial_capital / closes[signal])
+            fill, cash = self._buy(cash, add, signal)
+            if fill is None:
+                break
+            size, price = self._add_entry(active_entries, steps, cash, size, price, add, fill)
+
+            # Pyramid add; exits are not checked until it has been placed
+            signal = _next_bar(pyramid_bars, fill)
+            if signal is None or signal + 1 >= n:
+                break
+            add = int(self.pyramid_capital / closes[signal])
+            fill, cash = self._buy(cash, add, signal)
+            if fill is None:
+                break
+            size, price = self._add_entry(active_entries, steps, cash, size, price, add, fill)
+
+            signal = _next_bar(exit_bars, fill)
+            if signal is None or signal + 1 >= n:
+                break
+            exit_fill = signal + 1
+            exit_price = float(opens[exit_fill])
+            pnl = size * (exit_price - price) * 1.0
+            cash = (cash + (size * price + pnl)) - self._comm(size, exit_price)
+            steps.append((exit_fill, cash, 0, 0.0))
+
+            # notify_trade records each entry at the exit fill bar's close
+            trades_list.extend(
+                self._records(active_entries, exit_fill, 'CLOSED')
+            )
+            active_entries = []
+            size, price = 0, 0.0
+
+            # Flat again from the exit fill bar on
+            bar = exit_fill
+
+        if active_entries:
+            trades_list.extend(self._records(active_entries, n - 1, 'OPEN'))
+
+        values = broker_values(self.starting_cash, closes, steps)
+
+        return DualLRResult(
+            entry_lr_period=entry_lr_period,
+            entry_lr_lookahead=entry_lr_lookahead,
+            exit_lr_period=exit_lr_period,
+            exit_lr_lookahead=exit_lr_lookahead,
+            start_value=float(self.starting_cash),
+            end_value=float(values[-1]),
+            values=values,
+            trades_list=trades_list
+        )
+
+    def run_batch(self, configs):
+        """
+        Run several configurations on this symbol.
+
+        Args:
+            configs: Iterable of (entry_lr_period, entry_lr_lookahead,
+                exit_lr_period, exit_lr_lookahead) tuples
+
+        Returns:
+            List of DualLRResult in config order
+        """
+        return [self.run(*config) for config in configs]
+
+    def _buy(self, cash, size, signal):
+        """
+        Fill a market buy created at `signal`.
+
+        Returns:
+            Tuple of (fill bar, cash after fill); fill bar is None when the
+            broker rejects the order for cash (on submission or at the fill)
+        """
+        fill = signal + 1
+        created = float(self.closes[signal])
+        if (cash - size * created) - self._comm(size, created) < 0.0:
+            return None, cash
+
+        fill_price = float(self.opens[fill])
+        cash_after = (cash - size * fill_price) - self._comm(size, fill_price)
+        if cash_after < 0.0:
+            return None, cash
+        return fill, cash_after
+
+    def _add_entry(self, active_entries, steps, cash, size, price, add, fill):
+        """Record a buy of `add` shares filled at `fill` as notify_order does; returns new size and price."""
+        fill_price = float(self.opens[fill])
+
+        # Position.update: average the price when adding to a long position
+        if size:
+            price = (price * size + add * fill_price) / (size + add)
+        else:
+            price = fill_price
+        size += add
+
+        # notify_order records order.executed.price, which can differ from
+        # the fill price in the last bit
+        executed = executed_price(add, fill_price)
+        active_entries.append({
+            'entry_price': executed,
+            'size': add,
+            'entry_date': self.dates[fill],
+            'entry_type': 'pyramid' if len(active_entries) > 0 else 'first_entry',
+            'value': executed * add
+        })
+        steps.append((fill, cash, size, price))
+        return size, price
+
+    def _records(self, active_entries, bar, status):
+        """trades_list records for every active entry, valued at `bar`'s close."""
+        exit_date = self.dates[bar]
+        exit_price = float(self.closes[bar])
+
+        records = []
+        for entry in active_entries:
+            entry_value = entry['value']
+            entry_pnl = (exit_price - entry['entry_price']) * entry['size']
+            entry_pnl_pct = (entry_pnl / entry_value) * 100 if entry_value > 0 else 0
+
+            records.append({
+                'symbol': self.symbol,
+                'entry_date': entry['entry_date'],
+                'exit_date': exit_date,
+                'entry_price': entry['entry_price'],
+                'exit_price': exit_price,
+                'size': entry['size'],
+                'pnl': entry_pnl,
+                'pnl_pct': entry_pnl_pct,
+                'value': entry_value,
+                'entry_type': entry['entry_type'],
+                'status': status,
+                'hold_days': (exit_date - entry['entry_date']).days
+            })
+        return records
+
+    def _comm(self, size, price):
+        """Percentage commission (CommInfoBase COMM_PERC)."""
+        return abs(size) * self.commission * price
+
+
+def _next_bar(bars, start):
+    """First bar in the sorted `bars` array at or after `start` (None if none)."""
+    k = np.searchsorted(bars, start)
+    return int(bars[k]) if k < len(bars) else None
+
+
 # ============================================================================
 # DATA RESAMPLING
 # ============================================================================
@@ -347,8 +733,12 @@ def resample_daily_to_4days(df_daily):
 # MAIN EXECUTION
 # ============================================================================
 
-def run_optimized_strategy():
-    """Run optimized 4-day strategy on all symbols"""
+def run_optimized_strategy(engine='backtrader'):
+    """Run optimized 4-day strategy on all symbols
+
+    engine='vectorized' runs DualLRArrayEngine instead of a Cerebro per
+    symbol; trades_list is the same.
+    """
 
     print("="*100)
     print("OPTIMIZED 4-DAY BAR STRATEGY - PRODUCTION BASELINE v2.0")
@@ -404,38 +794,48 @@ def run_optimized_strategy():
             if len(df_4day) < 50:
                 continue
 
-            # Create cerebro for this symbol
-            cerebro = bt.Cerebro()
-            cerebro.broker.setcash(STARTING_CASH)
-            cerebro.broker.setcommission(commission=0.001)
-
-            # Add data
-            data = bt.feeds.PandasData(
-                dataname=df_4day,
-                datetime='date',
-                open='open',
-                high='high',
-                low='low',
-                close='close',
-                volume='volume',
-                openinterest=-1
-            )
-            data._name = symbol
-            cerebro.adddata(data)
-
-            # Add OPTIMIZED strategy
-            cerebro.addstrategy(OptimizedDualLRStrategy,
-                                entry_lr_period=13,
-                                entry_lr_lookahead=0,      # OPTIMIZED
-                                exit_lr_period=21,         # OPTIMIZED
-                                exit_lr_lookahead=-3,      # OPTIMIZED
-                                initial_capital=INITIAL_CAPITAL,
-                                pyramid_capital=PYRAMID_CAPITAL,
-                                printlog=False)
-
-            # Run
-            results = cerebro.run()
-            strat = results[0]
+            if engine == 'vectorized':
+                strat = DualLRArrayEngine(
+                    df_4day, symbol,
+                    starting_cash=STARTING_CASH,
+                    commission=0.001,
+                    initial_capital=INITIAL_CAPITAL,
+                    pyramid_capital=PYRAMID_CAPITAL
+                ).run(entry_lr_period=13, entry_lr_lookahead=0,
+                      exit_lr_period=21, exit_lr_lookahead=-3)
+            else:
+                # Create cerebro for this symbol
+                cerebro = bt.Cerebro()
+                cerebro.broker.setcash(STARTING_CASH)
+                cerebro.broker.setcommission(commission=0.001)
+
+                # Add data
+                data = bt.feeds.PandasData(
+                    dataname=df_4day,
+                    datetime='date',
+                    open='open',
+                    high='high',
+                    low='low',
+                    close='close',
+                    volume='volume',
+                    openinterest=-1
+                )
+                data._name = symbol
+                cerebro.adddata(data)
+
+                # Add OPTIMIZED strategy
+                cerebro.addstrategy(OptimizedDualLRStrategy,
+                                    entry_lr_period=13,
+                                    entry_lr_lookahead=0,      # OPTIMIZED
+                                    exit_lr_period=21,         # OPTIMIZED
+                                    exit_lr_lookahead=-3,      # OPTIMIZED
+                                    initial_capital=INITIAL_CAPITAL,
+                                    pyramid_capital=PYRAMID_CAPITAL,
+                                    printlog=False)
+
+                # Run
+                results = cerebro.run()
+                strat = results[0]
 
             symbols_processed += 1
 
@@ -546,4 +946,6 @@ def run_optimized_strategy():
 
 
 if __name__ == '__main__':
-    trades = run_optimized_strategy()
+    trades = run_optimized_strategy(
+        engine='vectorized' if '--vectorized' in sys.argv[1:] else 'backtrader'
+    )
@@ -11,88 +11,21 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import pandas as pd
 import numpy as np
-import backtrader as bt
-from agents.agent_2_strategy_core.supertrend import Supertrend
+from agents.agent_3_optimization.supertrend_engine import DualSupertrendGrid
 import glob
 from collections import defaultdict
 import random
 
-class PandasData(bt.feeds.PandasData):
-    params = (
-        ('datetime', 'date'),
-        ('open', 'open'),
-        ('high', 'high'),
-        ('low', 'low'),
-        ('close', 'close'),
-        ('volume', 'volume'),
-        ('openinterest', None),
-    )
-
-class DualSupertrend(bt.Strategy):
-    params = (
-        ('entry_period', 10),
-        ('entry_multiplier', 2.0),
-        ('exit_period', 20),
-        ('exit_multiplier', 5.0),
-    )
-
-    def __init__(self):
-        self.entry_st = Supertrend(self.data, period=self.params.entry_period,
-                                   multiplier=self.params.entry_multiplier)
-        self.exit_st = Supertrend(self.data, period=self.params.exit_period,
-                                  multiplier=self.params.exit_multiplier)
-        self.order = None
-
-    def next(self):
-        if self.order:
-            return
-        if not self.position:
-            if self.entry_st.direction[0] == 1:
-                cash = self.broker.get_cash()
-                size = int(cash * 0.95 / self.data.close[0])
-                if size > 0:
-                    self.order = self.buy(size=size)
-        else:
-            if len(self) > 1 and self.exit_st.direction[0] == -1 and self.exit_st.direction[-1] == 1:
-                self.order = self.sell(size=self.position.size)
-
-    def notify_order(self, order):
-        if order.status in [order.Completed]:
-            self.order = None
-
-def run_strategy(df, entry_period, entry_mult, exit_period, exit_mult):
-    """Run strategy and return results"""
+def run_strategy(grid, entry_period, entry_mult, exit_period, exit_mult):
+    """Run strategy on the symbol's vectorized grid and return results"""
     try:
-        cerebro = bt.Cerebro()
-        cerebro.adddata(PandasData(dataname=df))
-        cerebro.addstrategy(DualSupertrend,
-                           entry_period=entry_period,
-                           entry_multiplier=entry_mult,
-                           exit_period=exit_period,
-                           exit_multiplier=exit_mult)
-
-        cerebro.addanalyzer(bt.analyzers.TimeReturn, _name='timereturn', timeframe=bt.TimeFrame.Years)
-
-        cerebro.broker.setcash(100000.0)
-        cerebro.broker.setcommission(commission=0.0)
-
-        start_value = cerebro.broker.getvalue()
-        results = cerebro.run()
-        end_value = cerebro.broker.getvalue()
-
-        strat = results[0]
-        time_return = strat.analyzers.timereturn.get_analysis()
+        result = grid.run(entry_period, entry_mult, exit_period, exit_mult)
 
         # Extract yearly returns
-        yearly_returns = {}
-        for date, ret in time_return.items():
-            year = date.year if hasattr(date, 'year') else date
-            yearly_returns[year] = ret * 100
-
-        total_return = ((end_value - start_value) / start_value) * 100
+        yearly_returns = {year: ret * 100 for year, ret in result.yearly_returns.items()}
 
         return {
-            'total_return': total_return,
+            'total_return': result.total_return,
             'yearly_returns': yearly_returns,
             'success': True,
         }
@@ -139,7 +72,7 @@ for csv_file in sample_files:
     symbol = extract_symbol(csv_file)
     df = load_csv(csv_file)
     if df is not None:
-        all_data[symbol] = df
+        all_data[symbol] = DualSupertrendGrid(df)
 
 print(f"Loaded {len(all_data)} valid symbols")
 print(f"\n{'='*100}")
@@ -169,8 +102,8 @@ for entry_p in entry_periods:
                 yearly_returns_all = defaultdict(list)
                 total_returns = []
 
-                for symbol, df in all_data.items():
-                    result = run_strategy(df, entry_p, entry_m, exit_p, exit_m)
+                for symbol, grid in all_data.items():
+                    result = run_strategy(grid, entry_p, entry_m, exit_p, exit_m)
                     if result['success']:
                         total_returns.append(result['total_return'])
                         for year, ret in result['yearly_returns'].items():
@@ -10,7 +10,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import pandas as pd
 import backtrader as bt
-from agents.agent_2_strategy_core.supertrend import Supertrend
+from agents.agent_3_optimization.supertrend_engine import DualSupertrendGrid
 
 class PandasData(bt.feeds.PandasData):
     params = (
@@ -23,38 +23,6 @@ class PandasData(bt.feeds.PandasData):
         ('openinterest', None),
     )
 
-class UniversalDualSupertrend(bt.Strategy):
-    params = (
-        ('entry_period', 10),
-        ('entry_multiplier', 2.0),
-        ('exit_period', 30),
-        ('exit_multiplier', 6.0),
-    )
-
-    def __init__(self):
-        self.entry_st = Supertrend(self.data, period=self.params.entry_period,
-                                   multiplier=self.params.entry_multiplier)
-        self.exit_st = Supertrend(self.data, period=self.params.exit_period,
-                                  multiplier=self.params.exit_multiplier)
-        self.order = None
-
-    def next(self):
-        if self.order:
-            return
-        if not self.position:
-            if self.entry_st.direction[0] == 1:
-                cash = self.broker.get_cash()
-                size = int(cash * 0.95 / self.data.close[0])
-                if size > 0:
-                    self.order = self.buy(size=size)
-        else:
-            if len(self) > 1 and self.exit_st.direction[0] == -1 and self.exit_st.direction[-1] == 1:
-                self.order = self.sell(size=self.position.size)
-
-    def notify_order(self, order):
-        if order.status in [order.Completed]:
-            self.order = None
-
 class BuyAndHold(bt.Strategy):
     def __init__(self):
         self.order = None
@@ -97,6 +65,18 @@ def run_strategy(df, strategy_class, **kwargs):
         'wins': won,
     }
 
+def run_dual_supertrend(grid, **kwargs):
+    """Run the dual Supertrend strategy on the symbol's vectorized grid"""
+    result = grid.run(**kwargs)
+
+    return {
+        'return': result.total_return,
+        'max_dd': result.max_drawdown,
+        'sharpe': result.sharpe_ratio if result.sharpe_ratio else 0,
+        'trades': result.total_trades,
+        'wins': result.winning_trades,
+    }
+
 # Load all symbols
 symbols = {
     'NVDA': 'data/raw/NVDA_daily.csv',
@@ -106,6 +86,7 @@ symbols = {
 }
 
 dfs = {}
+grids = {}
 bh_results = {}
 
 print("Loading data and running buy-and-hold baselines...")
@@ -114,6 +95,7 @@ for symbol, csv_file in symbols.items():
     df['date'] = pd.to_datetime(df['date'])
     df = df.sort_values('date')
     dfs[symbol] = df
+    grids[symbol] = DualSupertrendGrid(df)
 
     bh = run_strategy(df, BuyAndHold)
     bh_results[symbol] = bh
@@ -145,9 +127,8 @@ for entry_p, entry_m, exit_p, exit_m, desc in candidates:
     captures = []
 
     for symbol in symbols.keys():
-        result = run_strategy(
-            dfs[symbol],
-            UniversalDualSupertrend,
+        result = run_dual_supertrend(
+            grids[symbol],
             entry_period=entry_p,
             entry_multiplier=entry_m,
             exit_period=exit_p,
@@ -7,8 +7,8 @@ import os
 import sys
 import pandas as pd
 import logging
-from tqdm import tqdm
 from datetime import datetime
+from functools import partial
 
 # Add parent directory to path
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -16,9 +16,11 @@ parent_dir = os.path.dirname(script_dir)
 sys.path.insert(0, parent_dir)
 
 from agents.agent_5_infrastructure.database_manager import DatabaseManager
+from agents.agent_5_infrastructure.worker_pool import map_with_db_workers
 from agents.agent_1_data_candles.regular_candles import generate_regular_candles
 from agents.agent_1_data_candles.heiken_ashi import generate_heiken_ashi_candles
 from agents.agent_1_data_candles.linear_regression import generate_linear_regression_candles
+from agents.agent_1_data_candles.incremental import IncrementalCandleUpdater
 
 # Setup logging
 logging.basicConfig(
@@ -66,7 +68,7 @@ def get_stock_data(db_manager, symbol):
 
 def save_candles_to_db(db_manager, symbol, candle_type, aggregation_days, candle_df):
     """
-    Save candles to database using bulk insert for speed.
+    Save candles to database using COPY-based bulk upsert for speed.
 
     Args:
         db_manager: DatabaseManager instance
@@ -78,41 +80,18 @@ def save_candles_to_db(db_manager, symbol, candle_type, aggregation_days, candle
     if candle_df.empty:
         return 0
 
-    # Reset index to get date as column
-    df = candle_df.reset_index()
-
-    # Prepare bulk data
-    values = []
-    for _, row in df.iterrows():
-        values.append((
-            symbol,
-            candle_type,
-            aggregation_days,
-            row['date'],
-            float(row['open']),
-            float(row['high']),
-            float(row['low']),
-            float(row['close']),
-            int(row['volume']) if 'volume' in row and pd.notna(row['volume']) else 0
-        ))
-
-    # Bulk insert with ON CONFLICT
-    query = """
-        INSERT INTO candles (symbol, candle_type, aggregation_days, date, open, high, low, close, volume)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        ON CONFLICT (symbol, candle_type, aggregation_days, date) DO UPDATE
-        SET open = EXCLUDED.open,
-            high = EXCLUDED.high,
-            low = EXCLUDED.low,
-            close = EXCLUDED.close,
-            volume = EXCLUDED.volume
-    """
-
-    # Use execute_many for bulk insert
-    with db_manager.get_cursor() as cursor:
-        cursor.executemany(query, values)
+    df = candle_df.copy()
+    if 'volume' not in df.columns:
+        df['volume'] = 0
+    df['volume'] = df['volume'].fillna(0)
 
-    return len(values)
+    # Streams through COPY into a staging table, merged with ON CONFLICT
+    return db_manager.save_candles(
+        df=df,
+        symbol=symbol,
+        candle_type=candle_type,
+        aggregation_days=aggregation_days
+    )
 
 
 def generate_all_candles_for_symbol(db_manager, symbol, aggregation_days=[1, 2, 3, 4, 5]):
@@ -168,7 +147,64 @@ def generate_all_candles_for_symbol(db_manager, symbol, aggregation_days=[1, 2,
     return results
 
 
-def generate_all_candles(db_manager, symbols=None, aggregation_days=[1, 2, 3, 4, 5]):
+def update_candles_for_symbol(db_manager, symbol, aggregation_days=[1, 2, 3, 4, 5]):
+    """
+    Append only the candles newer than those already stored for a symbol.
+
+    Falls back to full generation when any candle type has nothing stored yet.
+
+    Args:
+        db_manager: DatabaseManager instance
+        symbol: Stock symbol
+        aggregation_days: List of aggregation periods
+
+    Returns:
+        Dictionary with candle counts
+    """
+    updater = IncrementalCandleUpdater(
+        db_manager,
+        aggregation_periods={
+            'regular': aggregation_days,
+            'heiken_ashi': aggregation_days,
+            'linreg': aggregation_days
+        },
+        lr_window=14
+    )
+
+    new_candles = updater.generate(symbol)
+    if new_candles is None:
+        logger.info(f"{symbol}: no stored candles to resume, generating all")
+        return generate_all_candles_for_symbol(db_manager, symbol, aggregation_days)
+
+    results = {}
+    for (candle_type, agg_days), candle_df in new_candles.items():
+        results[f'{candle_type}_{agg_days}d'] = save_candles_to_db(
+            db_manager, symbol, candle_type, agg_days, candle_df
+        )
+
+    return results
+
+
+def generate_symbol_task(db_manager, symbol, aggregation_days, incremental):
+    """
+    Generate candles for one symbol (picklable job for worker processes).
+
+    Args:
+        db_manager: DatabaseManager owned by the calling process
+        symbol: Stock symbol
+        aggregation_days: List of aggregation periods
+        incremental: Only append candles newer than those already stored
+
+    Returns:
+        Dictionary with candle counts
+    """
+    if incremental:
+        return update_candles_for_symbol(db_manager, symbol, aggregation_days)
+    return generate_all_candles_for_symbol(db_manager, symbol, aggregation_days)
+
+
+def generate_all_candles(db_manager, symbols=None, aggregation_days=[1, 2, 3, 4, 5],
+                         incremental=False, workers=1):
     """
     Generate all candle types for all symbols.
 
@@ -176,6 +212,9 @@ def generate_all_candles(db_manager, symbols=None, aggregation_days=[1, 2, 3, 4,
         db_manager: DatabaseManager instance
         symbols: List of symbols (if None, process all)
         aggregation_days: List of aggregation periods
+        incremental: Only append candles newer than those already stored
+        workers: Worker processes, each with its own connection pool
+            (1 = serial, -1 = all cores)
     """
     # Get symbols
     if symbols is None:
@@ -184,28 +223,34 @@ def generate_all_candles(db_manager, symbols=None, aggregation_days=[1, 2, 3, 4,
     logger.info(f"Generating candles for {len(symbols)} symbols")
     logger.info(f"Aggregation days: {aggregation_days}")
     logger.info(f"Candle types: Regular, Heiken Ashi, Linear Regression")
+    logger.info(f"Mode: {'incremental' if incremental else 'full'}")
+    logger.info(f"Workers: {workers}")
 
     total_candles = 0
     successful = 0
     failed = 0
 
-    # Process each symbol
-    for symbol in tqdm(symbols, desc="Generating candles"):
-        try:
-            results = generate_all_candles_for_symbol(db_manager, symbol, aggregation_days)
-
-            if results:
-                symbol_total = sum(results.values())
-                total_candles += symbol_total
-                successful += 1
-                logger.info(f"✅ {symbol}: {symbol_total} candles generated")
-            else:
-                failed += 1
-                logger.warning(f"⚠️  {symbol}: No candles generated")
-
-        except Exception as e:
-            logger.error(f"❌ {symbol}: {e}")
+    # Process each symbol (sharded across worker processes if workers > 1)
+    outcomes = map_with_db_workers(
+        partial(generate_symbol_task, aggregation_days=aggregation_days, incremental=incremental),
+        symbols,
+        db_manager,
+        n_jobs=workers,
+        desc="Generating candles"
+    )
+
+    for symbol, results, error in outcomes:
+        if error is not None:
+            logger.error(f"❌ {symbol}: {error}")
+            failed += 1
+        elif results:
+            symbol_total = sum(results.values())
+            total_candles += symbol_total
+            successful += 1
+            logger.info(f"✅ {symbol}: {symbol_total} candles generated")
+        else:
             failed += 1
+            logger.warning(f"⚠️  {symbol}: No candles generated")
 
     # Summary
     logger.info(f"\n{'='*60}")
@@ -267,6 +312,10 @@ if __name__ == '__main__':
     parser.add_argument('--aggregation', type=int, nargs='+',
                         default=[1, 2, 3, 4, 5],
                         help='Aggregation days (default: 1 2 3 4 5)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only append candles newer than those already stored')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes, one DB connection pool each (-1 = all cores)')
     parser.add_argument('--verify', action='store_true',
                         help='Verify candles after generation')
 
@@ -277,7 +326,8 @@ if __name__ == '__main__':
     db = DatabaseManager()
 
     # Generate candles
-    total = generate_all_candles(db, symbols=args.symbols, aggregation_days=args.aggregation)
+    total = generate_all_candles(db, symbols=args.symbols, aggregation_days=args.aggregation,
+                                 incremental=args.incremental, workers=args.workers)
 
     # Verify if requested
     if args.verify:
@@ -8,7 +8,7 @@ import sys
 import yaml
 import logging
 from datetime import datetime
-from tqdm import tqdm
+from functools import partial
 
 # Add parent directory to path
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -17,7 +17,9 @@ sys.path.insert(0, parent_dir)
 
 from agents.agent_5_infrastructure.database_manager import DatabaseManager
 from agents.agent_3_optimization.candle_loader import CandleLoader
+from agents.agent_1_data_candles.candle_provider import LazyCandleProvider
 from agents.agent_3_optimization.backtest_executor import BacktestExecutor
+from agents.agent_5_infrastructure.worker_pool import execution_settings, map_symbol_batches
 
 # Setup logging
 logging.basicConfig(
@@ -58,7 +60,20 @@ def get_candle_combinations(config: dict) -> list:
     return combinations
 
 
-def run_phase_1(config_path: str, limit_symbols: int = None, specific_symbols: list = None):
+def backtest_symbol(symbol: str, candle_df, executor: BacktestExecutor, strategy_params: dict,
+                    candle_type: str, agg_days: int) -> dict:
+    """Run the fixed-parameter backtest on one symbol (runs in a worker process)."""
+    return executor.run_backtest(
+        candle_df=candle_df,
+        symbol=symbol,
+        strategy_params=strategy_params,
+        candle_type=candle_type,
+        aggregation_days=agg_days
+    )
+
+
+def run_phase_1(config_path: str, limit_symbols: int = None, specific_symbols: list = None,
+                lazy_candles: bool = False, n_jobs: int = None):
     """
     Execute Phase 1 baseline testing.
 
@@ -66,6 +81,10 @@ def run_phase_1(config_path: str, limit_symbols: int = None, specific_symbols: l
         config_path: Path to phase_1_config.yaml
         limit_symbols: Optional limit on number of symbols to test
         specific_symbols: Optional list of specific symbols to test (e.g., ['NVDA', 'AAPL'])
+        lazy_candles: Compute candles on demand from stock_data instead of
+            reading the candles table
+        n_jobs: Worker processes (overrides execution.parallel / n_jobs;
+            1 = serial)
     """
     logger.info("="*60)
     logger.info("PHASE 1: Baseline Candle Type Comparison")
@@ -80,10 +99,14 @@ def run_phase_1(config_path: str, limit_symbols: int = None, specific_symbols: l
     logger.info("Connected to database")
 
     # Initialize components
-    candle_loader = CandleLoader(db)
+    provider = LazyCandleProvider(db) if lazy_candles else None
+    candle_loader = CandleLoader(db, provider=provider)
+    if lazy_candles:
+        logger.info("Computing candles on demand from stock_data")
     executor = BacktestExecutor(
         initial_capital=config['execution']['initial_capital'],
-        commission=config['execution']['commission']
+        commission=config['execution']['commission'],
+        engine=config['execution'].get('engine', 'backtrader')
     )
 
     # Get list of candle combinations
@@ -109,7 +132,8 @@ def run_phase_1(config_path: str, limit_symbols: int = None, specific_symbols: l
     completed = 0
     failed = 0
 
-    logger.info(f"\nStarting {total_backtests} backtests...\n")
+    n_jobs, batch_size = execution_settings(config['execution'], n_jobs)
+    logger.info(f"\nStarting {total_backtests} backtests ({n_jobs} workers, {batch_size} symbols per batch)...\n")
 
     # Iterate through each combination
     for candle_type, agg_days in combinations:
@@ -128,29 +152,29 @@ def run_phase_1(config_path: str, limit_symbols: int = None, specific_symbols: l
 
         logger.info(f"Loaded candles for {len(candles_dict)} symbols")
 
-        # Run backtests for each symbol
-        for symbol in tqdm(candles_dict.keys(), desc=f"{candle_type} {agg_days}d"):
-            try:
-                candle_df = candles_dict[symbol]
-
-                # Run backtest
-                result = executor.run_backtest(
-                    candle_df=candle_df,
-                    symbol=symbol,
-                    strategy_params=strategy_params,
-                    candle_type=candle_type,
-                    aggregation_days=agg_days
-                )
-
-                # Save results to database
-                if 'error' not in result:
-                    executor.save_results(result, db)
-                    completed += 1
-                else:
-                    failed += 1
-
-            except Exception as e:
-                logger.error(f"Error testing {symbol}: {e}")
+        # Run backtests sharded by symbol; results are saved from this process
+        job = partial(
+            backtest_symbol,
+            executor=executor,
+            strategy_params=strategy_params,
+            candle_type=candle_type,
+            agg_days=agg_days
+        )
+
+        for symbol, result, error in map_symbol_batches(
+            job, candles_dict, n_jobs=n_jobs, batch_size=batch_size,
+            desc=f"{candle_type} {agg_days}d"
+        ):
+            if error is not None:
+                logger.error(f"Error testing {symbol}: {error}")
+                failed += 1
+                continue
+
+            # Save results to database
+            if 'error' not in result:
+                executor.save_results(result, db)
+                completed += 1
+            else:
                 failed += 1
 
     # Summary
@@ -264,6 +288,17 @@ if __name__ == '__main__':
         default=None,
         help='Comma-separated list of specific symbols to test (e.g., NVDA,AAPL,AMD)'
     )
+    parser.add_argument(
+        '--lazy-candles',
+        action='store_true',
+        help='Compute candles on demand from stock_data instead of the candles table'
+    )
+    parser.add_argument(
+        '--n-jobs',
+        type=int,
+        default=None,
+        help='Worker processes (overrides the config; 1 = serial, -1 = all cores)'
+    )
 
     args = parser.parse_args()
 
@@ -272,4 +307,5 @@ if __name__ == '__main__':
     if args.symbols:
         symbol_list = [s.strip().upper() for s in args.symbols.split(',')]
 
-    run_phase_1(config_path=args.config, limit_symbols=args.limit, specific_symbols=symbol_list)
+    run_phase_1(config_path=args.config, limit_symbols=args.limit, specific_symbols=symbol_list,
+                lazy_candles=args.lazy_candles, n_jobs=args.n_jobs)
@@ -9,7 +9,7 @@ import yaml
 import logging
 import itertools
 from datetime import datetime
-from tqdm import tqdm
+from functools import partial
 
 # Add parent directory to path
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -18,7 +18,10 @@ sys.path.insert(0, parent_dir)
 
 from agents.agent_5_infrastructure.database_manager import DatabaseManager
 from agents.agent_3_optimization.candle_loader import CandleLoader
+from agents.agent_1_data_candles.candle_provider import LazyCandleProvider
 from agents.agent_3_optimization.backtest_executor import BacktestExecutor
+from agents.agent_5_infrastructure.worker_pool import execution_settings, map_symbol_batches
+from agents.agent_5_infrastructure.work_queue import WorkQueue, run_queue_workers
 
 # Setup logging
 logging.basicConfig(
@@ -135,7 +138,74 @@ def _generate_stop_loss_combos(types: list, values: list) -> list:
     return combos
 
 
-def run_phase_2(config_path: str, limit_stocks: int = None, limit_params: int = None):
+def backtest_symbol(symbol: str, candle_df, executor: BacktestExecutor,
+                    fixed_params: dict, param_combinations: list) -> list:
+    """
+    Run every parameter combination on one symbol (runs in a worker process).
+
+    Returns:
+        List of result dictionaries, one per combination
+    """
+    results = []
+    for param_combo in param_combinations:
+        try:
+            # Merge fixed and variable parameters
+            strategy_params = fixed_params.copy()
+            strategy_params.update(param_combo)
+
+            # Run backtest
+            results.append(executor.run_backtest(
+                candle_df=candle_df,
+                symbol=symbol,
+                strategy_params=strategy_params,
+                candle_type='regular',
+                aggregation_days=1
+            ))
+
+        except Exception as e:
+            logger.error(f"Error backtesting {symbol} with params {param_combo}: {e}")
+            results.append({'symbol': symbol, 'error': str(e)})
+
+    return results
+
+
+def process_work_item(db: DatabaseManager, item, executor: BacktestExecutor, fixed_params: dict,
+                      backtest_period: dict, lazy_candles: bool = False) -> list:
+    """
+    Run one work queue item: a parameter chunk on one symbol (queue worker mode).
+
+    Returns:
+        List of result dictionaries, one per combination
+    """
+    provider = LazyCandleProvider(db) if lazy_candles else None
+    candle_df = CandleLoader(db, provider=provider).load_candles(
+        symbol=item.symbol,
+        candle_type='regular',
+        aggregation_days=1,
+        start_date=backtest_period['start_date'],
+        end_date=backtest_period['end_date']
+    )
+    if candle_df.empty:
+        return []
+
+    return backtest_symbol(item.symbol, candle_df, executor, fixed_params, item.params)
+
+
+def save_work_item_results(db, results: list, executor: BacktestExecutor):
+    """
+    Save a work queue item's results (inside the item's completion transaction).
+
+    Raises when a result is not saved, so the transaction rolls back and the
+    item is queued again instead of being completed without its rows.
+    """
+    for result in results:
+        if 'error' not in result and not executor.save_results(result, db):
+            raise RuntimeError(f"Failed to save results for {result.get('symbol')}")
+
+
+def run_phase_2(config_path: str, limit_stocks: int = None, limit_params: int = None,
+                lazy_candles: bool = False, n_jobs: int = None, enqueue: bool = False,
+                worker: bool = False, run_name: str = None, chunk_size: int = None):
     """
     Execute Phase 2 parameter optimization.
 
@@ -143,6 +213,17 @@ def run_phase_2(config_path: str, limit_stocks: int = None, limit_params: int =
         config_path: Path to phase_2_config.yaml
         limit_stocks: Optional limit on number of stocks (for testing)
         limit_params: Optional limit on parameter combinations (for testing)
+        lazy_candles: Compute candles on demand from stock_data instead of
+            reading the candles table
+        n_jobs: Worker processes (overrides execution.parallel / n_jobs;
+            1 = serial)
+        enqueue: Only add the run's (symbol, parameter chunk) items to the
+            work queue, for --worker processes on any node to run
+        worker: Run queue items until the run has none left, instead of
+            running the grid in this process
+        run_name: Work queue run name (default: the config name)
+        chunk_size: Parameter combinations per queue item (overrides
+            execution.queue_chunk_size; default: whole grid per item)
     """
     logger.info("="*80)
     logger.info("PHASE 2: Parameter Optimization for Regular 1d Candles")
@@ -157,12 +238,53 @@ def run_phase_2(config_path: str, limit_stocks: int = None, limit_params: int =
     logger.info("Connected to database")
 
     # Initialize components
-    candle_loader = CandleLoader(db)
+    provider = LazyCandleProvider(db) if lazy_candles else None
+    candle_loader = CandleLoader(db, provider=provider)
+    if lazy_candles:
+        logger.info("Computing candles on demand from stock_data")
     executor = BacktestExecutor(
         initial_capital=config['execution']['initial_capital'],
-        commission=config['execution']['commission']
+        commission=config['execution']['commission'],
+        engine=config['execution'].get('engine', 'backtrader')
     )
 
+    # Work queue shared by every node working on this run
+    execution = config['execution']
+    queue = WorkQueue(
+        db,
+        run_name or config['name'],
+        phase=2,
+        lease_seconds=execution.get('lease_seconds', 600),
+        max_attempts=execution.get('max_attempts', 3)
+    )
+
+    if worker:
+        n_jobs, _ = execution_settings(execution, n_jobs)
+        logger.info(f"\nWorking on queue run '{queue.run_name}' with {n_jobs} workers...")
+
+        stats = run_queue_workers(
+            db, queue.run_name, queue.phase,
+            handler=partial(
+                process_work_item,
+                executor=executor,
+                fixed_params=config['fixed_parameters'],
+                backtest_period=config['backtest_period'],
+                lazy_candles=lazy_candles
+            ),
+            writer=partial(save_work_item_results, executor=executor),
+            n_jobs=n_jobs,
+            lease_seconds=queue.lease_seconds,
+            max_attempts=queue.max_attempts
+        )
+
+        logger.info(
+            f"Queue items on this node: {stats['completed']} completed, "
+            f"{stats['failed']} failed, {stats['lost']} reclaimed"
+        )
+        logger.info(f"Queue status: {queue.counts()}")
+        db.close()
+        return
+
     # Get profitable stocks from Phase 1
     logger.info("\nQuerying profitable stocks from Phase 1...")
     symbols = get_profitable_stocks(db, candle_type='regular', agg_days=1)
@@ -194,6 +316,16 @@ def run_phase_2(config_path: str, limit_stocks: int = None, limit_params: int =
     logger.info(f"  - Stocks: {len(symbols)}")
     logger.info(f"  - Parameter combinations: {len(param_combinations)}")
 
+    if enqueue:
+        offered = queue.enqueue(
+            symbols, param_combinations,
+            chunk_size=chunk_size or execution.get('queue_chunk_size')
+        )
+        logger.info(f"\nEnqueued {offered} items for queue run '{queue.run_name}'")
+        logger.info(f"Queue status: {queue.counts()}")
+        db.close()
+        return
+
     # Track results
     completed = 0
     failed = 0
@@ -210,36 +342,32 @@ def run_phase_2(config_path: str, limit_stocks: int = None, limit_params: int =
     )
     logger.info(f"Loaded candles for {len(candles_dict)} symbols")
 
-    # Run backtests
-    logger.info("\nStarting parameter grid search...\n")
-
-    for symbol in tqdm(candles_dict.keys(), desc="Stocks", position=0):
-        candle_df = candles_dict[symbol]
-
-        for param_combo in tqdm(param_combinations, desc=f"{symbol} params", position=1, leave=False):
-            try:
-                # Merge fixed and variable parameters
-                strategy_params = fixed_params.copy()
-                strategy_params.update(param_combo)
-
-                # Run backtest
-                result = executor.run_backtest(
-                    candle_df=candle_df,
-                    symbol=symbol,
-                    strategy_params=strategy_params,
-                    candle_type='regular',
-                    aggregation_days=1
-                )
-
-                # Save results to database
-                if 'error' not in result:
-                    executor.save_results(result, db)
-                    completed += 1
-                else:
-                    failed += 1
-
-            except Exception as e:
-                logger.error(f"Error backtesting {symbol} with params {param_combo}: {e}")
+    # Run backtests, sharded by symbol across worker processes; results
+    # are written to the database from this process only
+    n_jobs, batch_size = execution_settings(config['execution'], n_jobs)
+    logger.info(f"\nStarting parameter grid search ({n_jobs} workers, {batch_size} stocks per batch)...\n")
+
+    job = partial(
+        backtest_symbol,
+        executor=executor,
+        fixed_params=fixed_params,
+        param_combinations=param_combinations
+    )
+
+    for symbol, results, error in map_symbol_batches(
+        job, candles_dict, n_jobs=n_jobs, batch_size=batch_size, desc="Stocks"
+    ):
+        if error is not None:
+            logger.error(f"Error backtesting {symbol}: {error}")
+            failed += len(param_combinations)
+            continue
+
+        for result in results:
+            # Save results to database
+            if 'error' not in result:
+                executor.save_results(result, db)
+                completed += 1
+            else:
                 failed += 1
 
         # Log progress every stock
@@ -291,11 +419,50 @@ if __name__ == '__main__':
         default=None,
         help='Limit number of parameter combinations (for testing)'
     )
+    parser.add_argument(
+        '--lazy-candles',
+        action='store_true',
+        help='Compute candles on demand from stock_data instead of the candles table'
+    )
+    parser.add_argument(
+        '--n-jobs',
+        type=int,
+        default=None,
+        help='Worker processes (overrides the config; 1 = serial, -1 = all cores)'
+    )
+    parser.add_argument(
+        '--enqueue',
+        action='store_true',
+        help='Add the run to the database work queue and exit (run --worker on each node)'
+    )
+    parser.add_argument(
+        '--worker',
+        action='store_true',
+        help='Run items from the database work queue until none are left'
+    )
+    parser.add_argument(
+        '--run-name',
+        type=str,
+        default=None,
+        help='Work queue run name (default: the config name)'
+    )
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=None,
+        help='Parameter combinations per work queue item (default: whole grid)'
+    )
 
     args = parser.parse_args()
 
     run_phase_2(
         config_path=args.config,
         limit_stocks=args.limit_stocks,
-        limit_params=args.limit_params
+        limit_params=args.limit_params,
+        lazy_candles=args.lazy_candles,
+        n_jobs=args.n_jobs,
+        enqueue=args.enqueue,
+        worker=args.worker,
+        run_name=args.run_name,
+        chunk_size=args.chunk_size
     )
@@ -9,7 +9,7 @@ import yaml
 import logging
 import itertools
 from datetime import datetime
-from tqdm import tqdm
+from functools import partial
 
 # Add parent directory to path
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -18,6 +18,9 @@ sys.path.insert(0, parent_dir)
 
 from agents.agent_5_infrastructure.database_manager import DatabaseManager
 from agents.agent_3_optimization.candle_loader import CandleLoader
+from agents.agent_1_data_candles.candle_provider import LazyCandleProvider
+from agents.agent_5_infrastructure.worker_pool import execution_settings, map_symbol_batches
+from agents.agent_5_infrastructure.work_queue import WorkQueue, run_queue_workers
 import backtrader as bt
 import pandas as pd
 
@@ -212,8 +215,39 @@ def run_supertrend_backtest(candle_df, symbol, strategy_params, initial_capital=
         return {'error': str(e), 'symbol': symbol}
 
 
+def backtest_symbol(symbol, candle_df, fixed_params, param_combinations,
+                    initial_capital=100000, commission=0.001):
+    """
+    Run every parameter combination on one symbol (runs in a worker process).
+
+    Returns:
+        List of result dictionaries, one per combination
+    """
+    results = []
+    for param_combo in param_combinations:
+        try:
+            # Merge fixed and variable parameters
+            strategy_params = fixed_params.copy()
+            strategy_params.update(param_combo)
+
+            # Run backtest
+            results.append(run_supertrend_backtest(
+                candle_df=candle_df,
+                symbol=symbol,
+                strategy_params=strategy_params,
+                initial_capital=initial_capital,
+                commission=commission
+            ))
+
+        except Exception as e:
+            logger.error(f"Error backtesting {symbol}: {e}")
+            results.append({'error': str(e), 'symbol': symbol})
+
+    return results
+
+
 def save_results_to_db(results, db):
-    """Save backtest results to database."""
+    """Save backtest results to database. Returns True if successful."""
     try:
         # Create strategy config first
         params = results['strategy_params']
@@ -276,12 +310,53 @@ def save_results_to_db(results, db):
 
         db.execute_query(results_query, results_params)
         logger.debug(f"Saved results for {results['symbol']}")
+        return True
 
     except Exception as e:
         logger.error(f"Error saving results: {e}")
+        return False
+
+
+def process_work_item(db, item, fixed_params, backtest_period, initial_capital=100000,
+                      commission=0.001, lazy_candles=False):
+    """
+    Run one work queue item: a parameter chunk on one symbol (queue worker mode).
+
+    Returns:
+        List of result dictionaries, one per combination
+    """
+    provider = LazyCandleProvider(db) if lazy_candles else None
+    candle_df = CandleLoader(db, provider=provider).load_candles(
+        symbol=item.symbol,
+        candle_type='regular',
+        aggregation_days=1,
+        start_date=backtest_period['start_date'],
+        end_date=backtest_period['end_date']
+    )
+    if candle_df.empty:
+        return []
+
+    return backtest_symbol(
+        item.symbol, candle_df, fixed_params, item.params,
+        initial_capital=initial_capital, commission=commission
+    )
 
 
-def run_phase_3(config_path: str, limit_stocks: int = None, limit_params: int = None):
+def save_work_item_results(db, results):
+    """
+    Save a work queue item's results (inside the item's completion transaction).
+
+    Raises when a result is not saved, so the transaction rolls back and the
+    item is queued again instead of being completed without its rows.
+    """
+    for result in results:
+        if 'error' not in result and not save_results_to_db(result, db):
+            raise RuntimeError(f"Failed to save results for {result.get('symbol')}")
+
+
+def run_phase_3(config_path: str, limit_stocks: int = None, limit_params: int = None,
+                lazy_candles: bool = False, n_jobs: int = None, enqueue: bool = False,
+                worker: bool = False, run_name: str = None, chunk_size: int = None):
     """
     Execute Phase 3 Supertrend testing.
 
@@ -289,6 +364,17 @@ def run_phase_3(config_path: str, limit_stocks: int = None, limit_params: int =
         config_path: Path to phase_3_supertrend_config.yaml
         limit_stocks: Optional limit on stocks (for testing)
         limit_params: Optional limit on parameter combinations (for testing)
+        lazy_candles: Compute candles on demand from stock_data instead of
+            reading the candles table
+        n_jobs: Worker processes (overrides execution.parallel / n_jobs;
+            1 = serial)
+        enqueue: Only add the run's (symbol, parameter chunk) items to the
+            work queue, for --worker processes on any node to run
+        worker: Run queue items until the run has none left, instead of
+            running the grid in this process
+        run_name: Work queue run name (default: the config name)
+        chunk_size: Parameter combinations per queue item (overrides
+            execution.queue_chunk_size; default: whole grid per item)
     """
     logger.info("="*80)
     logger.info("PHASE 3: Supertrend Trend-Following Strategy")
@@ -303,7 +389,48 @@ def run_phase_3(config_path: str, limit_stocks: int = None, limit_params: int =
     logger.info("Connected to database")
 
     # Initialize candle loader
-    candle_loader = CandleLoader(db)
+    provider = LazyCandleProvider(db) if lazy_candles else None
+    candle_loader = CandleLoader(db, provider=provider)
+    if lazy_candles:
+        logger.info("Computing candles on demand from stock_data")
+
+    # Work queue shared by every node working on this run
+    execution = config['execution']
+    queue = WorkQueue(
+        db,
+        run_name or config['name'],
+        phase=3,
+        lease_seconds=execution.get('lease_seconds', 600),
+        max_attempts=execution.get('max_attempts', 3)
+    )
+
+    if worker:
+        n_jobs, _ = execution_settings(execution, n_jobs)
+        logger.info(f"\nWorking on queue run '{queue.run_name}' with {n_jobs} workers...")
+
+        stats = run_queue_workers(
+            db, queue.run_name, queue.phase,
+            handler=partial(
+                process_work_item,
+                fixed_params=config['fixed_parameters'],
+                backtest_period=config['backtest_period'],
+                initial_capital=execution['initial_capital'],
+                commission=execution['commission'],
+                lazy_candles=lazy_candles
+            ),
+            writer=save_work_item_results,
+            n_jobs=n_jobs,
+            lease_seconds=queue.lease_seconds,
+            max_attempts=queue.max_attempts
+        )
+
+        logger.info(
+            f"Queue items on this node: {stats['completed']} completed, "
+            f"{stats['failed']} failed, {stats['lost']} reclaimed"
+        )
+        logger.info(f"Queue status: {queue.counts()}")
+        db.close()
+        return
 
     # Get all symbols (same as Phase 1)
     symbols = candle_loader.get_available_symbols(candle_type='regular', aggregation_days=1)
@@ -331,6 +458,16 @@ def run_phase_3(config_path: str, limit_stocks: int = None, limit_params: int =
     logger.info(f"  - Stocks: {len(symbols)}")
     logger.info(f"  - Parameters: {len(param_combinations)}")
 
+    if enqueue:
+        offered = queue.enqueue(
+            symbols, param_combinations,
+            chunk_size=chunk_size or execution.get('queue_chunk_size')
+        )
+        logger.info(f"\nEnqueued {offered} items for queue run '{queue.run_name}'")
+        logger.info(f"Queue status: {queue.counts()}")
+        db.close()
+        return
+
     # Track results
     completed = 0
     failed = 0
@@ -347,36 +484,33 @@ def run_phase_3(config_path: str, limit_stocks: int = None, limit_params: int =
     )
     logger.info(f"Loaded candles for {len(candles_dict)} symbols")
 
-    # Run backtests
-    logger.info("\nStarting Supertrend backtests...\n")
-
-    for symbol in tqdm(candles_dict.keys(), desc="Stocks", position=0):
-        candle_df = candles_dict[symbol]
-
-        for param_combo in tqdm(param_combinations, desc=f"{symbol} params", position=1, leave=False):
-            try:
-                # Merge fixed and variable parameters
-                strategy_params = fixed_params.copy()
-                strategy_params.update(param_combo)
-
-                # Run backtest
-                result = run_supertrend_backtest(
-                    candle_df=candle_df,
-                    symbol=symbol,
-                    strategy_params=strategy_params,
-                    initial_capital=config['execution']['initial_capital'],
-                    commission=config['execution']['commission']
-                )
-
-                # Save results
-                if 'error' not in result:
-                    save_results_to_db(result, db)
-                    completed += 1
-                else:
-                    failed += 1
-
-            except Exception as e:
-                logger.error(f"Error backtesting {symbol}: {e}")
+    # Run backtests, sharded by symbol across worker processes; results
+    # are written to the database from this process only
+    n_jobs, batch_size = execution_settings(config['execution'], n_jobs)
+    logger.info(f"\nStarting Supertrend backtests ({n_jobs} workers, {batch_size} stocks per batch)...\n")
+
+    job = partial(
+        backtest_symbol,
+        fixed_params=fixed_params,
+        param_combinations=param_combinations,
+        initial_capital=config['execution']['initial_capital'],
+        commission=config['execution']['commission']
+    )
+
+    for symbol, results, error in map_symbol_batches(
+        job, candles_dict, n_jobs=n_jobs, batch_size=batch_size, desc="Stocks"
+    ):
+        if error is not None:
+            logger.error(f"Error backtesting {symbol}: {error}")
+            failed += len(param_combinations)
+            continue
+
+        for result in results:
+            # Save results
+            if 'error' not in result:
+                save_results_to_db(result, db)
+                completed += 1
+            else:
                 failed += 1
 
         # Log progress every stock
@@ -429,11 +563,50 @@ if __name__ == '__main__':
         default=None,
         help='Limit number of parameter combinations (for testing)'
     )
+    parser.add_argument(
+        '--lazy-candles',
+        action='store_true',
+        help='Compute candles on demand from stock_data instead of the candles table'
+    )
+    parser.add_argument(
+        '--n-jobs',
+        type=int,
+        default=None,
+        help='Worker processes (overrides the config; 1 = serial, -1 = all cores)'
+    )
+    parser.add_argument(
+        '--enqueue',
+        action='store_true',
+        help='Add the run to the database work queue and exit (run --worker on each node)'
+    )
+    parser.add_argument(
+        '--worker',
+        action='store_true',
+        help='Run items from the database work queue until none are left'
+    )
+    parser.add_argument(
+        '--run-name',
+        type=str,
+        default=None,
+        help='Work queue run name (default: the config name)'
+    )
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=None,
+        help='Parameter combinations per work queue item (default: whole grid)'
+    )
 
     args = parser.parse_args()
 
     run_phase_3(
         config_path=args.config,
         limit_stocks=args.limit_stocks,
-        limit_params=args.limit_params
+        limit_params=args.limit_params,
+        lazy_candles=args.lazy_candles,
+        n_jobs=args.n_jobs,
+        enqueue=args.enqueue,
+        worker=args.worker,
+        run_name=args.run_name,
+        chunk_size=args.chunk_size
     )
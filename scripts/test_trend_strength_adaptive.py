@@ -20,6 +20,7 @@ import pandas as pd
 import numpy as np
 import backtrader as bt
 from agents.agent_2_strategy_core.supertrend import Supertrend
+from agents.agent_2_strategy_core.regime_store import TREND_STRENGTH_REGIMES, get_regime_store
 
 class PandasData(bt.feeds.PandasData):
     params = (
@@ -165,8 +166,15 @@ class TrendStrengthAdaptiveMultiST(bt.Strategy):
     )
 
     def __init__(self):
-        # Trend strength indicator
-        self.adx = bt.indicators.ADX(self.data, period=self.params.adx_period)
+        # Trend strength indicator (ADX itself is only needed for logs)
+        if self.params.log_regime_changes:
+            self.adx = bt.indicators.ADX(self.data, period=self.params.adx_period)
+
+        # ADX regime labels per bar, computed once per symbol
+        self.trend_regime = get_regime_store().trend_strength(
+            self.data,
+            period=self.params.adx_period
+        )
 
         # Entry Supertrend (FIXED)
         self.entry_st = Supertrend(self.data, period=10, multiplier=2.0)
@@ -182,18 +190,8 @@ class TrendStrengthAdaptiveMultiST(bt.Strategy):
         self.current_regime = None
 
     def get_trend_regime(self):
-        """Determine trend strength using ADX"""
-        if len(self) < self.params.adx_period:
-            return 'moderate'
-
-        adx_value = self.adx[0]
-
-        if adx_value > 30:
-            return 'strong'
-        elif adx_value > 20:
-            return 'moderate'
-        else:
-            return 'weak'
+        """Determine trend strength using ADX (>30 strong, >20 moderate)"""
+        return TREND_STRENGTH_REGIMES[int(self.trend_regime[0])]
 
     def get_exit_st_for_regime(self, regime):
         """Select the appropriate exit Supertrend for current regime"""
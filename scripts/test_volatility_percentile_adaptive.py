@@ -20,6 +20,10 @@ import pandas as pd
 import numpy as np
 import backtrader as bt
 from agents.agent_2_strategy_core.supertrend import Supertrend
+from agents.agent_2_strategy_core.indicator_cache import cached_indicator
+from agents.agent_2_strategy_core.percentile_rank import PercentileRank
+from agents.agent_2_strategy_core.regime_store import VOLATILITY_REGIMES, get_regime_store
+from agents.agent_2_strategy_core.true_range import WilderATR
 
 class PandasData(bt.feeds.PandasData):
     params = (
@@ -49,24 +53,36 @@ class VolatilityPercentileAdaptive(bt.Strategy):
 
     def __init__(self):
         # Volatility indicator
-        self.atr = bt.indicators.ATR(self.data, period=20)
+        self.atr = cached_indicator(self.data, WilderATR, period=20)
+
+        # Rank of normalized volatility (ATR as % of price) in recent history
+        # (backwards-looking only!)
+        self.vol_percentile = PercentileRank(
+            self.atr / self.data.close,
+            period=self.params.vol_lookback,
+            positive_only=True
+        )
+
+        # Regime labels from the same ranking, computed once per symbol and lookback
+        self.vol_regime = get_regime_store().volatility(
+            self.data,
+            atr_period=20,
+            lookback=self.params.vol_lookback
+        )
 
         # Entry Supertrend (FIXED)
-        self.entry_st = Supertrend(self.data, period=10, multiplier=2.0)
+        self.entry_st = cached_indicator(self.data, Supertrend, period=10, multiplier=2.0)
 
-        # Multiple Exit Supertrends
-        self.exit_st_high_vol = Supertrend(self.data, period=20, multiplier=5.0)    # Balanced
-        self.exit_st_medium_vol = Supertrend(self.data, period=20, multiplier=5.0)  # Balanced
-        self.exit_st_low_vol = Supertrend(self.data, period=25, multiplier=6.0)     # Wider
+        # Multiple Exit Supertrends (identical configs share one cached instance)
+        self.exit_st_high_vol = cached_indicator(self.data, Supertrend, period=20, multiplier=5.0)    # Balanced
+        self.exit_st_medium_vol = cached_indicator(self.data, Supertrend, period=20, multiplier=5.0)  # Balanced
+        self.exit_st_low_vol = cached_indicator(self.data, Supertrend, period=25, multiplier=6.0)     # Wider
 
         self.order = None
         self.trade_count = 0
         self.wins = 0
         self.current_regime = None
 
-        # Track volatility history for percentile calculation
-        self.vol_history = []
-
     def get_volatility_percentile(self):
         """
         Calculate where current volatility ranks in recent history.
@@ -77,22 +93,12 @@ class VolatilityPercentileAdaptive(bt.Strategy):
         if len(self) < 20:  # Need ATR to be ready
             return 0.5
 
-        # Normalized volatility (ATR as % of price)
-        current_vol = self.atr[0] / self.data.close[0]
-
-        # Collect recent volatility history (backwards-looking only!)
-        lookback = min(self.params.vol_lookback, len(self))
-        recent_vols = []
-        for i in range(lookback):
-            if len(self) > i and self.atr[-i] > 0 and self.data.close[-i] > 0:
-                vol = self.atr[-i] / self.data.close[-i]
-                recent_vols.append(vol)
+        # Fraction of the last vol_lookback bars with valid ATR below current
+        percentile = self.vol_percentile[0]
 
-        if not recent_vols:
+        if np.isnan(percentile):  # No valid volatility history yet
             return 0.5
 
-        # Calculate percentile (what fraction of history is below current?)
-        percentile = sum(1 for v in recent_vols if v < current_vol) / len(recent_vols)
         return percentile
 
     def get_volatility_regime(self):
@@ -102,14 +108,8 @@ class VolatilityPercentileAdaptive(bt.Strategy):
         Returns:
             str: 'high', 'medium', or 'low'
         """
-        percentile = self.get_volatility_percentile()
-
-        if percentile > 0.80:  # Top 20%
-            return 'high'
-        elif percentile < 0.20:  # Bottom 20%
-            return 'low'
-        else:
-            return 'medium'
+        # High = top 20%, low = bottom 20% of percentile
+        return VOLATILITY_REGIMES[int(self.vol_regime[0])]
 
     def get_exit_st_for_regime(self, regime):
         """Select exit Supertrend based on volatility regime"""
@@ -167,10 +167,12 @@ class UniversalDualSupertrend(bt.Strategy):
     )
 
     def __init__(self):
-        self.entry_st = Supertrend(self.data, period=self.params.entry_period,
-                                   multiplier=self.params.entry_multiplier)
-        self.exit_st = Supertrend(self.data, period=self.params.exit_period,
-                                  multiplier=self.params.exit_multiplier)
+        self.entry_st = cached_indicator(self.data, Supertrend,
+                                         period=self.params.entry_period,
+                                         multiplier=self.params.entry_multiplier)
+        self.exit_st = cached_indicator(self.data, Supertrend,
+                                        period=self.params.exit_period,
+                                        multiplier=self.params.exit_multiplier)
         self.order = None
         self.trade_count = 0
         self.wins = 0
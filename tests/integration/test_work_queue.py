@@ -0,0 +1,226 @@
+"""
+Integration tests: WorkQueue against PostgreSQL
+
+Runs against the docker-compose database (DB_* environment variables, as
+in .env); skipped when it is not reachable:
+
+    docker compose up -d postgres
+    python -m pytest tests/integration/test_work_queue.py
+"""
+
+import os
+import threading
+import uuid
+
+import pytest
+
+from agents.agent_5_infrastructure.database_manager import DatabaseManager
+from agents.agent_5_infrastructure.work_queue import WorkQueue
+
+MIGRATION = os.path.join(
+    os.path.dirname(__file__), '..', '..', 'database', 'migrations', '002_work_queue.sql'
+)
+
+# Fail fast when no database is listening
+os.environ.setdefault('PGCONNECT_TIMEOUT', '3')
+
+
+def connect(max_connections: int = 2) -> DatabaseManager:
+    """Open the docker-compose database (default password as in docker-compose.yml)."""
+    return DatabaseManager(
+        password=os.getenv('DB_PASSWORD') or 'changeme',
+        min_connections=1,
+        max_connections=max_connections
+    )
+
+
+@pytest.fixture(scope='module')
+def db():
+    try:
+        db = connect()
+    except Exception as e:
+        pytest.skip(f"PostgreSQL not reachable: {e}")
+
+    # The migration is idempotent; applies it to databases created before it
+    with open(MIGRATION) as f:
+        db.execute_query(f.read(), fetch=False)
+
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def run_name(db):
+    name = f"test_{uuid.uuid4().hex[:12]}"
+    yield name
+    db.execute_query("DELETE FROM work_queue WHERE run_name = %s", (name,), fetch=False)
+
+
+def expire_lease(db, item_id: int):
+    """Move an item's lease into the past, as if its worker had stalled."""
+    db.execute_query(
+        "UPDATE work_queue SET lease_expires_at = NOW() - INTERVAL '1 second' WHERE id = %s",
+        (item_id,),
+        fetch=False
+    )
+
+
+def status_of(db, item_id: int) -> tuple:
+    """(status, worker_id) of an item."""
+    return tuple(db.execute_query(
+        "SELECT status, worker_id FROM work_queue WHERE id = %s", (item_id,)
+    )[0])
+
+
+def combos(n: int) -> list:
+    """n distinct parameter combinations (JSON round-trippable)."""
+    return [{'mean_lookback': 10 + i, 'exit_threshold': None} for i in range(n)]
+
+
+def test_enqueue_is_idempotent(db, run_name):
+    queue = WorkQueue(db, run_name, phase=2)
+
+    assert queue.enqueue(['AAA', 'BBB'], combos(5), chunk_size=2) == 6
+    assert queue.counts() == {'pending': 6}
+
+    # Same items again, then one new symbol: only the new items are added
+    queue.enqueue(['AAA', 'BBB'], combos(5), chunk_size=2)
+    assert queue.counts() == {'pending': 6}
+
+    queue.enqueue(['AAA', 'BBB', 'CCC'], combos(5), chunk_size=2)
+    assert queue.counts() == {'pending': 9}
+
+    item = queue.claim('worker-1')
+    assert (item.symbol, item.chunk_index) == ('AAA', 0)
+    assert item.params == combos(2)
+
+
+def test_concurrent_claims_never_share_a_row(db, run_name):
+    WorkQueue(db, run_name, phase=2).enqueue(
+        [f"S{i:03d}" for i in range(40)], combos(1)
+    )
+
+    n_workers = 4
+    claimed = [[] for _ in range(n_workers)]
+    start = threading.Barrier(n_workers)
+    errors = []
+
+    def work(index):
+        try:
+            # One connection pool per thread; pools are not thread-safe
+            worker_db = connect(max_connections=1)
+        except Exception as e:
+            errors.append(e)
+            start.abort()
+            return
+
+        try:
+            queue = WorkQueue(worker_db, run_name, phase=2)
+            start.wait(timeout=30)
+            while True:
+                item = queue.claim(f"worker-{index}")
+                if item is None:
+                    break
+                claimed[index].append(item.id)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            worker_db.close()
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(n_workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    ids = [item_id for worker_ids in claimed for item_id in worker_ids]
+    assert len(ids) == 40
+    assert len(set(ids)) == 40
+
+
+def test_expired_lease_is_reclaimed(db, run_name):
+    queue = WorkQueue(db, run_name, phase=2)
+    queue.enqueue(['AAA'], combos(3))
+
+    item = queue.claim('worker-1')
+    assert queue.heartbeat(item.id, 'worker-1')
+
+    # Held under a live lease: nothing else to claim
+    assert queue.claim('worker-2') is None
+
+    expire_lease(db, item.id)
+    reclaimed = queue.claim('worker-2')
+
+    assert reclaimed.id == item.id
+    assert reclaimed.attempts == 2
+    assert status_of(db, item.id) == ('running', 'worker-2')
+
+    # The stalled worker finds out on its next heartbeat
+    assert not queue.heartbeat(item.id, 'worker-1')
+
+
+def test_max_attempts_marks_item_failed(db, run_name):
+    queue = WorkQueue(db, run_name, phase=2, max_attempts=2)
+    queue.enqueue(['AAA', 'BBB'], combos(1))
+
+    # Expired leases: reclaimed once, then given up
+    first = queue.claim('worker-1')
+    expire_lease(db, first.id)
+    assert queue.claim('worker-2').id == first.id
+    expire_lease(db, first.id)
+
+    second = queue.claim('worker-3')
+    assert second.id != first.id
+    assert status_of(db, first.id) == ('failed', None)
+
+    # Errors: released for another attempt, then failed
+    queue.fail(second, 'worker-3', 'boom')
+    assert status_of(db, second.id) == ('pending', None)
+
+    retry = queue.claim('worker-4')
+    assert retry.id == second.id
+    queue.fail(retry, 'worker-4', 'boom again')
+    assert status_of(db, second.id) == ('failed', None)
+
+    assert queue.claim('worker-5') is None
+    assert queue.counts() == {'failed': 2}
+    assert queue.remaining() == 0
+
+
+def test_complete_after_reclaim_writes_nothing(db, run_name):
+    queue = WorkQueue(db, run_name, phase=2)
+    queue.enqueue(['AAA'], combos(2))
+
+    stalled = queue.claim('worker-1')
+    expire_lease(db, stalled.id)
+    reclaimed = queue.claim('worker-2')
+
+    written = []
+    assert not queue.complete(stalled, 'worker-1', lambda tx: written.append('worker-1'))
+    assert written == []
+    assert status_of(db, stalled.id) == ('running', 'worker-2')
+
+    assert queue.complete(reclaimed, 'worker-2', lambda tx: written.append('worker-2'))
+    assert written == ['worker-2']
+    assert status_of(db, stalled.id) == ('completed', 'worker-2')
+
+
+def test_failed_write_rolls_back_completion(db, run_name):
+    queue = WorkQueue(db, run_name, phase=2)
+    queue.enqueue(['AAA'], combos(2))
+    item = queue.claim('worker-1')
+
+    def write(tx):
+        tx.execute_query(
+            "UPDATE work_queue SET error_log = 'partial' WHERE id = %s", (item.id,), fetch=False
+        )
+        raise RuntimeError("Failed to save results for AAA")
+
+    with pytest.raises(RuntimeError):
+        queue.complete(item, 'worker-1', write)
+
+    assert status_of(db, item.id) == ('running', 'worker-1')
+    assert db.execute_query(
+        "SELECT error_log FROM work_queue WHERE id = %s", (item.id,)
+    )[0][0] is None
@@ -0,0 +1,81 @@
+"""
+Parity tests: LazyCandleProvider against candles read back from the table
+"""
+
+import io
+import os
+from decimal import Decimal, ROUND_HALF_UP
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from agents.agent_1_data_candles.candle_provider import LazyCandleProvider, round_numeric
+from agents.agent_1_data_candles.heiken_ashi import generate_heiken_ashi_candles
+from agents.agent_1_data_candles.linear_regression import generate_linear_regression_candles
+
+RAW_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'raw')
+
+
+class CsvStockData:
+    """Stands in for DatabaseManager.load_stock_data with the data/raw CSVs."""
+
+    def load_stock_data(self, symbol: str) -> pd.DataFrame:
+        df = pd.read_csv(
+            os.path.join(RAW_DIR, f'{symbol}_daily.csv'),
+            names=['date', 'open', 'high', 'low', 'close', 'volume']
+        )
+        df['date'] = pd.to_datetime(df['date'])
+        return df.sort_values('date').set_index('date')
+
+
+def as_stored(candles: pd.DataFrame) -> pd.DataFrame:
+    """
+    Round-trip prices through DECIMAL(10,2) as copy_upsert stores them:
+    CSV text, rounded half away from zero, read back as float.
+    """
+    buffer = io.StringIO()
+    candles[['open', 'high', 'low', 'close']].to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+
+    stored = candles.copy()
+    rows = [line.split(',') for line in buffer.read().splitlines()]
+    for i, column in enumerate(['open', 'high', 'low', 'close']):
+        stored[column] = [
+            float(Decimal(row[i]).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP))
+            if row[i] else np.nan
+            for row in rows
+        ]
+    return stored
+
+
+def test_round_numeric_rounds_ties_away_from_zero():
+    values = [2.675, 1.005, -1.005, 0.125, 0.135, np.nan]
+
+    rounded = round_numeric(values)
+
+    np.testing.assert_array_equal(rounded, [2.68, 1.01, -1.01, 0.13, 0.14, np.nan])
+    # np.round rounds the binary value half to even
+    assert np.round(1.005, 2) == 1.0
+    assert np.round(0.125, 2) == 0.12
+
+
+@pytest.mark.parametrize('symbol', ['AAPL', 'TSLA'])
+@pytest.mark.parametrize('aggregation_days', [1, 4])
+@pytest.mark.parametrize('mode', ['rolling', 'epoch'])
+def test_lazy_candles_match_table(symbol, aggregation_days, mode):
+    provider = LazyCandleProvider(CsvStockData())
+    daily = provider.get_daily(symbol)
+    suffix = '_epoch' if mode == 'epoch' else ''
+
+    cases = [
+        ('heiken_ashi', generate_heiken_ashi_candles(daily, aggregation_days, mode=mode)),
+        ('linear_regression', generate_linear_regression_candles(
+            daily, aggregation_days, window=5, mode=mode
+        ))
+    ]
+
+    for candle_type, generated in cases:
+        lazy = provider.get_candles(symbol, candle_type + suffix, aggregation_days)
+
+        pd.testing.assert_frame_equal(lazy, as_stored(generated), check_exact=True)
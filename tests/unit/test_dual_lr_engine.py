@@ -0,0 +1,82 @@
+"""
+Parity tests: DualLRArrayEngine against OptimizedDualLRStrategy in Cerebro
+"""
+
+import os
+
+import backtrader as bt
+import pandas as pd
+import pytest
+
+from linreg_bars.baseline_strategy import (
+    DualLRArrayEngine,
+    OptimizedDualLRStrategy,
+    resample_daily_to_4days
+)
+
+RAW_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'raw')
+
+STARTING_CASH = 1_000_000
+INITIAL_CAPITAL = 7_000
+PYRAMID_CAPITAL = 5_000
+
+
+def load_daily(symbol: str) -> pd.DataFrame:
+    """Load a data/raw daily CSV with a date column."""
+    df = pd.read_csv(
+        os.path.join(RAW_DIR, f'{symbol}_daily.csv'),
+        names=['date', 'open', 'high', 'low', 'close', 'volume']
+    )
+    df['date'] = pd.to_datetime(df['date'])
+    return df.sort_values('date').reset_index(drop=True)
+
+
+def run_cerebro(df: pd.DataFrame, symbol: str) -> tuple:
+    """trades_list and end value of OptimizedDualLRStrategy (default config), run as run_optimized_strategy does."""
+    cerebro = bt.Cerebro()
+    cerebro.broker.setcash(STARTING_CASH)
+    cerebro.broker.setcommission(commission=0.001)
+
+    data = bt.feeds.PandasData(
+        dataname=df,
+        datetime='date',
+        open='open',
+        high='high',
+        low='low',
+        close='close',
+        volume='volume',
+        openinterest=-1
+    )
+    data._name = symbol
+    cerebro.adddata(data)
+    cerebro.addstrategy(
+        OptimizedDualLRStrategy,
+        initial_capital=INITIAL_CAPITAL,
+        pyramid_capital=PYRAMID_CAPITAL
+    )
+
+    strat = cerebro.run()[0]
+    return strat.trades_list, cerebro.broker.getvalue()
+
+
+@pytest.mark.parametrize('symbol', ['AAPL', 'AMD', 'NVDA', 'TSLA'])
+@pytest.mark.parametrize('bars', ['daily', '4day'])
+def test_trades_list_matches_cerebro(symbol, bars):
+    df = load_daily(symbol)
+    if bars == '4day':
+        df = resample_daily_to_4days(df)
+
+    expected, end_value = run_cerebro(df, symbol)
+
+    result = DualLRArrayEngine(
+        df, symbol,
+        starting_cash=STARTING_CASH,
+        commission=0.001,
+        initial_capital=INITIAL_CAPITAL,
+        pyramid_capital=PYRAMID_CAPITAL
+    ).run()
+
+    assert expected
+    # Records compare exactly, so the pnl > 0 win/loss split agrees too
+    assert result.trades_list == expected
+    assert result.end_value == pytest.approx(end_value, abs=1e-6)
@@ -0,0 +1,51 @@
+"""
+Parity tests: RegressionBank event mode (next) against vectorized mode (once)
+"""
+
+import os
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+import pytest
+
+from agents.agent_2_strategy_core.linear_regression_indicators import RegressionBank
+
+RAW_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'raw')
+
+
+class BankStrategy(bt.Strategy):
+    params = (('periods', (10, 20, 50)),)
+
+    def __init__(self):
+        short, medium, long = self.params.periods
+        self.bank = RegressionBank(period_short=short, period_medium=medium, period_long=long)
+
+
+def load_daily(symbol: str) -> pd.DataFrame:
+    """Load a data/raw daily CSV with a date column."""
+    df = pd.read_csv(
+        os.path.join(RAW_DIR, f'{symbol}_daily.csv'),
+        names=['date', 'open', 'high', 'low', 'close', 'volume']
+    )
+    df['date'] = pd.to_datetime(df['date'])
+    return df.sort_values('date').reset_index(drop=True)
+
+
+def bank_lines(df: pd.DataFrame, periods, runonce: bool) -> np.ndarray:
+    """Every RegressionBank line over the run, shaped (lines, bars)."""
+    cerebro = bt.Cerebro(runonce=runonce, stdstats=False)
+    cerebro.adddata(bt.feeds.PandasData(dataname=df, datetime='date', openinterest=-1))
+    cerebro.addstrategy(BankStrategy, periods=periods)
+    strat = cerebro.run()[0]
+    return np.array([np.asarray(line.array) for line in strat.bank.lines])
+
+
+@pytest.mark.parametrize('periods', [(10, 20, 50), (5, 5, 200)])
+def test_next_matches_once(periods):
+    df = load_daily('TSLA')
+
+    expected = bank_lines(df, periods, runonce=True)
+    actual = bank_lines(df, periods, runonce=False)
+
+    np.testing.assert_array_equal(actual, expected)
@@ -0,0 +1,115 @@
+"""
+Parity tests: VectorizedMeanReversion against MeanReversionStrategy in Cerebro
+"""
+
+import json
+import os
+
+import backtrader as bt
+import pandas as pd
+import pytest
+
+from agents.agent_2_strategy_core.base_strategy import MeanReversionStrategy
+from agents.agent_2_strategy_core.stddev_bands import compute_band_tensor
+from agents.agent_3_optimization.backtest_executor import BacktestExecutor
+from agents.agent_3_optimization.data_feed import create_data_feed
+from agents.agent_3_optimization.vectorized_engine import VectorizedMeanReversion
+
+RAW_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'raw')
+
+
+class RecordingMeanReversion(MeanReversionStrategy):
+    """MeanReversionStrategy that records (bar, order.executed.price) of every fill."""
+
+    def __init__(self):
+        super().__init__()
+        self.fills = []
+
+    def notify_order(self, order):
+        if order.status == order.Completed:
+            self.fills.append((len(self) - 1, order.executed.price))
+        super().notify_order(order)
+
+
+def load_daily(symbol: str) -> pd.DataFrame:
+    """Load a data/raw daily CSV indexed by date."""
+    df = pd.read_csv(
+        os.path.join(RAW_DIR, f'{symbol}_daily.csv'),
+        names=['date', 'open', 'high', 'low', 'close', 'volume']
+    )
+    df['date'] = pd.to_datetime(df['date'])
+    return df.sort_values('date').set_index('date')
+
+
+@pytest.mark.parametrize('symbol', ['AMD', 'NVDA'])
+@pytest.mark.parametrize('exit_threshold', [0.05, 1.0, 5.0])
+def test_profit_target_fills_match_cerebro(symbol, exit_threshold):
+    df = load_daily(symbol)
+    params = dict(
+        mean_lookback=20,
+        stddev_lookback=20,
+        entry_threshold=2.0,
+        exit_type='profit_target',
+        exit_threshold=exit_threshold,
+        log_trades=False
+    )
+
+    cerebro = bt.Cerebro()
+    cerebro.broker.setcash(100000)
+    cerebro.broker.setcommission(commission=0.001)
+    cerebro.adddata(create_data_feed(df, name=symbol))
+    cerebro.addstrategy(RecordingMeanReversion, **params)
+    strat = cerebro.run()[0]
+
+    result = VectorizedMeanReversion(100000, 0.001).run(df, params)
+
+    fills = []
+    for trade in result.trades:
+        fills.append((trade['entry_bar'], trade['entry_price']))
+        fills.append((trade['exit_bar'], trade['exit_price']))
+
+    # Prices compare exactly: the profit target is checked against them
+    assert strat.fills[:len(fills)] == fills
+    assert len(strat.fills) - len(fills) <= 1
+    assert result.end_value == pytest.approx(cerebro.broker.getvalue(), abs=1e-6)
+
+
+def test_band_tensor_of_another_mean_type_is_rejected():
+    df = load_daily('AMD')
+    tensor = compute_band_tensor(df, [20], [20], [2.0], mean_type='EMA')
+    params = dict(mean_type='SMA', band_tensor=tensor, log_trades=False)
+
+    with pytest.raises(ValueError, match='mean_type EMA'):
+        VectorizedMeanReversion(100000, 0.001).run(df, params)
+
+    cerebro = bt.Cerebro()
+    cerebro.adddata(create_data_feed(df, name='AMD'))
+    cerebro.addstrategy(MeanReversionStrategy, **params)
+    with pytest.raises(ValueError, match='mean_type EMA'):
+        cerebro.run()
+
+
+class RecordingDatabase:
+    """Stands in for DatabaseManager, recording the queried parameters."""
+
+    def __init__(self):
+        self.params = []
+
+    def execute_query(self, query, params=None):
+        self.params.append(params)
+        return [(len(self.params),)]
+
+
+def test_save_results_leaves_band_tensor_out_of_parameters():
+    df = load_daily('AMD')
+    params = dict(
+        mean_type='SMA',
+        band_tensor=compute_band_tensor(df, [20], [20], [2.0]),
+        log_trades=False
+    )
+    executor = BacktestExecutor(engine='vectorized')
+    results = executor.run_backtest(df, 'AMD', params, 'regular', 1)
+    db = RecordingDatabase()
+
+    assert executor.save_results(results, db)
+    assert json.loads(db.params[0][-1]) == {'mean_type': 'SMA', 'log_trades': False}